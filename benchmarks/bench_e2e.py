@@ -0,0 +1,337 @@
+"""End-to-end throughput benchmark for all scrapers, export and media download.
+
+Drives NoteScraper, CommentScraper, SearchScraper, UserScraper, the export
+helpers and download_media against the local fake XHS API, and reports
+requests/sec, items/sec, p50/p95/p99 request latency, peak RSS and event-loop
+lag per scenario. Results can be saved as JSON and compared against a
+previous run to catch regressions across commits.
+
+By default the fake API runs in a background thread of this process; pass
+--server-url to target a separately started server
+(``python -m xhs_scraper.testing.fake_api``) for cleaner CPU measurements.
+
+Usage:
+    python benchmarks/bench_e2e.py
+    python benchmarks/bench_e2e.py --concurrency 16 --latency 0.02 --json run.json
+    python benchmarks/bench_e2e.py --json new.json --compare run.json --threshold 0.1
+"""
+
+import argparse
+import asyncio
+import json
+import platform
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from xhs_scraper import XHSClient  # noqa: E402
+from xhs_scraper.testing import FakeXHSAPI, FakeXHSServer, fixed  # noqa: E402
+from xhs_scraper.utils.export import export_to_csv, export_to_json  # noqa: E402
+from xhs_scraper.utils.media import download_media  # noqa: E402
+
+COOKIES = {"a1": "18c7e2b1b9d0benchmark0a1value", "web_session": "benchmark"}
+SCENARIOS = ["user_notes", "note", "comments", "search", "user_info", "export", "media"]
+
+# (metric, True if higher is better) pairs checked by --compare.
+COMPARED_METRICS = [
+    ("requests_per_sec", True),
+    ("items_per_sec", True),
+    ("p95_ms", False),
+    ("loop_lag_max_ms", False),
+]
+
+
+class LoopLagMonitor:
+    """Measure event-loop lag by timing a periodic sleep."""
+
+    def __init__(self, interval: float = 0.01):
+        self.interval = interval
+        self.samples: List[float] = []
+        self._task: Optional[asyncio.Task] = None
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            start = loop.time()
+            await asyncio.sleep(self.interval)
+            self.samples.append(max(0.0, loop.time() - start - self.interval))
+
+    def __enter__(self) -> "LoopLagMonitor":
+        self._task = asyncio.get_running_loop().create_task(self._run())
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self._task.cancel()
+
+
+def _peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is KiB on Linux and bytes on macOS.
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def _percentiles(samples: List[float]) -> Dict[str, Optional[float]]:
+    if not samples:
+        return {"p50_ms": None, "p95_ms": None, "p99_ms": None}
+    if len(samples) == 1:
+        cuts = samples * 99
+    else:
+        cuts = statistics.quantiles(samples, n=100, method="inclusive")
+    return {
+        "p50_ms": round(cuts[49] * 1000, 3),
+        "p95_ms": round(cuts[94] * 1000, 3),
+        "p99_ms": round(cuts[98] * 1000, 3),
+    }
+
+
+def _git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=Path(__file__).resolve().parent,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def _gather_limited(
+    concurrency: int, jobs: List[Callable[[], Awaitable[int]]]
+) -> int:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def run(job: Callable[[], Awaitable[int]]) -> int:
+        async with semaphore:
+            return await job()
+
+    return sum(await asyncio.gather(*(run(job) for job in jobs)))
+
+
+async def bench_scenario(
+    name: str, base_url: str, targets: Dict[str, List[Any]], args: argparse.Namespace
+) -> Dict[str, Any]:
+    latencies: List[float] = []
+    requests = 0
+
+    async with XHSClient(
+        cookies=COOKIES, base_url=base_url, max_connections=args.concurrency
+    ) as client:
+        original_request = client._http.request
+
+        async def timed_request(*a: Any, **kw: Any) -> Any:
+            nonlocal requests
+            requests += 1
+            start = time.perf_counter()
+            try:
+                return await original_request(*a, **kw)
+            finally:
+                latencies.append(time.perf_counter() - start)
+
+        client._http.request = timed_request
+
+        async def user_notes(user_id: str) -> int:
+            result = await client.notes.get_user_notes(user_id, max_pages=100)
+            return len(result.items or [])
+
+        async def note(note: Any) -> int:
+            await client.notes.get_note(note.note_id, note.xsec_token or "")
+            return 1
+
+        async def comments(note_id: str) -> int:
+            result = await client.comments.get_comments(note_id)
+            return len(result.items or [])
+
+        async def search(keyword: str) -> int:
+            items = 0
+            for page in range(1, args.search_pages + 1):
+                result = await client.search.search_notes(keyword, page=page)
+                items += len(result.items or [])
+            return items
+
+        async def user_info(user_id: str) -> int:
+            await client.users.get_user_info(user_id)
+            return 1
+
+        async def media(note: Any) -> int:
+            start = time.perf_counter()
+            with tempfile.TemporaryDirectory() as tmp:
+                paths = await download_media(note.images or [], tmp, note_id=note.note_id)
+            latencies.append(time.perf_counter() - start)
+            return len(paths)
+
+        async def export(notes: List[Any]) -> int:
+            start = time.perf_counter()
+            with tempfile.TemporaryDirectory() as tmp:
+                export_to_json(notes, Path(tmp) / "notes.json")
+                export_to_csv(notes, Path(tmp) / "notes.csv")
+            latencies.append(time.perf_counter() - start)
+            return len(notes)
+
+        if name == "user_notes":
+            jobs = [lambda t=t: user_notes(t) for t in targets["users"]]
+        elif name == "note":
+            jobs = [lambda t=t: note(t) for t in targets["notes"]]
+        elif name == "comments":
+            jobs = [lambda t=t: comments(t.note_id) for t in targets["notes"]]
+        elif name == "search":
+            jobs = [lambda t=t: search(t) for t in targets["keywords"]]
+        elif name == "user_info":
+            jobs = [lambda t=t: user_info(t) for t in targets["users"]]
+        elif name == "media":
+            jobs = [lambda t=t: media(t) for t in targets["media_notes"]]
+        else:
+            jobs = [lambda: export(targets["notes"])]
+
+        jobs = jobs * args.rounds
+        with LoopLagMonitor() as lag:
+            start = time.perf_counter()
+            items = await _gather_limited(args.concurrency, jobs)
+            elapsed = time.perf_counter() - start
+
+    return {
+        "scenario": name,
+        "jobs": len(jobs),
+        "requests": requests,
+        "items": items,
+        "seconds": round(elapsed, 4),
+        "requests_per_sec": round(requests / elapsed, 1) if elapsed else None,
+        "items_per_sec": round(items / elapsed, 1) if elapsed else None,
+        **_percentiles(latencies),
+        "peak_rss_mb": round(_peak_rss_mb(), 1),
+        "loop_lag_max_ms": round(max(lag.samples, default=0.0) * 1000, 3),
+        "loop_lag_p99_ms": _percentiles(lag.samples)["p99_ms"],
+    }
+
+
+async def _collect_targets(
+    base_url: str, args: argparse.Namespace
+) -> Dict[str, List[Any]]:
+    users = [f"{i:024x}" for i in range(args.users)]
+    keywords = [f"keyword-{i}" for i in range(args.keywords)]
+    async with XHSClient(cookies=COOKIES, base_url=base_url) as client:
+        result = await client.search.search_notes(keywords[0])
+        notes = [
+            await client.notes.get_note(item.note_id, item.xsec_token or "")
+            for item in (result.items or [])[: args.notes]
+        ]
+    return {
+        "users": users,
+        "keywords": keywords,
+        "notes": notes,
+        "media_notes": notes[: args.media_notes],
+    }
+
+
+async def run(base_url: str, args: argparse.Namespace) -> List[Dict[str, Any]]:
+    targets = await _collect_targets(base_url, args)
+    results = []
+    for name in args.scenarios:
+        results.append(await bench_scenario(name, base_url, targets, args))
+    return results
+
+
+def compare(
+    baseline: Dict[str, Any], current: List[Dict[str, Any]], threshold: float
+) -> List[str]:
+    """Return a description of every metric that regressed beyond threshold."""
+    previous = {row["scenario"]: row for row in baseline.get("results", [])}
+    regressions = []
+    for row in current:
+        old = previous.get(row["scenario"])
+        if old is None:
+            continue
+        for metric, higher_is_better in COMPARED_METRICS:
+            before, after = old.get(metric), row.get(metric)
+            if not before or after is None:
+                continue
+            change = (after - before) / before
+            if (change < -threshold) if higher_is_better else (change > threshold):
+                regressions.append(
+                    f"{row['scenario']}.{metric}: {before} -> {after} ({change:+.1%})"
+                )
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--scenarios", nargs="+", choices=SCENARIOS, default=SCENARIOS
+    )
+    parser.add_argument("--server-url", help="use an already running fake API")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--rounds", type=int, default=1, help="passes over targets")
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--keywords", type=int, default=10)
+    parser.add_argument("--search-pages", type=int, default=3)
+    parser.add_argument("--notes", type=int, default=20)
+    parser.add_argument("--media-notes", type=int, default=5)
+    parser.add_argument("--media-bytes", type=int, default=65536)
+    parser.add_argument(
+        "--latency", type=float, default=0.0, help="fake API seconds per response"
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", type=Path, help="write results to this JSON file")
+    parser.add_argument("--compare", type=Path, help="baseline JSON to compare with")
+    parser.add_argument(
+        "--threshold", type=float, default=0.1, help="allowed relative regression"
+    )
+    args = parser.parse_args()
+
+    if args.server_url:
+        results = asyncio.run(run(args.server_url.rstrip("/"), args))
+    else:
+        api = FakeXHSAPI(
+            seed=args.seed,
+            search_pages=args.search_pages,
+            latency=fixed(args.latency) if args.latency > 0 else None,
+            media_bytes=args.media_bytes,
+        )
+        with FakeXHSServer(api) as server:
+            api.media_base_url = f"{server.url}/media"
+            results = asyncio.run(run(server.url, args))
+
+    print(
+        f"{'scenario':<11} {'req/s':>9} {'items/s':>10} {'p50ms':>8} {'p95ms':>8} "
+        f"{'p99ms':>8} {'rssMB':>7} {'lagms':>7}"
+    )
+    for row in results:
+        print(
+            f"{row['scenario']:<11} {row['requests_per_sec']:>9} "
+            f"{row['items_per_sec']:>10} {row['p50_ms']!s:>8} {row['p95_ms']!s:>8} "
+            f"{row['p99_ms']!s:>8} {row['peak_rss_mb']:>7} {row['loop_lag_max_ms']:>7}"
+        )
+
+    report = {
+        "benchmark": "e2e",
+        "revision": _git_revision(),
+        "python": platform.python_version(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "config": {
+            k: v for k, v in vars(args).items() if k not in ("json", "compare")
+        },
+        "results": results,
+    }
+    if args.json:
+        args.json.write_text(json.dumps(report, indent=2), encoding="utf-8")
+
+    if args.compare:
+        baseline = json.loads(args.compare.read_text(encoding="utf-8"))
+        regressions = compare(baseline, results, args.threshold)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        if regressions:
+            sys.exit(1)
+        print(f"No regressions beyond {args.threshold:.0%} vs {args.compare}")
+
+
+if __name__ == "__main__":
+    main()
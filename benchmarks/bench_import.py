@@ -0,0 +1,123 @@
+"""Import-time benchmark.
+
+Measures, in fresh interpreters, how long typical entry-point imports take
+and which heavy dependencies they pull in. ``--budget-ms`` fails the run
+(exit code 1) when the median of ``import xhs_scraper`` exceeds the budget,
+for use in CI next to tests/unit/test_imports.py.
+
+Usage:
+    python benchmarks/bench_import.py
+    python benchmarks/bench_import.py --repeat 20 --budget-ms 50
+    python benchmarks/bench_import.py --json import.json
+"""
+
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+from typing import Any, Dict, List
+
+ROOT = Path(__file__).resolve().parent.parent
+
+STATEMENTS = [
+    "import xhs_scraper",
+    "from xhs_scraper import XHSError",
+    "from xhs_scraper import export_to_json",
+    "from xhs_scraper.utils import download_media",
+    "from xhs_scraper import XHSClient",
+    "from xhs_scraper import qr_login",
+]
+
+HEAVY_MODULES = ["httpx", "pydantic", "xhshow", "aiohttp", "sqlite3"]
+
+_PROBE = """
+import sys, time, json
+start = time.perf_counter()
+exec({statement!r})
+elapsed = time.perf_counter() - start
+print(json.dumps({{
+    "seconds": elapsed,
+    "loaded": [m for m in {heavy!r} if m in sys.modules],
+}}))
+"""
+
+
+def measure(statement: str) -> Dict[str, Any]:
+    """Run ``statement`` in a fresh interpreter and time it."""
+    code = _PROBE.format(statement=statement, heavy=HEAVY_MODULES)
+    output = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=ROOT,
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    return json.loads(output)
+
+
+def run(statements: List[str], repeat: int) -> List[Dict[str, Any]]:
+    results = []
+    for statement in statements:
+        samples = [measure(statement) for _ in range(repeat)]
+        times = [sample["seconds"] * 1000 for sample in samples]
+        results.append(
+            {
+                "statement": statement,
+                "median_ms": round(statistics.median(times), 2),
+                "min_ms": round(min(times), 2),
+                "loaded": samples[-1]["loaded"],
+            }
+        )
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--repeat", type=int, default=10, help="fresh interpreters per statement"
+    )
+    parser.add_argument(
+        "--budget-ms",
+        type=float,
+        help="fail if the median 'import xhs_scraper' time exceeds this",
+    )
+    parser.add_argument("--json", type=Path, help="write results to this JSON file")
+    args = parser.parse_args()
+
+    results = run(STATEMENTS, args.repeat)
+
+    print(f"{'statement':<46} {'median ms':>10} {'min ms':>8}  heavy modules")
+    for row in results:
+        print(
+            f"{row['statement']:<46} {row['median_ms']:>10.2f} "
+            f"{row['min_ms']:>8.2f}  {', '.join(row['loaded']) or '-'}"
+        )
+
+    if args.json:
+        args.json.write_text(
+            json.dumps(
+                {
+                    "benchmark": "import",
+                    "python": platform.python_version(),
+                    "results": results,
+                },
+                indent=2,
+            ),
+            encoding="utf-8",
+        )
+
+    if args.budget_ms is not None:
+        median = results[0]["median_ms"]
+        if median > args.budget_ms:
+            print(
+                f"import xhs_scraper took {median:.2f} ms, "
+                f"over the {args.budget_ms:.2f} ms budget"
+            )
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""Offline scraper throughput benchmark over a recorded replay archive.
+
+Record an archive once with live cookies (see xhs_scraper.utils.replay), then
+benchmark get_user_notes, get_comments and search_notes deterministically,
+without network access. Targets (user ids, note ids, keywords) are taken from
+the archive itself.
+
+Usage:
+    python benchmarks/bench_replay.py traffic.jsonl.gz
+    python benchmarks/bench_replay.py traffic.jsonl.gz --latency 0.02 --rounds 20
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from xhs_scraper import XHSClient  # noqa: E402
+from xhs_scraper.utils.replay import ReplayArchive  # noqa: E402
+
+COOKIES = {"a1": "18c7e2b1b9d0benchmark0a1value", "web_session": "benchmark"}
+
+
+def find_targets(archive: ReplayArchive) -> Dict[str, List[Any]]:
+    """Collect first-page targets for each benchmarked scraper."""
+    targets: Dict[str, List[Any]] = {"user_notes": [], "comments": [], "search": []}
+    for entry in archive.entries():
+        query = dict(entry["params"].get("query", []))
+        payload = entry["params"].get("payload") or {}
+        path = entry["path"]
+        if path.endswith("/user_posted") and not query.get("cursor"):
+            targets["user_notes"].append(query["user_id"])
+        elif path.endswith("/comment/page") and not query.get("cursor"):
+            targets["comments"].append(query["note_id"])
+        elif path.endswith("/search/notes"):
+            targets["search"].append(
+                (payload["keyword"], payload["page"], payload.get("page_size", 20))
+            )
+    return targets
+
+
+async def bench_scraper(
+    archive: ReplayArchive, name: str, targets: List[Any], rounds: int, latency: float
+) -> Dict[str, Any]:
+    requests = 0
+    items = 0
+    async with XHSClient(
+        cookies=COOKIES, transport=archive.transport(latency=latency)
+    ) as client:
+        original_request = client._http.request
+
+        async def counting_request(*args, **kwargs):
+            nonlocal requests
+            requests += 1
+            return await original_request(*args, **kwargs)
+
+        client._http.request = counting_request
+
+        start = time.perf_counter()
+        for _ in range(rounds):
+            for target in targets:
+                if name == "user_notes":
+                    result = await client.notes.get_user_notes(target)
+                elif name == "comments":
+                    result = await client.comments.get_comments(target)
+                else:
+                    keyword, page, page_size = target
+                    result = await client.search.search_notes(
+                        keyword, page=page, page_size=page_size
+                    )
+                items += len(result.items or [])
+        elapsed = time.perf_counter() - start
+
+    return {
+        "scraper": name,
+        "targets": len(targets),
+        "requests": requests,
+        "items": items,
+        "seconds": round(elapsed, 4),
+        "requests_per_sec": round(requests / elapsed, 1) if elapsed else None,
+        "items_per_sec": round(items / elapsed, 1) if elapsed else None,
+    }
+
+
+async def run(path: Path, rounds: int, latency: float) -> List[Dict[str, Any]]:
+    archive = ReplayArchive.load(path)
+    targets = find_targets(archive)
+    results = []
+    for name, scraper_targets in targets.items():
+        if scraper_targets:
+            results.append(
+                await bench_scraper(archive, name, scraper_targets, rounds, latency)
+            )
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("archive", type=Path, help="replay archive (.jsonl.gz)")
+    parser.add_argument("--rounds", type=int, default=10, help="passes over targets")
+    parser.add_argument(
+        "--latency", type=float, default=0.0, help="injected seconds per response"
+    )
+    parser.add_argument("--json", type=Path, help="write results to this JSON file")
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args.archive, args.rounds, args.latency))
+    for row in results:
+        print(
+            f"{row['scraper']:<11} requests={row['requests']:<6} items={row['items']:<7} "
+            f"req/s={row['requests_per_sec']:<9} items/s={row['items_per_sec']}"
+        )
+
+    if args.json:
+        args.json.write_text(
+            json.dumps({"benchmark": "replay", "results": results}, indent=2),
+            encoding="utf-8",
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""Signature cost microbenchmark.
+
+Reports signatures/sec for GET and POST signing at several payload sizes,
+with and without the per-cookie x-s-common cache.
+
+Usage:
+    python benchmarks/bench_signature.py
+    python benchmarks/bench_signature.py --duration 2 --sizes 0 1024 65536
+    python benchmarks/bench_signature.py --json signature.json
+"""
+
+import argparse
+import json
+import platform
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from xhs_scraper.signature import XHShowSignatureProvider  # noqa: E402
+
+COOKIES = {"a1": "18c7e2b1b9d0benchmark0a1value", "web_session": "benchmark"}
+URI = "/api/sns/web/v1/search/notes"
+
+
+def _make_data(size: int) -> Dict[str, Any]:
+    """Build a params/payload dict whose JSON encoding is roughly ``size`` bytes."""
+    data: Dict[str, Any] = {"keyword": "benchmark", "page": 1}
+    if size > 0:
+        data["filler"] = "x" * size
+    return data
+
+
+def bench_one(
+    provider: XHShowSignatureProvider, method: str, data: Dict[str, Any], duration: float
+) -> float:
+    """Sign repeatedly for ``duration`` seconds and return signatures/sec."""
+    sign = provider.sign_get if method == "GET" else provider.sign_post
+    sign(URI, data, COOKIES)  # warm up caches
+
+    count = 0
+    start = time.perf_counter()
+    deadline = start + duration
+    while True:
+        for _ in range(20):
+            sign(URI, data, COOKIES)
+        count += 20
+        now = time.perf_counter()
+        if now >= deadline:
+            return count / (now - start)
+
+
+def run(sizes: List[int], duration: float) -> List[Dict[str, Any]]:
+    results = []
+    for cache_common in (False, True):
+        provider = XHShowSignatureProvider(cache_common=cache_common)
+        for method in ("GET", "POST"):
+            for size in sizes:
+                rate = bench_one(provider, method, _make_data(size), duration)
+                results.append(
+                    {
+                        "method": method,
+                        "payload_bytes": size,
+                        "cache_common": cache_common,
+                        "signatures_per_sec": round(rate, 1),
+                        "us_per_signature": round(1e6 / rate, 1),
+                    }
+                )
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=[0, 1024, 16384, 65536],
+        help="payload sizes in bytes",
+    )
+    parser.add_argument(
+        "--duration", type=float, default=1.0, help="seconds per measurement"
+    )
+    parser.add_argument("--json", type=Path, help="write results to this JSON file")
+    args = parser.parse_args()
+
+    results = run(args.sizes, args.duration)
+
+    print(f"{'method':<6} {'bytes':>7} {'cache':>6} {'sig/s':>10} {'us/sig':>9}")
+    for row in results:
+        print(
+            f"{row['method']:<6} {row['payload_bytes']:>7} "
+            f"{str(row['cache_common']):>6} {row['signatures_per_sec']:>10.1f} "
+            f"{row['us_per_signature']:>9.1f}"
+        )
+
+    if args.json:
+        args.json.write_text(
+            json.dumps(
+                {
+                    "benchmark": "signature",
+                    "python": platform.python_version(),
+                    "results": results,
+                },
+                indent=2,
+            ),
+            encoding="utf-8",
+        )
+
+
+if __name__ == "__main__":
+    main()
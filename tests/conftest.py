@@ -3,6 +3,8 @@
 import pytest
 from unittest.mock import MagicMock, AsyncMock
 
+from xhs_scraper.client import XHSClient
+
 
 @pytest.fixture
 def mock_xhshow_client():
@@ -38,6 +40,24 @@ def mock_signature_provider():
     return provider
 
 
+@pytest.fixture
+def make_client(mock_signature_provider):
+    """Provide a factory of XHSClients signing with the mocked provider.
+
+    Pass a FakeXHSAPI to send requests to it; keyword arguments (transport,
+    base_url, stores, ...) are passed on to XHSClient.
+    """
+
+    def make(api=None, **kwargs):
+        if api is not None:
+            kwargs["transport"] = api.transport()
+        kwargs.setdefault("cookies", {"a1": "x"})
+        kwargs.setdefault("signature_provider", mock_signature_provider)
+        return XHSClient(**kwargs)
+
+    return make
+
+
 @pytest.fixture
 def sample_user_data():
     """Provide sample user response data."""
@@ -7,6 +7,7 @@ Tests cover:
 - Captcha detection
 - Network error handling
 - Request/response error conditions
+- Circuit breaking on degraded endpoints
 """
 
 import pytest
@@ -22,7 +23,9 @@ from xhs_scraper.exceptions import (
     CaptchaRequiredError,
     RateLimitError,
     CookieExpiredError,
+    CircuitOpenError,
 )
+from xhs_scraper.utils.circuit_breaker import CircuitBreaker
 
 
 class TestSignatureErrors:
@@ -993,3 +996,86 @@ class TestErrorRecoveryAndResilience:
                     await client.request("GET", "/api/test")
 
                 assert exc_info.value is original_error
+
+
+class TestCircuitBreakerIntegration:
+    """Test circuit breaking of degraded endpoints in XHSClient."""
+
+    @pytest.mark.asyncio
+    async def test_server_errors_open_circuit_and_fail_fast(
+        self, mock_signature_provider
+    ):
+        """Repeated 5xx responses open the circuit; later calls skip the network."""
+        breaker = CircuitBreaker(min_calls=2, window_size=2, recovery_timeout=60)
+        client = XHSClient(
+            cookies={"test_cookie": "123"},
+            signature_provider=mock_signature_provider,
+            circuit_breaker=breaker,
+        )
+
+        with patch("httpx.AsyncClient") as mock_http_client:
+            mock_async_client = AsyncMock()
+            mock_async_client.aclose = AsyncMock()
+            mock_http_client.return_value = mock_async_client
+            mock_async_client.request.return_value = Response(
+                status_code=503, json={"msg": "Service unavailable"}
+            )
+
+            async with client:
+                for _ in range(2):
+                    with pytest.raises(APIError):
+                        await client.request("GET", "/api/degraded")
+
+                with pytest.raises(CircuitOpenError):
+                    await client.request("GET", "/api/degraded")
+
+                assert mock_async_client.request.call_count == 2
+                assert breaker.state("/api/degraded") == "open"
+
+    @pytest.mark.asyncio
+    async def test_network_errors_count_as_failures(self, mock_signature_provider):
+        """Transport errors are recorded as circuit failures."""
+        breaker = CircuitBreaker(min_calls=2, window_size=2, recovery_timeout=60)
+        client = XHSClient(
+            cookies={"test_cookie": "123"},
+            signature_provider=mock_signature_provider,
+            circuit_breaker=breaker,
+        )
+
+        with patch("httpx.AsyncClient") as mock_http_client:
+            mock_async_client = AsyncMock()
+            mock_async_client.aclose = AsyncMock()
+            mock_http_client.return_value = mock_async_client
+            mock_async_client.request.side_effect = TimeoutException("timed out")
+
+            async with client:
+                for _ in range(2):
+                    with pytest.raises(APIError):
+                        await client.request("GET", "api/slow")
+
+            assert breaker.state("/api/slow") == "open"
+
+    @pytest.mark.asyncio
+    async def test_client_errors_do_not_open_circuit(self, mock_signature_provider):
+        """4xx responses mean the endpoint is healthy and keep the circuit closed."""
+        breaker = CircuitBreaker(min_calls=2, window_size=2)
+        client = XHSClient(
+            cookies={"test_cookie": "123"},
+            signature_provider=mock_signature_provider,
+            circuit_breaker=breaker,
+        )
+
+        with patch("httpx.AsyncClient") as mock_http_client:
+            mock_async_client = AsyncMock()
+            mock_async_client.aclose = AsyncMock()
+            mock_http_client.return_value = mock_async_client
+            mock_async_client.request.return_value = Response(
+                status_code=429, json={"msg": "Too many requests"}
+            )
+
+            async with client:
+                for _ in range(3):
+                    with pytest.raises(RateLimitError):
+                        await client.request("GET", "/api/test")
+
+            assert breaker.state("/api/test") == "closed"
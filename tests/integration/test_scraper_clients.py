@@ -6,8 +6,11 @@ Tests the core client functionality:
 - Scraper attachment and access
 - Rate limiter integration
 - Signature provider integration
+- Request hedging
 """
 
+import asyncio
+
 import pytest
 from unittest.mock import Mock, patch, AsyncMock, MagicMock
 import httpx
@@ -15,6 +18,7 @@ import httpx
 from xhs_scraper.client import XHSClient, _normalize_path
 from xhs_scraper.exceptions import APIError
 from xhs_scraper.signature import SignatureProvider
+from xhs_scraper.utils.hedging import HedgingPolicy
 from xhs_scraper.utils.rate_limiter import TokenBucketRateLimiter
 
 
@@ -181,6 +185,74 @@ class TestXHSClientScraperAttachment:
         assert client.comments._client is client
         assert client.search._client is client
 
+    def test_init_with_invalid_signing_executor_raises(self):
+        """Unknown signing executors raise ValueError."""
+        with pytest.raises(ValueError, match="signing_executor must be"):
+            XHSClient(cookies={"a1": "test_a1_value"}, signing_executor="gpu")
+
+    def test_process_signing_with_custom_provider_raises(self):
+        """Process signing cannot apply to a caller's signature provider."""
+        with pytest.raises(ValueError, match="signing_executor='process'"):
+            XHSClient(
+                cookies={"a1": "test_a1_value"},
+                signature_provider=MagicMock(),
+                signing_executor="process",
+            )
+
+    @pytest.mark.asyncio
+    async def test_async_signing_uses_asign_methods(self):
+        """With signing_executor set, _request awaits asign_get/asign_post."""
+        provider = MagicMock()
+        provider.asign_get = AsyncMock(return_value={"x-s": "get"})
+        provider.asign_post = AsyncMock(return_value={"x-s": "post"})
+        client = XHSClient(
+            cookies={"a1": "test_a1_value"},
+            signature_provider=provider,
+            signing_executor="thread",
+        )
+
+        async with client:
+            with patch.object(
+                client._http, "request", new_callable=AsyncMock
+            ) as mock_req:
+                mock_req.return_value = MagicMock(
+                    status_code=200, json=MagicMock(return_value={})
+                )
+                await client._request("GET", "/api/a", params={"q": 1})
+                await client._request("POST", "/api/b", payload={"p": 2})
+
+        provider.asign_get.assert_awaited_once_with(
+            uri="/api/a", params={"q": 1}, cookies=client.cookies
+        )
+        provider.asign_post.assert_awaited_once_with(
+            uri="/api/b", payload={"p": 2}, cookies=client.cookies
+        )
+        provider.sign_get.assert_not_called()
+        assert mock_req.call_args_list[1].kwargs["headers"]["x-s"] == "post"
+
+    @pytest.mark.asyncio
+    async def test_async_signing_falls_back_to_executor_for_sync_providers(self):
+        """Providers without asign_* are run in the loop's default executor."""
+        provider = Mock(spec=SignatureProvider)
+        provider.sign_get.return_value = {"x-s": "sync"}
+        client = XHSClient(
+            cookies={"a1": "test_a1_value"},
+            signature_provider=provider,
+            signing_executor="thread",
+        )
+
+        async with client:
+            with patch.object(
+                client._http, "request", new_callable=AsyncMock
+            ) as mock_req:
+                mock_req.return_value = MagicMock(
+                    status_code=200, json=MagicMock(return_value={})
+                )
+                await client._request("GET", "/api/a")
+
+        provider.sign_get.assert_called_once()
+        assert mock_req.call_args.kwargs["headers"]["x-s"] == "sync"
+
 
 class TestXHSClientRequest:
     """Test XHSClient._request method."""
@@ -603,3 +675,211 @@ class TestXHSClientHttpxClientConfiguration:
 
         async with client:
             assert client._http.follow_redirects is True
+
+    @pytest.mark.asyncio
+    async def test_httpx_client_default_pool_limits(self):
+        """Default pool limits match httpx defaults and HTTP/2 is off."""
+        with patch("httpx.AsyncClient") as mock_http_client:
+            mock_http_client.return_value = AsyncMock()
+            async with XHSClient(cookies={"a1": "test_a1_value"}):
+                kwargs = mock_http_client.call_args.kwargs
+
+        assert kwargs["http2"] is False
+        assert kwargs["limits"] == httpx.Limits(
+            max_connections=100, max_keepalive_connections=20, keepalive_expiry=5.0
+        )
+
+    @pytest.mark.asyncio
+    async def test_httpx_client_pool_tuning(self):
+        """HTTP/2 and pool options are passed through to httpx."""
+        client = XHSClient(
+            cookies={"a1": "test_a1_value"},
+            http2=True,
+            max_connections=8,
+            max_keepalive_connections=8,
+            keepalive_expiry=60.0,
+        )
+        with patch("httpx.AsyncClient") as mock_http_client:
+            mock_http_client.return_value = AsyncMock()
+            async with client:
+                kwargs = mock_http_client.call_args.kwargs
+
+        assert kwargs["http2"] is True
+        assert kwargs["limits"] == httpx.Limits(
+            max_connections=8, max_keepalive_connections=8, keepalive_expiry=60.0
+        )
+
+    @pytest.mark.parametrize(
+        "kwargs",
+        [
+            {"max_connections": 0},
+            {"max_keepalive_connections": -1},
+            {"prewarm_connections": -1},
+        ],
+    )
+    def test_invalid_pool_options_raise(self, kwargs):
+        """Invalid pool options raise ValueError."""
+        with pytest.raises(ValueError):
+            XHSClient(cookies={"a1": "test_a1_value"}, **kwargs)
+
+    @pytest.mark.asyncio
+    async def test_prewarm_opens_connections(self):
+        """prewarm_connections sends that many HEAD requests on enter."""
+        with patch("httpx.AsyncClient") as mock_http_client:
+            mock_async_client = AsyncMock()
+            mock_http_client.return_value = mock_async_client
+            async with XHSClient(cookies={"a1": "test_a1_value"}, prewarm_connections=3):
+                pass
+
+        assert mock_async_client.head.await_count == 3
+
+    @pytest.mark.asyncio
+    async def test_prewarm_single_connection_with_http2(self):
+        """With HTTP/2 a single multiplexed connection is prewarmed."""
+        with patch("httpx.AsyncClient") as mock_http_client:
+            mock_async_client = AsyncMock()
+            mock_http_client.return_value = mock_async_client
+            async with XHSClient(
+                cookies={"a1": "test_a1_value"}, http2=True, prewarm_connections=4
+            ):
+                pass
+
+        assert mock_async_client.head.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_prewarm_failures_are_ignored(self):
+        """Connection errors during prewarm do not fail __aenter__."""
+        with patch("httpx.AsyncClient") as mock_http_client:
+            mock_async_client = AsyncMock()
+            mock_async_client.head.side_effect = httpx.ConnectError("offline")
+            mock_http_client.return_value = mock_async_client
+            async with XHSClient(cookies={"a1": "test_a1_value"}, prewarm_connections=2):
+                pass
+
+
+class TestXHSClientHedging:
+    """Test hedged GET requests."""
+
+    @staticmethod
+    def _policy(**kwargs):
+        policy = HedgingPolicy(initial_delay=0.05, min_delay=0.0, **kwargs)
+        # Pre-fill the budget so the first request may be hedged.
+        for _ in range(10):
+            policy.record_request()
+        return policy
+
+    @pytest.mark.asyncio
+    async def test_slow_get_is_hedged_and_fast_copy_wins(self):
+        """A slow primary is raced by a hedge; the hedge's response is used."""
+        policy = self._policy(max_hedge_ratio=0.5)
+        client = XHSClient(cookies={"a1": "test_a1_value"}, hedging=policy)
+        cancelled = []
+
+        async def fake_request(*args, **kwargs):
+            if fake_request.calls == 0:
+                fake_request.calls += 1
+                try:
+                    await asyncio.sleep(10)
+                except asyncio.CancelledError:
+                    cancelled.append(True)
+                    raise
+            fake_request.calls += 1
+            return MagicMock(status_code=200, json=MagicMock(return_value={"hedge": 1}))
+
+        fake_request.calls = 0
+
+        async with client:
+            with patch.object(client._http, "request", side_effect=fake_request):
+                result = await client._request("GET", "/api/slow")
+                await asyncio.sleep(0)  # let the losing attempt observe cancellation
+
+        assert result == {"hedge": 1}
+        assert fake_request.calls == 2
+        assert cancelled == [True]
+        assert policy.hedges_total == 1
+        # The cancelled primary is recorded too, at its elapsed time.
+        hedge, primary = sorted(policy._latencies["/api/slow"])
+        assert primary >= 0.05 > hedge
+
+    @pytest.mark.asyncio
+    async def test_rate_limit_queueing_does_not_trigger_hedges(self):
+        """Time spent waiting for the rate limiter is not upstream latency."""
+        policy = self._policy(max_hedge_ratio=0.5)
+
+        class SlowLimiter:
+            async def acquire(self):
+                await asyncio.sleep(0.2)
+
+        client = XHSClient(
+            cookies={"a1": "test_a1_value"}, hedging=policy, rate_limiter=SlowLimiter()
+        )
+
+        async def fast_request(*args, **kwargs):
+            await asyncio.sleep(0.01)
+            return MagicMock(status_code=200, json=MagicMock(return_value={"ok": 1}))
+
+        async with client:
+            with patch.object(
+                client._http, "request", side_effect=fast_request
+            ) as mock_req:
+                await client._request("GET", "/api/queued")
+
+        assert mock_req.call_count == 1
+        assert policy.hedges_total == 0
+        assert max(policy._latencies["/api/queued"]) < 0.1
+
+    @pytest.mark.asyncio
+    async def test_fast_get_is_not_hedged(self):
+        """Requests completing within the delay are sent once."""
+        policy = self._policy(max_hedge_ratio=0.5)
+        client = XHSClient(cookies={"a1": "test_a1_value"}, hedging=policy)
+
+        async with client:
+            with patch.object(
+                client._http, "request", new_callable=AsyncMock
+            ) as mock_req:
+                mock_req.return_value = MagicMock(
+                    status_code=200, json=MagicMock(return_value={"ok": True})
+                )
+                await client._request("GET", "/api/fast")
+
+        assert mock_req.call_count == 1
+        assert policy.hedges_total == 0
+
+    @pytest.mark.asyncio
+    async def test_post_is_never_hedged(self):
+        """POST requests are not idempotent and are never hedged."""
+        policy = self._policy(max_hedge_ratio=1.0)
+        client = XHSClient(cookies={"a1": "test_a1_value"}, hedging=policy)
+
+        async def slow_request(*args, **kwargs):
+            await asyncio.sleep(0.1)
+            return MagicMock(status_code=200, json=MagicMock(return_value={}))
+
+        async with client:
+            with patch.object(
+                client._http, "request", side_effect=slow_request
+            ) as mock_req:
+                await client._request("POST", "/api/slow", payload={"a": 1})
+
+        assert mock_req.call_count == 1
+        assert policy.hedges_total == 0
+
+    @pytest.mark.asyncio
+    async def test_hedge_budget_exhausted_waits_for_primary(self):
+        """With no hedge budget the slow primary is awaited alone."""
+        policy = self._policy(max_hedge_ratio=0.0)
+        client = XHSClient(cookies={"a1": "test_a1_value"}, hedging=policy)
+
+        async def slow_request(*args, **kwargs):
+            await asyncio.sleep(0.1)
+            return MagicMock(status_code=200, json=MagicMock(return_value={"p": 1}))
+
+        async with client:
+            with patch.object(
+                client._http, "request", side_effect=slow_request
+            ) as mock_req:
+                result = await client._request("GET", "/api/slow")
+
+        assert result == {"p": 1}
+        assert mock_req.call_count == 1
@@ -0,0 +1,130 @@
+"""Unit tests for xhs_scraper.utils.checkpoint module."""
+
+import pytest
+
+from xhs_scraper.exceptions import APIError
+from xhs_scraper.testing import FakeXHSAPI
+from xhs_scraper.utils.checkpoint import JSONCheckpointStore, SQLiteCheckpointStore
+
+
+@pytest.fixture(params=["json", "sqlite"])
+def store(request, tmp_path):
+    if request.param == "json":
+        yield JSONCheckpointStore(tmp_path / "checkpoints")
+        return
+    store = SQLiteCheckpointStore(tmp_path / "checkpoints.db")
+    yield store
+    store.close()
+
+
+def _fail_after(client, api, path, pages):
+    """Make the fake API answer 500 once ``pages`` responses of ``path`` arrived."""
+
+    @client.hooks.on_response
+    def fail(event):
+        if event.path == path and api.requests_by_path[path] >= pages:
+            api.error_rates = {500: 1.0}
+
+
+class TestStores:
+    """Test the checkpoint stores directly."""
+
+    def test_save_and_load(self, store):
+        """Pages accumulate items and seen ids; the cursor moves forward."""
+        assert store.load("k") is None
+        store.save_page("k", "s", cursor="c1", items=[{"a": 1}], seen=["x"])
+        store.save_page(
+            "k", "s", cursor="c2", items=[{"a": 2}], seen=["y"], done=True
+        )
+
+        checkpoint = store.load("k")
+        assert checkpoint.stream == "s"
+        assert checkpoint.cursor == "c2"
+        assert checkpoint.items == [{"a": 1}, {"a": 2}]
+        assert checkpoint.seen == ["x", "y"]
+        assert checkpoint.pages == 2
+        assert checkpoint.done is True
+        assert store.keys() == ["k"]
+
+    def test_delete(self, store):
+        """Deleted checkpoints are gone; deleting twice is fine."""
+        store.save_page("k", "s", cursor="c", items=[], seen=[])
+        store.delete("k")
+        store.delete("k")
+        assert store.load("k") is None
+        assert store.keys() == []
+
+    def test_similar_keys_are_kept_apart(self, store):
+        """Keys that sanitize to the same name do not share a checkpoint."""
+        store.save_page("user_notes:a/b", "s1", cursor="c1", items=[], seen=[])
+        store.save_page("user_notes:a_b", "s2", cursor="c2", items=[], seen=[])
+        assert store.load("user_notes:a/b").cursor == "c1"
+        assert store.load("user_notes:a_b").cursor == "c2"
+        assert sorted(store.keys()) == ["user_notes:a/b", "user_notes:a_b"]
+
+
+class TestResume:
+    """Test resume_from on the paginating scrapers."""
+
+    @pytest.mark.asyncio
+    async def test_user_notes_resume_after_failure(self, store, make_client):
+        """A crashed crawl resumes at the saved cursor without refetching."""
+        path = "/api/sns/web/v1/user_posted"
+        api = FakeXHSAPI(notes_per_user=100, user_page_size=10)
+        async with make_client(api, checkpoint_store=store) as client:
+            expected = await client.notes.get_user_notes("u1")
+        expected_ids = [note.note_id for note in expected.items]
+
+        api = FakeXHSAPI(notes_per_user=100, user_page_size=10)
+        async with make_client(api, checkpoint_store=store) as client:
+            _fail_after(client, api, path, pages=4)
+            with pytest.raises(APIError):
+                await client.notes.get_user_notes("u1", resume_from="u1")
+        assert store.load("u1").pages == 4
+
+        api.error_rates = {}
+        before = api.requests_by_path[path]
+        async with make_client(api, checkpoint_store=store) as client:
+            resumed = await client.notes.get_user_notes("u1", resume_from="u1")
+        assert [note.note_id for note in resumed.items] == expected_ids
+        assert api.requests_by_path[path] - before == 6
+        assert store.load("u1").done
+
+        async with make_client(api, checkpoint_store=store) as client:
+            again = await client.notes.get_user_notes("u1", resume_from="u1")
+        assert api.requests_by_path[path] - before == 6
+        assert [note.note_id for note in again.items] == expected_ids
+
+    @pytest.mark.asyncio
+    async def test_comments_resume_in_slots_mode(self, store, make_client):
+        """Comment crawls resume too, restoring items in the result mode."""
+        path = "/api/sns/web/v2/comment/page"
+        api = FakeXHSAPI(comment_pages=5, comments_per_page=4)
+        async with make_client(
+            api, checkpoint_store=store, result_mode="slots"
+        ) as client:
+            _fail_after(client, api, path, pages=2)
+            with pytest.raises(APIError):
+                await client.comments.get_comments("n1", resume_from="c")
+
+        api.error_rates = {}
+        async with make_client(
+            api, checkpoint_store=store, result_mode="slots"
+        ) as client:
+            resumed = await client.comments.get_comments("n1", resume_from="c")
+        ids = [comment.comment_id for comment in resumed.items]
+        assert len(ids) == 20 and len(set(ids)) == 20
+        assert api.requests_by_path[path] == 6
+
+    @pytest.mark.asyncio
+    async def test_requires_store_and_matching_stream(self, store, make_client):
+        """resume_from needs a store and refuses another stream's key."""
+        api = FakeXHSAPI(notes_per_user=10)
+        async with make_client(api) as client:
+            with pytest.raises(ValueError, match="checkpoint_store"):
+                await client.notes.get_user_notes("u1", resume_from="k")
+
+        async with make_client(api, checkpoint_store=store) as client:
+            await client.notes.get_user_notes("u1", resume_from="k")
+            with pytest.raises(ValueError, match="belongs to"):
+                await client.notes.get_user_notes("u2", resume_from="k")
@@ -0,0 +1,122 @@
+"""Unit tests for xhs_scraper.utils.circuit_breaker module."""
+
+import time
+
+import pytest
+
+from xhs_scraper.exceptions import CircuitOpenError, XHSError
+from xhs_scraper.utils.circuit_breaker import CircuitBreaker
+
+
+def _fail(breaker, key, times):
+    for _ in range(times):
+        breaker.before_call(key)
+        breaker.record_failure(key)
+
+
+class TestCircuitBreakerInit:
+    """Test CircuitBreaker initialization."""
+
+    def test_defaults(self):
+        """Default thresholds are sensible."""
+        breaker = CircuitBreaker()
+        assert breaker.failure_rate_threshold == 0.5
+        assert breaker.min_calls <= breaker.window_size
+
+    @pytest.mark.parametrize(
+        "kwargs",
+        [
+            {"failure_rate_threshold": 0},
+            {"failure_rate_threshold": 1.5},
+            {"window_size": 0},
+            {"window_size": 5, "min_calls": 6},
+            {"recovery_timeout": -1},
+            {"half_open_max_calls": 0},
+        ],
+    )
+    def test_invalid_arguments_raise(self, kwargs):
+        """Out-of-range thresholds raise ValueError."""
+        with pytest.raises(ValueError):
+            CircuitBreaker(**kwargs)
+
+
+class TestCircuitBreakerTransitions:
+    """Test closed/open/half-open transitions."""
+
+    def test_unknown_key_is_closed(self):
+        """Endpoints without history are closed."""
+        assert CircuitBreaker().state("/api/x") == "closed"
+
+    def test_stays_closed_below_min_calls(self):
+        """Failures below min_calls never open the circuit."""
+        breaker = CircuitBreaker(min_calls=5, window_size=10)
+        _fail(breaker, "/api/x", 4)
+        assert breaker.state("/api/x") == "closed"
+
+    def test_opens_at_failure_rate(self):
+        """Circuit opens once failure rate reaches the threshold."""
+        breaker = CircuitBreaker(failure_rate_threshold=0.5, min_calls=4, window_size=4)
+        for _ in range(2):
+            breaker.before_call("/api/x")
+            breaker.record_success("/api/x")
+        _fail(breaker, "/api/x", 2)
+        assert breaker.state("/api/x") == "open"
+
+    def test_open_circuit_fails_fast(self):
+        """Open circuit raises CircuitOpenError with retry_after."""
+        breaker = CircuitBreaker(min_calls=2, window_size=2, recovery_timeout=10)
+        _fail(breaker, "/api/x", 2)
+
+        with pytest.raises(CircuitOpenError) as exc_info:
+            breaker.before_call("/api/x")
+
+        assert isinstance(exc_info.value, XHSError)
+        assert exc_info.value.endpoint == "/api/x"
+        assert 0 < exc_info.value.retry_after <= 10
+
+    def test_circuits_are_per_endpoint(self):
+        """An open circuit does not affect other endpoints."""
+        breaker = CircuitBreaker(min_calls=2, window_size=2)
+        _fail(breaker, "/api/x", 2)
+        breaker.before_call("/api/y")
+        assert breaker.state("/api/y") == "closed"
+
+    def test_half_open_success_closes(self):
+        """A successful probe after recovery_timeout closes the circuit."""
+        breaker = CircuitBreaker(min_calls=2, window_size=2, recovery_timeout=0.05)
+        _fail(breaker, "/api/x", 2)
+        time.sleep(0.06)
+
+        assert breaker.state("/api/x") == "half_open"
+        breaker.before_call("/api/x")
+        breaker.record_success("/api/x")
+        assert breaker.state("/api/x") == "closed"
+
+    def test_half_open_failure_reopens(self):
+        """A failed probe re-opens the circuit."""
+        breaker = CircuitBreaker(min_calls=2, window_size=2, recovery_timeout=0.05)
+        _fail(breaker, "/api/x", 2)
+        time.sleep(0.06)
+
+        _fail(breaker, "/api/x", 1)
+        assert breaker.state("/api/x") == "open"
+
+    def test_half_open_limits_probes(self):
+        """Only half_open_max_calls probes are let through concurrently."""
+        breaker = CircuitBreaker(min_calls=2, window_size=2, recovery_timeout=0.05)
+        _fail(breaker, "/api/x", 2)
+        time.sleep(0.06)
+
+        breaker.before_call("/api/x")
+        with pytest.raises(CircuitOpenError):
+            breaker.before_call("/api/x")
+
+        breaker.release("/api/x")
+        breaker.before_call("/api/x")
+
+    def test_reset(self):
+        """reset() returns circuits to closed."""
+        breaker = CircuitBreaker(min_calls=2, window_size=2)
+        _fail(breaker, "/api/x", 2)
+        breaker.reset("/api/x")
+        assert breaker.state("/api/x") == "closed"
@@ -0,0 +1,123 @@
+"""Unit tests for xhs_scraper.cli module."""
+
+import csv
+import json
+
+import pytest
+
+from xhs_scraper.cli import build_parser, main
+from xhs_scraper.testing import FakeXHSAPI, FakeXHSServer
+
+
+@pytest.fixture
+def server():
+    api = FakeXHSAPI(notes_per_user=15, user_page_size=10, comment_pages=2)
+    with FakeXHSServer(api, port=0) as running:
+        api.media_base_url = f"{running.url}/media"
+        yield running
+
+
+@pytest.fixture
+def cookies(tmp_path):
+    path = tmp_path / "cookies.json"
+    path.write_text(json.dumps({"a1": "x", "web_session": "s"}))
+    return str(path)
+
+
+def _run(server, tmp_path, *argv):
+    options = ["--base-url", server.url, "--cache-dir", str(tmp_path)]
+    return main([*argv, *options, "--rate-limit", "100"])
+
+
+def _lines(path):
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+
+class TestCrawlCommands:
+    """Test the crawling subcommands against the fake server."""
+
+    def test_user_notes_to_jsonl(self, server, cookies, tmp_path):
+        """Every user's notes are written, one JSON object per line."""
+        out = tmp_path / "notes.jsonl"
+        argv = ["user-notes", "u1", "u2", "--cookies", cookies, "-o", str(out)]
+        assert _run(server, tmp_path, *argv) == 0
+        assert len(_lines(out)) == 30
+
+    def test_accounts_and_dedup(self, server, tmp_path):
+        """Targets spread over accounts; --dedup skips earlier results."""
+        accounts = tmp_path / "accounts.json"
+        accounts.write_text(json.dumps({"one": {"a1": "x"}, "two": {"a1": "y"}}))
+        out = tmp_path / "notes.json"
+        argv = ["user-notes", "u1", "u2", "u3", "--accounts", str(accounts)]
+
+        assert _run(server, tmp_path, *argv, "--dedup", "-o", str(out)) == 0
+        assert len(json.loads(out.read_text())) == 45
+        assert _run(server, tmp_path, *argv, "--dedup", "-o", str(out)) == 0
+        assert json.loads(out.read_text()) == []
+
+    def test_comments_to_csv(self, server, cookies, tmp_path):
+        """Comments are tagged with their note id."""
+        out = tmp_path / "comments.csv"
+        argv = ["comments", "n1", "--cookies", cookies, "-o", str(out)]
+        assert _run(server, tmp_path, *argv) == 0
+        with open(out, encoding="utf-8-sig") as f:
+            rows = list(csv.DictReader(f))
+        assert rows and {row["note_id"] for row in rows} == {"n1"}
+
+    def test_json_and_csv_to_stdout(self, server, cookies, tmp_path, capsys):
+        """Collected formats are printed when the crawl ends."""
+        argv = ["user-notes", "u1", "--cookies", cookies]
+        assert _run(server, tmp_path, *argv, "--format", "json") == 0
+        assert len(json.loads(capsys.readouterr().out)) == 15
+
+        assert _run(server, tmp_path, *argv, "--format", "csv") == 0
+        rows = list(csv.DictReader(capsys.readouterr().out.splitlines()))
+        assert len(rows) == 15 and all(row["note_id"] for row in rows)
+
+    def test_checkpoints_are_dropped_once_finished(self, server, cookies, tmp_path):
+        """A finished target is crawled afresh by the next --checkpoint run."""
+        out = tmp_path / "notes.jsonl"
+        argv = ["user-notes", "u1", "--checkpoint", "--cookies", cookies]
+        assert _run(server, tmp_path, *argv, "-o", str(out)) == 0
+        assert len(_lines(out)) == 15
+
+        server.api.publish("u1", 2)
+        assert _run(server, tmp_path, *argv, "-o", str(out)) == 0
+        assert len(_lines(out)) == 17
+
+    def test_search_details_and_media(self, server, cookies, tmp_path):
+        """Search output feeds notes and media runs through --input."""
+        found = tmp_path / "found.jsonl"
+        argv = ["search", "tea", "--details", "--cookies", cookies, "-o", str(found)]
+        assert _run(server, tmp_path, *argv) == 0
+        notes = _lines(found)
+        assert notes and all(note["note_id"] for note in notes)
+
+        media = tmp_path / "media.jsonl"
+        argv = ["media", "--input", str(found), "--cookies", cookies, "-o", str(media)]
+        assert _run(server, tmp_path, *argv, "--dir", str(tmp_path / "files")) == 0
+        files = [path for record in _lines(media) for path in record["files"]]
+        assert len(files) == sum(len(note["images"] or []) for note in notes)
+
+
+class TestExport:
+    """Test converting result files."""
+
+    def test_export_to_json(self, tmp_path):
+        """JSON Lines input becomes a JSON array."""
+        source = tmp_path / "in.jsonl"
+        source.write_text('{"note_id": "a"}\n{"note_id": "b"}\n')
+        out = tmp_path / "out.json"
+        assert main(["export", str(source), "-o", str(out)]) == 0
+        assert [r["note_id"] for r in json.loads(out.read_text())] == ["a", "b"]
+
+    def test_usage_errors(self, tmp_path):
+        """Missing credentials and bad options exit with status 2."""
+        with pytest.raises(SystemExit) as exc:
+            main(["comments", "n1", "--cache-dir", str(tmp_path)])
+        assert exc.value.code == 2
+        with pytest.raises(SystemExit):
+            build_parser().parse_args(["search", "tea", "--concurrency", "0"])
+        with pytest.raises(SystemExit) as exc:
+            main(["user-notes", "u1", "--checkpoint", "--incremental"])
+        assert exc.value.code == 2
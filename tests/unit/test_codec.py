@@ -0,0 +1,130 @@
+"""Unit tests for xhs_scraper.utils.codec module."""
+
+import json
+
+import httpx
+import pytest
+
+from xhs_scraper.exceptions import APIError
+from xhs_scraper.models import NoteResponse
+from xhs_scraper.testing import FakeXHSAPI
+from xhs_scraper.utils.codec import STDLIB, JSONCodec, StdlibCodec, get_codec
+from xhs_scraper.utils.export import export_to_csv, export_to_json
+
+CODECS = ["stdlib"]
+for _name in ("orjson", "msgspec"):
+    try:
+        get_codec(_name)
+    except ImportError:
+        continue
+    CODECS.append(_name)
+
+PAYLOAD = {"note_id": "abc", "num": 10, "cursor": "", "tags": ["美食", "旅行"]}
+
+
+class TestGetCodec:
+    """Test codec resolution."""
+
+    def test_default_is_stdlib(self):
+        """None and "stdlib" resolve to the shared stdlib codec."""
+        assert get_codec() is STDLIB
+        assert get_codec("stdlib") is STDLIB
+
+    def test_instance_passthrough(self):
+        """Codec instances are used as given."""
+        codec = StdlibCodec()
+        assert get_codec(codec) is codec
+
+    def test_auto_returns_codec(self):
+        """auto always resolves to some codec."""
+        assert isinstance(get_codec("auto"), JSONCodec)
+
+    def test_interface_is_abstract(self):
+        """Codecs must implement every method."""
+        with pytest.raises(TypeError):
+            JSONCodec()
+
+    def test_unknown_name_raises(self):
+        """Unknown codec names are rejected."""
+        with pytest.raises(ValueError):
+            get_codec("simplejson")
+
+
+@pytest.mark.parametrize("name", CODECS)
+class TestCodecs:
+    """Test every installed codec against the stdlib behavior."""
+
+    def test_dumps_matches_httpx_body(self, name):
+        """Request bodies are byte-identical to httpx's json= encoding."""
+        request = httpx.Request("POST", "https://example.com", json=PAYLOAD)
+        assert get_codec(name).dumps(PAYLOAD) == request.content
+
+    def test_loads_round_trip(self, name):
+        """Decoding accepts both bytes and str."""
+        codec = get_codec(name)
+        data = codec.dumps(PAYLOAD)
+        assert codec.loads(data) == PAYLOAD
+        assert codec.loads(data.decode()) == PAYLOAD
+
+    def test_loads_invalid_raises_value_error(self, name):
+        """Invalid documents raise ValueError like json.loads()."""
+        with pytest.raises(ValueError):
+            get_codec(name).loads(b"<html>")
+
+    def test_dumps_pretty_matches_stdlib(self, name):
+        """Indented output has the stdlib layout."""
+        expected = json.dumps(PAYLOAD, ensure_ascii=False, indent=2)
+        assert get_codec(name).dumps_pretty(PAYLOAD, indent=2) == expected
+
+    def test_encoder_return_types(self, name):
+        """dumps() returns bytes and dumps_pretty() returns str."""
+        codec = get_codec(name)
+        assert isinstance(codec.dumps(PAYLOAD), bytes)
+        assert isinstance(codec.dumps_pretty(PAYLOAD), str)
+        assert isinstance(codec.dumps_pretty(PAYLOAD, indent=None), str)
+
+    def test_default_hook(self, name):
+        """Unsupported objects go through the default hook."""
+        note = NoteResponse(note_id="n1", liked_count=3)
+        text = get_codec(name).dumps_pretty(
+            [note], default=lambda value: value.model_dump()
+        )
+        assert json.loads(text) == [note.model_dump()]
+
+    def test_exports_match_stdlib(self, name, tmp_path):
+        """Exported JSON files decode to the same data as stdlib exports."""
+        notes = [NoteResponse(note_id="n1", title="标题"), {"note_id": "n2"}]
+        expected = export_to_json(notes, tmp_path / "stdlib.json")
+        actual = export_to_json(notes, tmp_path / f"{name}.json", codec=name)
+        assert json.loads(actual.read_text("utf-8")) == json.loads(
+            expected.read_text("utf-8")
+        )
+
+        path = export_to_csv(
+            [{"note_id": "n1", "tags": ["a", "b"]}], tmp_path / "out.csv", codec=name
+        )
+        assert '"[""a"",""b""]"' in path.read_text("utf-8-sig").replace(" ", "")
+
+    @pytest.mark.asyncio
+    async def test_client_round_trip(self, name, make_client):
+        """The client decodes responses and encodes POST bodies with the codec."""
+        api = FakeXHSAPI()
+        async with make_client(api, codec=name) as client:
+            assert client.codec.name == name
+            result = await client.search.search_notes("coffee")
+        assert result.items
+        assert api.requests_by_path["/api/sns/web/v1/search/notes"] == 1
+
+
+class TestClientCodec:
+    """Test XHSClient codec handling."""
+
+    @pytest.mark.asyncio
+    async def test_invalid_json_maps_to_api_error(self, make_client):
+        """Undecodable 2xx bodies still raise APIError with a fast codec."""
+        transport = httpx.MockTransport(
+            lambda request: httpx.Response(200, content=b"not json")
+        )
+        async with make_client(transport=transport, codec=CODECS[-1]) as client:
+            with pytest.raises(APIError, match="Invalid JSON"):
+                await client.request("GET", "/api/x")
@@ -0,0 +1,111 @@
+"""Unit tests for xhs_scraper.utils.coordinator module."""
+
+import asyncio
+import sqlite3
+import time
+import urllib.error
+from unittest.mock import MagicMock
+
+import pytest
+
+from xhs_scraper.client import XHSClient
+from xhs_scraper.testing import FakeXHSAPI
+from xhs_scraper.utils.coordinator import (
+    Coordinator,
+    RemoteRateLimiter,
+    RemoteWorkQueue,
+)
+from xhs_scraper.utils.work_queue import QueueWorker, WorkQueue
+
+
+@pytest.fixture
+def coordinator(tmp_path):
+    queue = WorkQueue(tmp_path / "queue.db", retry_delay=0, max_attempts=2)
+    with Coordinator(queue, budgets={"alice": 20.0}, port=0, burst=1) as server:
+        yield server
+    queue.close()
+
+
+class TestRemoteWorkQueue:
+    """Test the queue protocol."""
+
+    def test_lease_ack_round_trip(self, coordinator):
+        """Remote workers lease exclusively and ack through the coordinator."""
+        first = RemoteWorkQueue(coordinator.url)
+        second = RemoteWorkQueue(coordinator.url)
+        assert first.put_many("note", [{"note_id": "a"}, {"note_id": "b"}]) == 2
+        assert not second.put("note", {"note_id": "a"})
+
+        [a] = first.lease("host-1")
+        [b] = second.lease("host-2")
+        assert {a.payload["note_id"], b.payload["note_id"]} == {"a", "b"}
+        assert first.lease("host-1") == []
+        assert first.ack(a) and second.nack(b, "boom")
+        assert coordinator.queue.counts()["done"] == 1
+        assert second.lease()[0].last_error == "boom"
+
+    def test_server_errors_are_replied(self, coordinator, monkeypatch):
+        """Bad requests get 400 and queue failures 500, never a dropped socket."""
+        remote = RemoteWorkQueue(coordinator.url)
+        body = {"kind": "note", "payloads": [{"n": 1}, {"n": 2}], "keys": ["k"]}
+        with pytest.raises(urllib.error.HTTPError) as exc:
+            remote._remote.call("/tasks", body)
+        assert exc.value.code == 400
+
+        def locked(*args, **kwargs):
+            raise sqlite3.OperationalError("database is locked")
+
+        monkeypatch.setattr(coordinator.queue, "lease", locked)
+        with pytest.raises(urllib.error.HTTPError) as exc:
+            remote.lease("host-1")
+        assert exc.value.code == 500
+        assert "database is locked" in exc.value.read().decode()
+
+    def test_unknown_budget_is_rejected(self, coordinator):
+        """Reserving from an unknown account is a client error."""
+        limiter = RemoteRateLimiter(coordinator.url, account="bob")
+        with pytest.raises(urllib.error.HTTPError):
+            asyncio.run(limiter.acquire())
+
+
+class TestDistributedCrawl:
+    """Test several workers sharing a crawl through the coordinator."""
+
+    @pytest.mark.asyncio
+    async def test_workers_share_tasks_without_double_work(
+        self, coordinator, make_client
+    ):
+        """Each task runs once across workers, within the account budget."""
+        api = FakeXHSAPI(notes_per_user=5)
+        remote = RemoteWorkQueue(coordinator.url)
+        remote.put_many("user_notes", [{"user_id": f"u{i}"} for i in range(8)])
+        done = []
+
+        async def run_worker(name):
+            async with make_client(
+                api, rate_limiter=RemoteRateLimiter(coordinator.url, "alice")
+            ) as client:
+                worker = QueueWorker(
+                    RemoteWorkQueue(coordinator.url),
+                    client,
+                    on_result=lambda task, result: done.append(task.payload),
+                    concurrency=2,
+                    poll_interval=0.01,
+                    owner=name,
+                )
+                await worker.run()
+
+        started = time.monotonic()
+        await asyncio.gather(run_worker("host-1"), run_worker("host-2"))
+        elapsed = time.monotonic() - started
+
+        assert sorted(p["user_id"] for p in done) == [f"u{i}" for i in range(8)]
+        assert coordinator.queue.counts()["done"] == 8
+        # 8 requests at 20/s with a burst of 1 take at least 7 intervals.
+        assert elapsed >= 7 / 20 * 0.9
+        assert coordinator.status()["budgets"]["alice"]["granted"] == 8
+
+    def test_client_rejects_both_rate_options(self):
+        """rate_limit and rate_limiter are exclusive."""
+        with pytest.raises(ValueError):
+            XHSClient(cookies={"a1": "x"}, rate_limit=1.0, rate_limiter=MagicMock())
@@ -0,0 +1,125 @@
+"""Unit tests for xhs_scraper.testing.fake_api module."""
+
+import time
+
+import pytest
+
+from xhs_scraper.exceptions import CaptchaRequiredError, RateLimitError, SignatureError
+from xhs_scraper.testing import FakeXHSAPI, FakeXHSServer, fixed
+
+
+class TestFakeXHSAPIData:
+    """Test synthetic data served by FakeXHSAPI."""
+
+    def test_deterministic_for_seed(self):
+        """The same seed produces the same data."""
+        query = {"user_id": "u1", "cursor": "", "num": "30"}
+        a = FakeXHSAPI(seed=7).handle("GET", "/api/sns/web/v1/user_posted", query, None)
+        b = FakeXHSAPI(seed=7).handle("GET", "/api/sns/web/v1/user_posted", query, None)
+        c = FakeXHSAPI(seed=8).handle("GET", "/api/sns/web/v1/user_posted", query, None)
+        assert a == b
+        assert a != c
+
+    def test_note_ids_encode_timestamp(self):
+        """Note ids are 24 hex chars with a leading unix timestamp."""
+        status, body = FakeXHSAPI().handle(
+            "GET", "/api/sns/web/v1/user_posted", {"user_id": "u1"}, None
+        )
+        assert status == 200
+        note_id = body["data"]["notes"][0]["note_id"]
+        assert len(note_id) == 24
+        assert int(note_id[:8], 16) > 1700000000
+
+    def test_unknown_endpoint_returns_404(self):
+        """Unknown paths are answered with 404."""
+        status, _ = FakeXHSAPI().handle("GET", "/api/unknown", {}, None)
+        assert status == 404
+
+    def test_invalid_error_rates_raise(self):
+        """Error rates must form a valid probability distribution."""
+        with pytest.raises(ValueError):
+            FakeXHSAPI(error_rates={429: 0.7, 503: 0.5})
+
+
+class TestFakeXHSAPIScrapers:
+    """Test scrapers against the in-process fake API."""
+
+    @pytest.mark.asyncio
+    async def test_user_notes_paginate(self, make_client):
+        """get_user_notes walks all configured pages."""
+        api = FakeXHSAPI(notes_per_user=75, user_page_size=30)
+        async with make_client(api) as client:
+            result = await client.notes.get_user_notes("u1")
+
+        assert len(result.items) == 75
+        assert len({n.note_id for n in result.items}) == 75
+        assert api.requests_by_path["/api/sns/web/v1/user_posted"] == 3
+
+    @pytest.mark.asyncio
+    async def test_comments_search_note_and_user(self, make_client):
+        """Every emulated endpoint parses into non-empty models."""
+        api = FakeXHSAPI(comment_pages=2, comments_per_page=5, search_pages=2)
+        async with make_client(api) as client:
+            comments = await client.comments.get_comments("n1")
+            replies = await client.comments.get_sub_comments("n1", "c1")
+            search = await client.search.search_notes("coffee", page=1)
+            note = await client.notes.get_note(search.items[0].note_id, "token")
+            user = await client.users.get_user_info("u1")
+
+        assert len(comments.items) == 10
+        assert len(replies.items) == 5
+        assert len(search.items) == 20
+        assert search.has_more is True
+        assert note.note_id == search.items[0].note_id
+        assert user.followers is not None
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        "status,exc",
+        [(429, RateLimitError), (461, SignatureError), (471, CaptchaRequiredError)],
+    )
+    async def test_injected_errors(self, status, exc, make_client):
+        """Injected status codes surface as the matching exceptions."""
+        api = FakeXHSAPI(error_rates={status: 1.0})
+        async with make_client(api) as client:
+            with pytest.raises(exc):
+                await client.users.get_user_info("u1")
+        assert api.errors_by_status == {status: 1}
+
+    @pytest.mark.asyncio
+    async def test_require_signature(self, make_client, mock_signature_provider):
+        """Unsigned requests are rejected with 461."""
+        api = FakeXHSAPI(require_signature=True)
+        mock_signature_provider.sign_get.return_value = {}
+        async with make_client(api) as client:
+            with pytest.raises(SignatureError):
+                await client.users.get_user_info("u1")
+
+    @pytest.mark.asyncio
+    async def test_latency(self, make_client):
+        """Sampled latency delays responses."""
+        api = FakeXHSAPI(latency=fixed(0.05))
+        async with make_client(api) as client:
+            start = time.monotonic()
+            await client.users.get_user_info("u1")
+            assert time.monotonic() - start >= 0.05
+
+
+class TestFakeXHSServer:
+    """Test the HTTP server wrapper."""
+
+    @pytest.mark.asyncio
+    async def test_serves_over_http(self, make_client):
+        """XHSClient can talk to the server through base_url."""
+        with FakeXHSServer(FakeXHSAPI(notes_per_user=10)) as server:
+            async with make_client(base_url=server.url) as client:
+                result = await client.notes.get_user_notes("u1")
+                comments = await client.comments.get_sub_comments("n1", "c1")
+
+        assert len(result.items) == 10
+        assert comments.items
+
+    def test_url_requires_running_server(self):
+        """url is unavailable before start()."""
+        with pytest.raises(RuntimeError):
+            FakeXHSServer().url
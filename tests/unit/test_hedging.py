@@ -0,0 +1,85 @@
+"""Unit tests for xhs_scraper.utils.hedging module."""
+
+import pytest
+
+from xhs_scraper.utils.hedging import HedgingPolicy
+
+
+class TestHedgingPolicyInit:
+    """Test HedgingPolicy initialization."""
+
+    @pytest.mark.parametrize(
+        "kwargs",
+        [
+            {"percentile": 0},
+            {"percentile": 1},
+            {"max_hedge_ratio": -0.1},
+            {"max_hedge_ratio": 1.1},
+            {"initial_delay": -1},
+            {"window_size": 0},
+            {"min_samples": 0},
+        ],
+    )
+    def test_invalid_arguments_raise(self, kwargs):
+        """Out-of-range arguments raise ValueError."""
+        with pytest.raises(ValueError):
+            HedgingPolicy(**kwargs)
+
+    def test_paths_filter(self):
+        """Only listed paths are eligible when paths is given."""
+        policy = HedgingPolicy(paths=["/api/a"])
+        assert policy.applies_to("/api/a")
+        assert not policy.applies_to("/api/b")
+
+    def test_all_paths_by_default(self):
+        """All paths are eligible when paths is None."""
+        assert HedgingPolicy().applies_to("/api/anything")
+
+
+class TestHedgingPolicyDelay:
+    """Test percentile-based hedge delay."""
+
+    def test_initial_delay_without_samples(self):
+        """initial_delay is used until min_samples latencies exist."""
+        policy = HedgingPolicy(initial_delay=0.7, min_samples=3)
+        policy.record_latency("/api/a", 0.1)
+        assert policy.delay("/api/a") == 0.7
+
+    def test_percentile_of_recent_latencies(self):
+        """Delay is the configured percentile of recorded latencies."""
+        policy = HedgingPolicy(percentile=0.9, min_samples=10, min_delay=0)
+        for i in range(1, 11):
+            policy.record_latency("/api/a", i / 10)
+        assert policy.delay("/api/a") == pytest.approx(0.9)
+
+    def test_min_delay_floor(self):
+        """Delay never drops below min_delay."""
+        policy = HedgingPolicy(min_samples=1, min_delay=0.2)
+        policy.record_latency("/api/a", 0.01)
+        assert policy.delay("/api/a") == 0.2
+
+    def test_window_drops_old_samples(self):
+        """Only the most recent window_size latencies are considered."""
+        policy = HedgingPolicy(percentile=0.5, window_size=2, min_samples=2, min_delay=0)
+        for latency in (5.0, 5.0, 0.1, 0.1):
+            policy.record_latency("/api/a", latency)
+        assert policy.delay("/api/a") == pytest.approx(0.1)
+
+
+class TestHedgingPolicyBudget:
+    """Test the hedge ratio cap."""
+
+    def test_no_hedges_without_requests(self):
+        """Hedging is refused before any requests are counted."""
+        assert not HedgingPolicy(max_hedge_ratio=0.5).try_acquire_hedge()
+
+    def test_ratio_cap(self):
+        """Hedges never exceed max_hedge_ratio of requests."""
+        policy = HedgingPolicy(max_hedge_ratio=0.1)
+        granted = 0
+        for _ in range(100):
+            policy.record_request()
+            if policy.try_acquire_hedge():
+                granted += 1
+        assert granted == 10
+        assert policy.hedges_total == 10
@@ -0,0 +1,105 @@
+"""Unit tests for xhs_scraper.utils.hooks module."""
+
+import httpx
+import pytest
+
+from xhs_scraper.exceptions import APIError, RateLimitError
+from xhs_scraper.testing import FakeXHSAPI
+from xhs_scraper.utils.hooks import InMemorySpanExporter, RequestHooks
+
+USER_INFO = "/api/sns/web/v1/user/otherinfo"
+
+
+class TestRequestHooks:
+    """Test the hook registry."""
+
+    def test_empty_registry_is_falsy(self):
+        """An unused registry lets the client skip instrumentation."""
+        hooks = RequestHooks()
+        assert not hooks
+        callback = hooks.on_error(lambda event: None)
+        assert hooks
+        hooks.remove(callback)
+        assert not hooks
+
+
+class TestClientHooks:
+    """Test hooks invoked by XHSClient."""
+
+    @pytest.mark.asyncio
+    async def test_lifecycle_and_spans(self, make_client):
+        """Successful requests run on_request then on_response."""
+        calls = []
+        async with make_client(FakeXHSAPI()) as client:
+            client.hooks.on_request(lambda event: calls.append(("request", event.path)))
+
+            @client.hooks.on_response
+            async def on_response(event):
+                calls.append(("response", event.status_code))
+
+            exporter = InMemorySpanExporter().attach(client.hooks)
+            await client.users.get_user_info("u1")
+
+        assert calls == [("request", USER_INFO), ("response", 200)]
+        (span,) = exporter.find(USER_INFO)
+        assert span.name == f"GET {USER_INFO}"
+        assert span.status_code == 200
+        assert span.duration > 0
+        assert span.bytes_received > 0
+        assert span.error is None
+
+    @pytest.mark.asyncio
+    async def test_error_status(self, make_client):
+        """Error statuses reach on_error with the status and exception."""
+        api = FakeXHSAPI(error_rates={429: 1.0})
+        async with make_client(api) as client:
+            exporter = InMemorySpanExporter().attach(client.hooks)
+            with pytest.raises(RateLimitError):
+                await client.users.get_user_info("u1")
+
+        (span,) = exporter.spans
+        assert span.status_code == 429
+        assert span.error == "RateLimitError"
+
+    @pytest.mark.asyncio
+    async def test_transport_error(self, make_client):
+        """Transport errors reach on_error without a status code."""
+
+        def fail(request):
+            raise httpx.ConnectError("refused", request=request)
+
+        async with make_client(transport=httpx.MockTransport(fail)) as client:
+            exporter = InMemorySpanExporter().attach(client.hooks)
+            with pytest.raises(APIError):
+                await client.users.get_user_info("u1")
+
+        (span,) = exporter.spans
+        assert span.status_code is None
+        assert span.error == "APIError"
+
+    @pytest.mark.asyncio
+    async def test_on_request_can_add_headers(self, make_client):
+        """Headers added by on_request are sent with the request."""
+        seen = {}
+
+        def handler(request):
+            seen.update(request.headers)
+            return httpx.Response(200, json={"success": True})
+
+        hooks = RequestHooks()
+        hooks.on_request(lambda event: event.headers.update({"x-trace-id": "t1"}))
+        transport = httpx.MockTransport(handler)
+        async with make_client(transport=transport, hooks=hooks) as client:
+            await client._request("GET", "/api/a")
+
+        assert seen["x-trace-id"] == "t1"
+        assert seen["x-s"] == "signature_value"
+
+    @pytest.mark.asyncio
+    async def test_failing_hook_does_not_break_request(self, make_client):
+        """Exceptions raised by hooks are logged and swallowed."""
+        async with make_client(FakeXHSAPI()) as client:
+            client.hooks.on_response(lambda event: 1 / 0)
+            user = await client.users.get_user_info("u1")
+
+        assert user.nickname
@@ -0,0 +1,163 @@
+"""Unit tests for xhs_scraper.utils.idset module."""
+
+import random
+import sys
+
+import httpx
+import pytest
+
+from xhs_scraper.testing import FakeXHSAPI
+from xhs_scraper.utils.idset import BloomIdSet, CompactIdSet, pack_id
+from xhs_scraper.utils.watermark import HighWaterMarkStore
+
+
+def _ids(count, seed=0):
+    rng = random.Random(seed)
+    return [f"{rng.getrandbits(96):024x}" for _ in range(count)]
+
+
+class TestCompactIdSet:
+    """Test CompactIdSet."""
+
+    def test_membership_across_merges(self):
+        """Ids are found before and after the front is merged."""
+        ids = _ids(5000)
+        seen = CompactIdSet(front_size=100)
+        assert all(seen.add(i) for i in ids)
+        assert not seen.add(ids[0])
+        assert len(seen) == 5000
+        assert all(i in seen for i in ids)
+        assert not any(i in seen for i in _ids(500, seed=1))
+
+    def test_ids_are_case_insensitive_and_non_hex_ids_hashed(self):
+        """Hex ids pack to their bytes; other strings are hashed."""
+        seen = CompactIdSet(["65A1B2C3000000001E00F1D2", "cursor-1"])
+        assert "65a1b2c3000000001e00f1d2" in seen
+        assert "cursor-1" in seen and "cursor-2" not in seen
+        assert len(pack_id("cursor-1")) == 12
+
+    def test_ids_with_whitespace_keep_the_key_width(self, tmp_path):
+        """24-char ids that fromhex() would shorten are hashed instead."""
+        spaced = "65a1b2c3d4e5f6a7b8c9d0  "
+        assert len(pack_id(spaced)) == 12
+        path = CompactIdSet([spaced, *_ids(3)]).save(tmp_path / "seen.ids")
+        assert spaced in CompactIdSet.load(path, use_mmap=False)
+
+    def test_memory_per_id(self):
+        """Merged sets use about 12 bytes per id, ~8x less than set[str]."""
+        ids = _ids(20000)
+        seen = CompactIdSet(ids, front_size=1000)
+        seen.compact()
+        strings = set(ids)
+        baseline = sys.getsizeof(strings) + sum(sys.getsizeof(i) for i in ids)
+        assert seen.memory_bytes() == 12 * len(ids)
+        assert baseline / seen.memory_bytes() > 8
+
+    @pytest.mark.parametrize("use_mmap", [True, False])
+    def test_save_and_load(self, tmp_path, use_mmap):
+        """Saved sets reload, optionally mapped, and keep accepting ids."""
+        ids = _ids(1000)
+        path = CompactIdSet(ids).save(tmp_path / "seen.ids")
+        seen = CompactIdSet.load(path, use_mmap=use_mmap)
+        assert len(seen) == 1000 and all(i in seen for i in ids)
+        assert seen.memory_bytes() == (0 if use_mmap else 12000)
+
+        extra = _ids(10, seed=2)
+        seen.update(extra)
+        seen.compact()
+        assert len(seen) == 1010 and all(i in seen for i in ids + extra)
+        seen.close()
+
+    def test_load_rejects_other_files(self, tmp_path):
+        """Files without the id set header are rejected."""
+        path = tmp_path / "other.bin"
+        path.write_bytes(b"not an id set")
+        with pytest.raises(ValueError):
+            CompactIdSet.load(path)
+
+
+class TestBloomIdSet:
+    """Test BloomIdSet."""
+
+    def test_no_false_negatives_and_bounded_false_positives(self):
+        """Added ids are always found; misses stay near error_rate."""
+        ids = _ids(10000)
+        seen = BloomIdSet(capacity=10000, error_rate=0.01)
+        seen.update(ids)
+        assert all(i in seen for i in ids)
+        false_positives = sum(i in seen for i in _ids(10000, seed=1))
+        assert false_positives < 300
+        assert seen.memory_bytes() < 1.3 * len(ids)
+
+    def test_invalid_arguments(self):
+        """Capacity and error rate are validated."""
+        with pytest.raises(ValueError):
+            BloomIdSet(0)
+        with pytest.raises(ValueError):
+            BloomIdSet(10, error_rate=1)
+
+
+class TestScraperDedup:
+    """Test seen_ids on the scrapers."""
+
+    @pytest.mark.asyncio
+    async def test_user_notes_skip_seen_ids(self, make_client):
+        """Notes already in seen_ids are skipped and new ones recorded."""
+        api = FakeXHSAPI(notes_per_user=30, user_page_size=10)
+        seen = CompactIdSet()
+        async with make_client(api) as client:
+            first = await client.notes.get_user_notes("u1", seen_ids=seen)
+            new_ids = api.publish("u1", count=2)
+            second = await client.notes.get_user_notes("u1", seen_ids=seen)
+
+        assert len(first.items) == 30
+        assert [note.note_id for note in second.items] == new_ids
+        assert len(seen) == 32
+
+    @pytest.mark.asyncio
+    async def test_comments_skip_seen_ids(self, make_client):
+        """Comments already in seen_ids are skipped."""
+        api = FakeXHSAPI(comment_pages=2, comments_per_page=5)
+        seen = set()
+        async with make_client(api) as client:
+            first = await client.comments.get_comments("n1", seen_ids=seen)
+            second = await client.comments.get_comments("n1", seen_ids=seen)
+
+        assert len(first.items) == 10 and len(seen) == 10
+        assert second.items == []
+
+    @pytest.mark.asyncio
+    async def test_incremental_crawl_stops_at_mark_with_seen_ids(self, make_client):
+        """Known notes in seen_ids still end an incremental crawl early."""
+        api = FakeXHSAPI(notes_per_user=30, user_page_size=10)
+        seen = CompactIdSet()
+        async with make_client(api, watermark_store=HighWaterMarkStore()) as client:
+            await client.notes.get_user_notes("u1", incremental=True, seen_ids=seen)
+            new_ids = api.publish("u1", count=2)
+            api.requests_by_path.clear()
+            second = await client.notes.get_user_notes(
+                "u1", incremental=True, seen_ids=seen
+            )
+
+        assert [note.note_id for note in second.items] == new_ids
+        assert api.requests_by_path["/api/sns/web/v1/user_posted"] == 1
+
+    @pytest.mark.asyncio
+    async def test_rejected_comments_are_not_marked_seen(self, make_client):
+        """Only comments that parsed are recorded in seen_ids."""
+        page = {
+            "success": True,
+            "items": [
+                {"comment_id": "c1"},
+                {"comment_id": "c2", "create_time": "not a number"},
+            ],
+            "cursor": "",
+            "has_more": False,
+        }
+        transport = httpx.MockTransport(lambda request: httpx.Response(200, json=page))
+        seen = set()
+        async with make_client(transport=transport) as client:
+            result = await client.comments.get_comments("n1", seen_ids=seen)
+
+        assert [c.comment_id for c in result.items] == ["c1"]
+        assert seen == {"c1"}
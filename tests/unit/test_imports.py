@@ -0,0 +1,83 @@
+"""Import-time budget tests for lazy package loading."""
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+import xhs_scraper
+
+ROOT = Path(__file__).resolve().parents[2]
+
+HEAVY_MODULES = ["httpx", "pydantic", "xhshow", "aiohttp", "sqlite3"]
+
+
+def _loaded_after(statement: str) -> list:
+    """Heavy modules present after running ``statement`` in a fresh interpreter."""
+    code = (
+        f"import sys, json\n{statement}\n"
+        f"print(json.dumps([m for m in {HEAVY_MODULES!r} if m in sys.modules]))"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=ROOT,
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    return json.loads(output)
+
+
+class TestImportBudget:
+    """Test which dependencies each entry point imports."""
+
+    def test_package_import_is_light(self):
+        """import xhs_scraper loads none of the heavy dependencies."""
+        assert _loaded_after("import xhs_scraper") == []
+
+    def test_export_does_not_import_client_stack(self):
+        """Export-only jobs skip httpx, pydantic, xhshow and aiohttp."""
+        assert _loaded_after("from xhs_scraper import export_to_json") == []
+
+    def test_client_defers_xhshow(self):
+        """xhshow is imported on the first signature, not with the client."""
+        loaded = _loaded_after("from xhs_scraper import XHSClient")
+        assert "xhshow" not in loaded
+        assert "aiohttp" not in loaded
+
+    def test_signer_loads_xhshow_on_first_use(self):
+        """Constructing the provider is cheap; signing imports xhshow."""
+        statement = (
+            "from xhs_scraper.signature import XHShowSignatureProvider\n"
+            "provider = XHShowSignatureProvider()\n"
+            "assert 'xhshow' not in sys.modules\n"
+            "provider.sign_get('/api/a', {}, {'a1': 'x'})"
+        )
+        assert "xhshow" in _loaded_after(statement)
+
+
+class TestLazyAttributes:
+    """Test PEP 562 attribute loading."""
+
+    def test_public_names_resolve(self):
+        """Every name in __all__ resolves to the defining module's object."""
+        from xhs_scraper.utils import export
+
+        for name in xhs_scraper.__all__:
+            assert getattr(xhs_scraper, name) is not None
+        assert xhs_scraper.export_to_json is export.export_to_json
+        assert "XHSClient" in dir(xhs_scraper)
+
+    def test_utils_names_resolve(self):
+        """xhs_scraper.utils re-exports its helpers lazily."""
+        from xhs_scraper import utils
+        from xhs_scraper.utils.media import download_media
+
+        assert utils.download_media is download_media
+
+    def test_unknown_name_raises(self):
+        """Unknown attributes raise AttributeError."""
+        with pytest.raises(AttributeError):
+            xhs_scraper.missing_name
@@ -0,0 +1,96 @@
+"""Unit tests for xhs_scraper.utils.loop_monitor module."""
+
+import asyncio
+import time
+
+import pytest
+
+from xhs_scraper.client import XHSClient
+from xhs_scraper.testing import FakeXHSAPI
+from xhs_scraper.utils.loop_monitor import LoopMonitor
+from xhs_scraper.utils.rate_limiter import TokenBucketRateLimiter
+
+
+def _block_loop(seconds):
+    time.sleep(seconds)
+
+
+class TestLoopMonitor:
+    """Test LoopMonitor sampling."""
+
+    @pytest.mark.parametrize(
+        "kwargs", [{"interval": 0}, {"slow_threshold": -1}, {"history": 0}]
+    )
+    def test_invalid_arguments_raise(self, kwargs):
+        """Out-of-range arguments raise ValueError."""
+        with pytest.raises(ValueError):
+            LoopMonitor(**kwargs)
+
+    @pytest.mark.asyncio
+    async def test_samples_lag_and_tasks(self):
+        """Heartbeats record lag and pending task counts."""
+        monitor = LoopMonitor(interval=0.01, sample_stacks=False)
+        monitor.start()
+        await asyncio.sleep(0.1)
+        await monitor.stop()
+
+        snapshot = monitor.snapshot()
+        assert snapshot["samples"] >= 3
+        assert snapshot["lag"]["max"] >= 0
+        assert snapshot["pending_tasks"]["max"] >= 1
+        assert not monitor.running
+
+    @pytest.mark.asyncio
+    async def test_slow_callback_stack_sampled(self):
+        """A blocking call is captured with its stack and duration."""
+        monitor = LoopMonitor(interval=0.01, slow_threshold=0.05)
+        monitor.start()
+        await asyncio.sleep(0.03)
+        _block_loop(0.3)
+        await asyncio.sleep(0.05)
+        await monitor.stop()
+
+        snapshot = monitor.snapshot()
+        assert snapshot["lag"]["max"] >= 0.2
+        (slow,) = snapshot["slow_callbacks"]
+        assert "_block_loop" in slow["stack"]
+        assert slow["duration"] >= 0.2
+
+    @pytest.mark.asyncio
+    async def test_rate_limiter_waiters(self):
+        """Tasks blocked on the rate limiter are counted."""
+        limiter = TokenBucketRateLimiter(rate=10, capacity=1)
+        monitor = LoopMonitor(interval=0.01, sample_stacks=False)
+        monitor.start(rate_limiter=limiter)
+        await asyncio.gather(*(limiter.acquire() for _ in range(4)))
+        await monitor.stop()
+
+        assert monitor.snapshot()["rate_limiter_waiters"]["max"] >= 1
+        assert limiter.waiters == 0
+
+    @pytest.mark.asyncio
+    async def test_rate_limiter_without_waiters(self, make_client):
+        """Limiters that only implement acquire() are sampled as 0 waiters."""
+
+        class AcquireOnly:
+            async def acquire(self):
+                pass
+
+        monitor = LoopMonitor(interval=0.01, sample_stacks=False)
+        api = FakeXHSAPI()
+        async with make_client(
+            api, rate_limiter=AcquireOnly(), loop_monitor=monitor
+        ) as client:
+            await client.users.get_user_info("u1")
+            await asyncio.sleep(0.05)
+
+        assert monitor.snapshot()["rate_limiter_waiters"]["max"] == 0
+
+    @pytest.mark.asyncio
+    async def test_client_starts_and_stops_monitor(self):
+        """XHSClient runs the monitor for the lifetime of the context."""
+        monitor = LoopMonitor(interval=0.01)
+        async with XHSClient(cookies={"a1": "x"}, loop_monitor=monitor) as client:
+            assert client.loop_monitor is monitor
+            assert monitor.running
+        assert not monitor.running
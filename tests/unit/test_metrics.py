@@ -0,0 +1,133 @@
+"""Unit tests for xhs_scraper.utils.metrics module."""
+
+import pickle
+import urllib.request
+
+import pytest
+
+from xhs_scraper.exceptions import RateLimitError
+from xhs_scraper.testing import FakeXHSAPI
+from xhs_scraper.utils.metrics import Histogram, RequestMetrics
+
+
+class TestHistogram:
+    """Test Histogram."""
+
+    def test_empty_quantile_is_none(self):
+        """Empty histograms have no quantiles."""
+        assert Histogram().quantile(0.5) is None
+
+    def test_quantile_within_bucket(self):
+        """Quantiles interpolate inside the bucket holding the rank."""
+        histogram = Histogram(buckets=(0.1, 0.2, 0.3))
+        for value in (0.05, 0.15, 0.15, 0.25):
+            histogram.observe(value)
+        assert histogram.count == 4
+        assert histogram.sum == pytest.approx(0.6)
+        assert 0.1 <= histogram.quantile(0.5) <= 0.2
+        assert 0.2 <= histogram.quantile(0.99) <= 0.3
+
+    def test_overflow_reports_largest_bound(self):
+        """Observations above the last bucket are capped at its bound."""
+        histogram = Histogram(buckets=(0.1,))
+        histogram.observe(5.0)
+        assert histogram.quantile(0.99) == 0.1
+
+
+class TestRequestMetrics:
+    """Test RequestMetrics recording and export."""
+
+    def test_invalid_buckets_raise(self):
+        """Buckets must be strictly increasing."""
+        with pytest.raises(ValueError):
+            RequestMetrics(buckets=(0.2, 0.1))
+
+    def test_snapshot(self):
+        """Snapshots aggregate requests, attempts and phases per path."""
+        metrics = RequestMetrics()
+        metrics.record_attempt("/a", rate_limit_wait=0.0, sign=0.001, network=0.02)
+        metrics.record_request(
+            "/a", status="200", total=0.03, parse=0.001, bytes_received=100
+        )
+        metrics.record_request("/a", status="transport_error", total=0.5)
+
+        snapshot = metrics.snapshot()["/a"]
+        assert snapshot["requests"] == {"200": 1, "transport_error": 1}
+        assert snapshot["requests_total"] == 2
+        assert snapshot["attempts"] == 1
+        assert snapshot["bytes_received"] == 100
+        assert snapshot["phases"]["network"]["count"] == 1
+        assert snapshot["phases"]["parse"]["count"] == 1
+        assert snapshot["phases"]["total"]["count"] == 2
+
+    def test_merge_pickled_metrics(self):
+        """Metrics survive pickling and merge into another instance."""
+        worker = RequestMetrics()
+        worker.record_attempt("/a", rate_limit_wait=0.0, sign=0.001, network=0.02)
+        worker.record_request("/a", status="200", total=0.03, bytes_received=10)
+        parent = RequestMetrics()
+        parent.record_request("/a", status="200", total=0.05)
+
+        parent.merge(pickle.loads(pickle.dumps(worker)))
+
+        snapshot = parent.snapshot()["/a"]
+        assert snapshot["requests"] == {"200": 2}
+        assert snapshot["attempts"] == 1
+        assert snapshot["bytes_received"] == 10
+        assert snapshot["phases"]["total"]["count"] == 2
+        with pytest.raises(ValueError):
+            parent.merge(RequestMetrics(buckets=(1.0,)))
+
+    def test_render_prometheus(self):
+        """Prometheus output has cumulative buckets and escaped labels."""
+        metrics = RequestMetrics(buckets=(0.1, 1.0))
+        metrics.record_request('/a"b', status="200", total=0.05)
+        metrics.record_request('/a"b', status="200", total=0.5)
+
+        text = metrics.render_prometheus()
+        assert 'xhs_requests_total{path="/a\\"b",status="200"} 2' in text
+        assert (
+            'xhs_request_duration_seconds_bucket{path="/a\\"b",phase="total",le="0.1"} 1'
+            in text
+        )
+        assert (
+            'xhs_request_duration_seconds_bucket{path="/a\\"b",phase="total",le="+Inf"} 2'
+            in text
+        )
+        assert 'xhs_request_duration_seconds_count{path="/a\\"b",phase="total"} 2' in text
+
+    def test_serve(self):
+        """The exporter serves the Prometheus text over HTTP."""
+        metrics = RequestMetrics()
+        metrics.record_request("/a", status="200", total=0.01)
+        with metrics.serve(port=0) as server:
+            with urllib.request.urlopen(server.url, timeout=5) as response:
+                body = response.read().decode()
+        assert 'xhs_requests_total{path="/a",status="200"} 1' in body
+
+
+class TestClientMetrics:
+    """Test metrics collected by XHSClient."""
+
+    @pytest.mark.asyncio
+    async def test_records_phases_and_statuses(self, make_client):
+        """Successful and failed requests are both recorded per path."""
+        api = FakeXHSAPI(notes_per_user=40, user_page_size=20)
+        metrics = RequestMetrics()
+        async with make_client(api, rate_limit=1000, metrics=metrics) as client:
+            assert client.metrics is metrics
+            await client.notes.get_user_notes("u1", max_pages=10)
+            api.error_rates = {429: 1.0}
+            with pytest.raises(RateLimitError):
+                await client.users.get_user_info("u1")
+
+        snapshot = metrics.snapshot()
+        notes = snapshot["/api/sns/web/v1/user_posted"]
+        assert notes["requests"] == {"200": 2}
+        assert notes["attempts"] == 2
+        assert notes["bytes_received"] > 0
+        for phase in ("rate_limit_wait", "sign", "network", "parse", "total"):
+            assert notes["phases"][phase]["count"] == 2
+
+        user = snapshot["/api/sns/web/v1/user/otherinfo"]
+        assert user["requests"] == {"429": 1}
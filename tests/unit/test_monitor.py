@@ -0,0 +1,92 @@
+"""Unit tests for keyword monitoring in xhs_scraper.scrapers.search."""
+
+import pytest
+
+from xhs_scraper.client import XHSClient
+from xhs_scraper.testing import FakeXHSAPI
+
+PATH = "/api/sns/web/v1/search/notes"
+
+
+class TestKeywordMonitor:
+    """Test KeywordMonitor polling and streaming."""
+
+    def test_invalid_options_raise(self):
+        """Out-of-range options are rejected."""
+        with pytest.raises(ValueError):
+            XHSClient(cookies={"a1": "x"}).search.monitor_keywords([])
+        with pytest.raises(ValueError):
+            XHSClient(cookies={"a1": "x"}).search.monitor_keywords(
+                ["a"], min_interval=10, max_interval=1
+            )
+
+    @pytest.mark.asyncio
+    async def test_poll_fetches_until_known(self, make_client):
+        """Polls stop at the first page reaching already-seen notes."""
+        api = FakeXHSAPI(search_pages=5)
+        async with make_client(api) as client:
+            monitor = client.search.monitor_keywords(["coffee"])
+            state = monitor.states["coffee"]
+
+            assert await monitor.poll(state) == []
+            assert api.requests_by_path[PATH] == 1
+
+            new_ids = api.publish_search("coffee", count=25)
+            notes = await monitor.poll(state)
+            assert [note.note_id for note in notes] == new_ids[::-1]
+            assert api.requests_by_path[PATH] == 3
+
+            assert await monitor.poll(state) == []
+            assert api.requests_by_path[PATH] == 4
+
+    @pytest.mark.asyncio
+    async def test_interval_adapts_to_posting_rate(self, make_client):
+        """Quiet keywords back off; busy ones are polled more often."""
+        api = FakeXHSAPI()
+        async with make_client(api) as client:
+            monitor = client.search.monitor_keywords(
+                ["quiet", "busy"],
+                min_interval=1,
+                max_interval=100,
+                initial_interval=10,
+                max_pages=1,
+            )
+            quiet, busy = monitor.states["quiet"], monitor.states["busy"]
+            for state in (quiet, busy):
+                await monitor.poll(state)
+
+            await monitor.poll(quiet)
+            assert quiet.interval == 20
+
+            api.publish_search("busy", count=30)
+            await monitor.poll(busy)
+            assert busy.interval == 5  # more than max_pages of new notes
+
+            monitor.max_pages = 5
+            api.publish_search("busy", count=5)
+            await monitor.poll(busy)
+            assert busy.rate > 0
+            assert busy.interval == 1  # target_new / rate, clamped
+
+    @pytest.mark.asyncio
+    async def test_stream_emits_new_notes(self, make_client):
+        """The stream skips baselines and yields (keyword, note) for new notes."""
+        api = FakeXHSAPI()
+        published = []
+        async with make_client(api) as client:
+
+            @client.hooks.on_response
+            def publish_after_baselines(event):
+                if api.requests_by_path[PATH] == 2:
+                    published.extend(api.publish_search("b", count=3))
+
+            monitor = client.search.monitor_keywords(
+                ["a", "b"], min_interval=0.01, max_interval=0.01
+            )
+            received = []
+            async for keyword, note in monitor:
+                received.append((keyword, note.note_id))
+                if len(received) == 3:
+                    break
+
+        assert received == [("b", note_id) for note_id in published[::-1]]
@@ -0,0 +1,109 @@
+"""Unit tests for xhs_scraper.utils.note_id module."""
+
+from datetime import datetime, timezone
+
+import pytest
+
+from xhs_scraper.testing import FakeXHSAPI
+from xhs_scraper.utils.note_id import (
+    TimeRange,
+    is_note_id,
+    note_created_at,
+    note_timestamp,
+)
+
+NOTE_ID = "65a1b2c3000000001e00f1d2"
+
+
+class TestDecoding:
+    """Test note id time decoding."""
+
+    def test_timestamp(self):
+        """The first 8 hex digits are the creation time."""
+        assert note_timestamp(NOTE_ID) == 0x65A1B2C3
+        assert note_created_at(NOTE_ID) == datetime(
+            2024, 1, 12, 21, 44, 35, tzinfo=timezone.utc
+        )
+
+    @pytest.mark.parametrize("value", ["", "abc", "z" * 24, NOTE_ID + "0", None])
+    def test_malformed_ids(self, value):
+        """Malformed ids are not decoded."""
+        assert not is_note_id(value)
+        assert note_timestamp(value) is None
+
+
+class TestTimeRange:
+    """Test TimeRange."""
+
+    def test_bounds(self):
+        """created_after is inclusive, created_before exclusive."""
+        timestamp = note_timestamp(NOTE_ID)
+        window = TimeRange(timestamp, timestamp + 1)
+        assert window.contains(NOTE_ID)
+        assert not TimeRange(created_before=timestamp).contains(NOTE_ID)
+        assert TimeRange(created_after=timestamp + 1).is_older(NOTE_ID)
+
+    def test_datetime_bounds_and_undated_ids(self):
+        """Datetimes are accepted; undecodable ids are kept."""
+        window = TimeRange(created_after=datetime(2025, 1, 1, tzinfo=timezone.utc))
+        assert not window.contains(NOTE_ID)
+        assert window.contains("not-a-note-id")
+        assert not window.is_older("not-a-note-id")
+
+    def test_empty_window_raises(self):
+        """created_after must precede created_before."""
+        with pytest.raises(ValueError):
+            TimeRange(10, 10)
+
+
+class TestScraperFilters:
+    """Test created_after/created_before on the scrapers."""
+
+    @pytest.mark.asyncio
+    async def test_user_notes_stop_at_window_start(self, make_client):
+        """Pagination stops at the first note older than created_after."""
+        api = FakeXHSAPI(notes_per_user=100, user_page_size=10)
+        async with make_client(api) as client:
+            everything = await client.notes.get_user_notes("u1")
+            ids = [note.note_id for note in everything.items]
+            after = note_timestamp(ids[24])
+            before = note_timestamp(ids[5])
+            requests = api.requests_by_path["/api/sns/web/v1/user_posted"]
+
+            result = await client.notes.get_user_notes(
+                "u1", created_after=after, created_before=before
+            )
+
+        assert [note.note_id for note in result.items] == ids[6:25]
+        assert api.requests_by_path["/api/sns/web/v1/user_posted"] - requests == 3
+
+    @pytest.mark.asyncio
+    async def test_search_filters_and_ends_pagination(self, make_client):
+        """TIME_DESC search pages drop old notes and report has_more=False."""
+        api = FakeXHSAPI(search_pages=5)
+        async with make_client(api) as client:
+            page = await client.search.search_notes("coffee", sort="TIME_DESC")
+            ids = [note.note_id for note in page.items]
+            filtered = await client.search.search_notes(
+                "coffee", sort="TIME_DESC", created_after=note_timestamp(ids[9])
+            )
+
+        assert page.has_more
+        assert [note.note_id for note in filtered.items] == ids[:10]
+        assert not filtered.has_more
+
+    @pytest.mark.asyncio
+    async def test_get_notes_skips_out_of_range_ids(self, make_client):
+        """Bulk fetch requests only notes inside the window, in input order."""
+        api = FakeXHSAPI(notes_per_user=30)
+        async with make_client(api) as client:
+            listed = await client.notes.get_user_notes("u1")
+            after = note_timestamp(listed.items[9].note_id)
+            notes = await client.notes.get_notes(
+                listed.items, created_after=after, concurrency=3
+            )
+
+        assert [note.note_id for note in notes] == [
+            note.note_id for note in listed.items[:10]
+        ]
+        assert api.requests_by_path["/api/sns/web/v1/feed"] == 10
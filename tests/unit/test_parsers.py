@@ -0,0 +1,211 @@
+"""Unit tests for xhs_scraper.parsers module."""
+
+import json
+import pytest
+
+from xhs_scraper.client import XHSClient
+from xhs_scraper.models import (
+    CommentRecord,
+    CommentResponse,
+    NoteRecord,
+    NoteResponse,
+    UserRecord,
+    UserResponse,
+)
+from xhs_scraper.parsers import parse_comments, parse_search_notes, parse_user_notes
+from xhs_scraper.testing import FakeXHSAPI
+from xhs_scraper.utils.export import export_to_csv, export_to_json
+
+
+class TestParseComments:
+    """Test parse_comments."""
+
+    def test_valid_page(self):
+        """Every valid item becomes a CommentResponse."""
+        result = parse_comments(
+            [
+                {"comment_id": "c1", "content": "hi", "sub_comments": []},
+                {"comment_id": "c2", "user": {"user_id": "u1"}},
+            ]
+        )
+        assert result.rejected == 0
+        assert [c.comment_id for c in result.items] == ["c1", "c2"]
+        assert all(isinstance(c, CommentResponse) for c in result.items)
+
+    def test_rejected_items_counted(self):
+        """Invalid items are dropped and reported, the rest kept in order."""
+        result = parse_comments(
+            [
+                {"comment_id": "c1"},
+                {"comment_id": "c2", "create_time": "not a number"},
+                "not a dict",
+                {"comment_id": "c3"},
+            ]
+        )
+        assert [c.comment_id for c in result.items] == ["c1", "c3"]
+        assert result.rejected == 2
+        assert len(result.errors) == 2
+        assert result.errors[0].startswith("create_time")
+
+
+class TestParseNotes:
+    """Test note page parsers."""
+
+    def test_user_notes(self):
+        """user_posted items map display_title, user and liked_count."""
+        result = parse_user_notes(
+            [
+                {
+                    "note_id": "n1",
+                    "display_title": "title",
+                    "user": {"user_id": "u1", "nick_name": "nick"},
+                    "interact_info": {"liked_count": "12"},
+                    "xsec_token": "tok",
+                }
+            ]
+        )
+        (note,) = result.items
+        assert isinstance(note, NoteResponse)
+        assert note.title == "title"
+        assert note.user.nickname == "nick"
+        assert note.liked_count == 12
+        assert note.xsec_token == "tok"
+
+    def test_search_notes(self):
+        """Search items read counts from note_card; empty counts become None."""
+        result = parse_search_notes(
+            [
+                {
+                    "id": "n1",
+                    "note_card": {
+                        "display_title": "t",
+                        "interact_info": {"liked_count": "3", "comment_count": ""},
+                    },
+                },
+                {"id": "n2", "note_card": None},
+                {"id": "n3", "note_card": {"interact_info": {"shared_count": "x"}}},
+            ]
+        )
+        (note,) = result.items
+        assert note.note_id == "n1"
+        assert note.liked_count == 3
+        assert note.commented_count is None
+        assert result.rejected == 2
+
+
+class TestResultModes:
+    """Test the dict and slots result modes."""
+
+    COMMENT = {
+        "comment_id": "c1",
+        "content": "hi",
+        "user": {"user_id": "u1", "nickname": "n"},
+        "create_time": "1700000000000",
+        "sub_comments": [{"comment_id": "c2"}],
+        "extra": "ignored",
+    }
+
+    def test_records_have_model_field_names(self):
+        """Slots records mirror the pydantic model fields."""
+        assert UserRecord.__slots__ == tuple(UserResponse.model_fields)
+        assert CommentRecord.__slots__ == tuple(CommentResponse.model_fields)
+        assert NoteRecord.__slots__ == tuple(NoteResponse.model_fields)
+
+    @pytest.mark.parametrize("mode", ["dict", "slots"])
+    def test_comments_match_model_dump(self, mode):
+        """Raw modes produce the same data as model_dump()."""
+        expected = parse_comments([self.COMMENT]).items[0].model_dump()
+        (item,) = parse_comments([self.COMMENT, None], mode).items
+        assert (item if mode == "dict" else item.to_dict()) == expected
+
+    def test_slots_types(self):
+        """Slots mode nests records."""
+        (comment,) = parse_comments([self.COMMENT], "slots").items
+        assert isinstance(comment, CommentRecord)
+        assert isinstance(comment.user, UserRecord)
+        assert isinstance(comment.sub_comments[0], CommentRecord)
+        assert comment.create_time == 1700000000000
+
+    @pytest.mark.parametrize("mode", ["dict", "slots"])
+    def test_search_notes_match_model_dump(self, mode):
+        """Note projections agree across modes."""
+        raw = [
+            {
+                "id": "n1",
+                "xsec_token": "t",
+                "note_card": {
+                    "display_title": "title",
+                    "user": {"user_id": "u1", "nick_name": "nick"},
+                    "interact_info": {"liked_count": "5", "comment_count": "0"},
+                },
+            }
+        ]
+        expected = parse_search_notes(raw).items[0].model_dump()
+        (item,) = parse_search_notes(raw, mode).items
+        assert (item if mode == "dict" else item.to_dict()) == expected
+
+    def test_every_mode_keeps_the_same_items(self):
+        """Modes differ in container type only, not in which items survive."""
+        notes = [
+            {"note_id": "ok", "interact_info": {"liked_count": "12"}},
+            {"note_id": "float", "interact_info": {"liked_count": 3.0}},
+            {"note_id": "wan", "interact_info": {"liked_count": "1.2万"}},
+            {"note_id": "fraction", "interact_info": {"liked_count": 1.5}},
+            {"note_id": 42},
+            {"note_id": "user", "user": "not a dict"},
+            "not a dict",
+        ]
+        comments = [
+            {"comment_id": "ok", "create_time": " 17 "},
+            {"comment_id": "bad", "create_time": "yesterday"},
+            {"comment_id": "subs", "sub_comments": "none"},
+            {"comment_id": "images", "content": ["a"]},
+        ]
+        for parse, page in [(parse_user_notes, notes), (parse_comments, comments)]:
+            expected = parse(page)
+            for mode in ("dict", "slots"):
+                result = parse(page, mode)
+                items = [i if mode == "dict" else i.to_dict() for i in result.items]
+                assert items == [i.model_dump() for i in expected.items]
+                assert result.rejected == expected.rejected
+
+
+class TestClientResultMode:
+    """Test result_mode through XHSClient and export."""
+
+    def test_invalid_mode_raises(self):
+        """Unknown result modes are rejected."""
+        with pytest.raises(ValueError, match="result_mode"):
+            XHSClient(cookies={"a1": "x"}, result_mode="tuple")
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        "mode,note_type",
+        [("model", NoteResponse), ("dict", dict), ("slots", NoteRecord)],
+    )
+    async def test_scrapers_honor_mode(
+        self, mode, note_type, tmp_path, make_client
+    ):
+        """Every scraper returns the configured result type, and it exports."""
+        api = FakeXHSAPI(notes_per_user=5, comment_pages=1, comments_per_page=3)
+        async with make_client(api, result_mode=mode) as client:
+            notes = await client.notes.get_user_notes("u1")
+            search = await client.search.search_notes("k")
+            note = await client.notes.get_note(_get(search.items[0], "note_id"), "t")
+            comments = await client.comments.get_comments("n1")
+            user = await client.users.get_user_info("u1")
+
+        assert len(notes.items) == 5
+        assert all(type(n) is note_type for n in notes.items + search.items + [note])
+        assert len(comments.items) == 3
+        user_type = {"model": UserResponse, "dict": dict, "slots": UserRecord}[mode]
+        assert type(user) is user_type
+
+        path = export_to_json(notes.items + comments.items, tmp_path / "out.json")
+        exported = json.loads(path.read_text(encoding="utf-8"))
+        assert exported[0]["note_id"] == _get(notes.items[0], "note_id")
+        export_to_csv(notes.items, tmp_path / "out.csv")
+
+
+def _get(item, name):
+    return item[name] if isinstance(item, dict) else getattr(item, name)
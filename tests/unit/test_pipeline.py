@@ -0,0 +1,132 @@
+"""Unit tests for xhs_scraper.pipeline module."""
+
+import asyncio
+import json
+
+import pytest
+
+from xhs_scraper.pipeline import (
+    JSONLinesSink,
+    Pipeline,
+    comments_stage,
+    note_detail_stage,
+    search_stage,
+)
+from xhs_scraper.testing import FakeXHSAPI
+
+
+class TestPipeline:
+    """Test the generic pipeline."""
+
+    @pytest.mark.asyncio
+    async def test_map_fan_out_and_drop(self):
+        """Async functions map, generators fan out and None drops items."""
+        collected = []
+
+        async def double(n):
+            return n * 2
+
+        async def repeat(n):
+            for _ in range(2):
+                yield n
+
+        async def odd_only(n):
+            return n if n % 4 else None
+
+        async def sink(n):
+            collected.append(n)
+
+        stats = await (
+            Pipeline()
+            .stage("double", double, concurrency=3)
+            .stage("repeat", repeat)
+            .stage("filter", odd_only)
+            .stage("sink", sink)
+            .run(range(5))
+        )
+
+        assert sorted(collected) == [2, 2, 6, 6]
+        assert stats["repeat"].emitted == 10
+        assert stats["filter"].emitted == 4
+        assert stats["sink"].received == 4
+
+    @pytest.mark.asyncio
+    async def test_backpressure_bounds_in_flight_items(self):
+        """A slow sink blocks the producer instead of buffering everything."""
+        produced = []
+        consumed = []
+
+        async def source(n):
+            produced.append(n)
+            return n
+
+        async def slow_sink(n):
+            await asyncio.sleep(0.001)
+            consumed.append(n)
+            # Queue of 2 + one item in the sink + one blocked in put().
+            assert len(produced) - len(consumed) <= 4
+
+        stats = await (
+            Pipeline(queue_size=2)
+            .stage("source", source)
+            .stage("sink", slow_sink)
+            .run(range(30))
+        )
+
+        assert consumed == list(range(30))
+        assert stats["source"].blocked_seconds > 0
+        assert stats["sink"].max_queue <= 2
+
+    @pytest.mark.asyncio
+    async def test_errors_skip_or_raise(self):
+        """Failing items are skipped by default or abort the run."""
+
+        async def fail_on_three(n):
+            if n == 3:
+                raise RuntimeError("boom")
+            return n
+
+        async def sink(n):
+            pass
+
+        stats = await Pipeline().stage("f", fail_on_three).stage("s", sink).run(
+            range(5)
+        )
+        assert stats["f"].failed == 1 and stats["s"].received == 4
+
+        pipeline = Pipeline(on_error="raise").stage("f", fail_on_three)
+        with pytest.raises(RuntimeError, match="boom"):
+            await pipeline.run(range(5))
+
+    def test_invalid_configuration(self):
+        """Stage options are validated."""
+        pipeline = Pipeline().stage("a", print)
+        with pytest.raises(ValueError):
+            pipeline.stage("a", print)
+        with pytest.raises(ValueError):
+            pipeline.stage("b", print, concurrency=0)
+
+
+class TestCrawlStages:
+    """Test the XHS stages end to end against the fake API."""
+
+    @pytest.mark.asyncio
+    async def test_search_detail_comments_sink(self, tmp_path, make_client):
+        """Keywords flow through to one JSON line per note."""
+        api = FakeXHSAPI(search_pages=2, comment_pages=1, comments_per_page=3)
+        path = tmp_path / "notes.jsonl"
+        async with make_client(api) as client:
+            stats = await (
+                Pipeline(queue_size=5)
+                .stage("search", search_stage(client, max_pages=2))
+                .stage("detail", note_detail_stage(client), concurrency=4)
+                .stage("comments", comments_stage(client), concurrency=2)
+                .stage("sink", JSONLinesSink(path))
+                .run(["coffee", "tea"])
+            )
+
+        lines = [json.loads(line) for line in path.read_text().splitlines()]
+        assert len(lines) == stats["search"].emitted > 0
+        assert all(len(line["comments"]) == 3 for line in lines)
+        assert all(line["note"]["note_id"] for line in lines)
+        assert api.requests_by_path["/api/sns/web/v1/feed"] == len(lines)
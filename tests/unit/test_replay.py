@@ -0,0 +1,117 @@
+"""Unit tests for xhs_scraper.utils.replay module."""
+
+import time
+
+import httpx
+import pytest
+
+from xhs_scraper.exceptions import APIError
+from xhs_scraper.utils.replay import (
+    ReplayArchive,
+    RequestRecorder,
+    canonical_params,
+    canonical_request_key,
+)
+
+
+def _live_handler(request: httpx.Request) -> httpx.Response:
+    """Stand-in for the live API: two pages of user notes."""
+    cursor = request.url.params.get("cursor", "")
+    if cursor == "":
+        data = {"notes": [{"note_id": "n1"}], "cursor": "c1", "has_more": True}
+    else:
+        data = {"notes": [{"note_id": "n2"}], "cursor": "c2", "has_more": False}
+    return httpx.Response(200, json={"success": True, "data": data})
+
+
+class TestCanonicalRequestKey:
+    """Test canonical request keys."""
+
+    def test_get_params_order_independent(self):
+        """Query parameter order does not change the key."""
+        a = canonical_request_key("GET", "/api/a", [("x", "1"), ("y", "2")])
+        b = canonical_request_key("get", "/api/a", [("y", "2"), ("x", "1")])
+        assert a == b
+
+    def test_post_body_key_order_independent(self):
+        """JSON body key order does not change the key."""
+        a = canonical_request_key("POST", "/api/a", [], b'{"a":1,"b":2}')
+        b = canonical_request_key("POST", "/api/a", [], b'{"b":2,"a":1}')
+        assert a == b
+
+    def test_volatile_fields_ignored(self):
+        """search_id differs per call and is excluded from the key."""
+        a = canonical_request_key("POST", "/api/s", [], b'{"keyword":"k","search_id":"1"}')
+        b = canonical_request_key("POST", "/api/s", [], b'{"keyword":"k","search_id":"2"}')
+        assert a == b
+
+    def test_different_params_differ(self):
+        """Different parameters produce different keys."""
+        a = canonical_request_key("GET", "/api/a", [("cursor", "")])
+        b = canonical_request_key("GET", "/api/a", [("cursor", "c1")])
+        assert a != b
+
+
+class TestRecordReplay:
+    """Test recording through XHSClient and replaying the archive."""
+
+    @pytest.mark.asyncio
+    async def test_round_trip_through_scraper(self, tmp_path, make_client):
+        """Recorded pagination replays to the same scraper result."""
+        recorder = RequestRecorder()
+        transport = httpx.MockTransport(_live_handler)
+        async with make_client(transport=transport, recorder=recorder) as client:
+            live = await client.notes.get_user_notes("u1")
+
+        assert len(recorder.entries) == 2
+        archive_path = recorder.save(tmp_path / "traffic.jsonl.gz")
+
+        archive = ReplayArchive.load(archive_path)
+        assert len(archive) == 2
+        async with make_client(transport=archive.transport()) as client:
+            replayed = await client.notes.get_user_notes("u1")
+
+        assert [n.note_id for n in replayed.items] == [n.note_id for n in live.items]
+        assert [n.note_id for n in replayed.items] == ["n1", "n2"]
+
+    @pytest.mark.asyncio
+    async def test_unrecorded_request_returns_404(self, make_client):
+        """Requests missing from the archive fail with APIError 404."""
+        archive = ReplayArchive([])
+        async with make_client(transport=archive.transport()) as client:
+            with pytest.raises(APIError) as exc_info:
+                await client._request("GET", "/api/missing")
+
+        assert exc_info.value.status_code == 404
+
+    @pytest.mark.asyncio
+    async def test_injected_latency(self, make_client):
+        """Latency callables delay every replayed response."""
+        entry = {
+            "method": "GET",
+            "path": "/api/a",
+            "params": canonical_params([]),
+            "status": 200,
+            "body": '{"ok": true}',
+        }
+        archive = ReplayArchive([entry])
+        transport = archive.transport(latency=lambda: 0.05)
+        async with make_client(transport=transport) as client:
+            start = time.monotonic()
+            result = await client._request("GET", "/api/a")
+            elapsed = time.monotonic() - start
+
+        assert result == {"ok": True}
+        assert elapsed >= 0.05
+
+    def test_repeated_keys_cycle_in_order(self):
+        """Multiple recordings of one key are served in order."""
+        entry = {"method": "GET", "path": "/api/a", "params": canonical_params([])}
+        archive = ReplayArchive(
+            [
+                {**entry, "status": 200, "body": "1"},
+                {**entry, "status": 200, "body": "2"},
+            ]
+        )
+        request = httpx.Request("GET", "https://example.com/api/a")
+        assert [archive.find(request)["body"] for _ in range(3)] == ["1", "2", "1"]
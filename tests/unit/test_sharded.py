@@ -0,0 +1,101 @@
+"""Unit tests for xhs_scraper.sharded module."""
+
+from unittest.mock import MagicMock
+
+import pytest
+
+from xhs_scraper.client import XHSClient
+from xhs_scraper.sharded import ShardedCrawler, default_shard_key, shard_for
+from xhs_scraper.testing import FakeXHSAPI
+
+
+def fake_client(**options):
+    """Client factory run inside the worker processes."""
+    provider = MagicMock()
+    provider.sign_get = MagicMock(return_value={"x-s": "sig"})
+    provider.sign_post = MagicMock(return_value={"x-s": "sig"})
+    api = FakeXHSAPI(notes_per_user=15, user_page_size=10)
+    return XHSClient(signature_provider=provider, transport=api.transport(), **options)
+
+
+async def failing(client, payload):
+    """Handler that always fails."""
+    raise ValueError(f"bad {payload['n']}")
+
+
+async def rate(client, payload):
+    """Handler reporting the worker's rate limit."""
+    return {"rate": client.rate_limiter.rate}
+
+
+class TestSharding:
+    """Test task routing."""
+
+    def test_shard_for_is_stable(self):
+        """The same key always maps to the same shard."""
+        assert shard_for("user-1", 16) == shard_for("user-1", 16)
+        assert {shard_for(f"u{i}", 4) for i in range(100)} == {0, 1, 2, 3}
+
+    def test_tasks_group_by_key(self):
+        """Tasks for one user land in one shard."""
+        crawler = ShardedCrawler({"cookies": {"a1": "x"}}, processes=3)
+        tasks = [("user_notes", {"user_id": f"u{i % 5}"}) for i in range(20)]
+        shards = crawler.shard(tasks)
+        assert sum(len(part) for part in shards) == 20
+        for index, part in enumerate(shards):
+            assert all(shard_for(p["user_id"], 3) == index for _, p in part)
+        assert default_shard_key("search", {"keyword": "tea"}) == "tea"
+
+
+class TestShardedCrawler:
+    """Test running tasks in worker processes."""
+
+    def test_results_and_metrics_are_aggregated(self):
+        """Every task's result and every worker's metrics reach the parent."""
+        crawler = ShardedCrawler(
+            {"cookies": {"a1": "x"}},
+            processes=2,
+            concurrency=2,
+            client_factory=fake_client,
+            batch_size=2,
+        )
+        tasks = [("user_notes", {"user_id": f"u{i}"}) for i in range(6)]
+        results = list(crawler.run(tasks))
+
+        assert sorted(r.payload["user_id"] for r in results) == [
+            f"u{i}" for i in range(6)
+        ]
+        assert all(r.error is None and len(r.data["items"]) == 15 for r in results)
+        snapshot = crawler.metrics.snapshot()
+        assert snapshot["/api/sns/web/v1/user_posted"]["requests_total"] == 12
+        assert sum(stats.succeeded for stats in crawler.stats) == 6
+        assert all(stats.exit_code == 0 for stats in crawler.stats)
+
+    def test_task_errors_are_reported(self):
+        """Failing tasks come back with their error instead of data."""
+        crawler = ShardedCrawler(
+            {"cookies": {"a1": "x"}},
+            processes=2,
+            handlers={"fail": failing},
+            client_factory=fake_client,
+        )
+        results = list(crawler.run([("fail", {"n": 1, "keyword": "k"})]))
+        assert [r.error for r in results] == ["ValueError: bad 1"]
+
+    def test_rate_limit_is_split_across_shards(self):
+        """Shards share the account's rate instead of each using all of it."""
+        crawler = ShardedCrawler(
+            {"cookies": {"a1": "x"}, "rate_limit": 3.0},
+            processes=2,
+            handlers={"rate": rate},
+            client_factory=fake_client,
+        )
+        tasks = [("rate", {"keyword": f"k{i}"}) for i in range(8)]
+        results = list(crawler.run(tasks))
+        assert all(stats.tasks for stats in crawler.stats)
+        assert {r.data["rate"] for r in results} == {1.5}
+
+    def test_invalid_arguments(self):
+        """Sizes must be positive."""
+        with pytest.raises(ValueError):
+            ShardedCrawler({"cookies": {"a1": "x"}}, processes=0)
@@ -348,3 +348,121 @@ class TestSignatureProviderUsesSessionManager:
         get_session = mock_client.sign_headers_get.call_args.kwargs["session"]
         post_session = mock_client.sign_headers_post.call_args.kwargs["session"]
         assert get_session is post_session
+
+
+class TestXHShowSignatureProviderAsync:
+    """Test asign_get()/asign_post() executor dispatch."""
+
+    def test_invalid_executor_raises(self):
+        """Unknown executor kinds raise ValueError."""
+        with pytest.raises(ValueError, match="executor must be"):
+            XHShowSignatureProvider(executor="gpu")
+
+    def test_invalid_max_workers_raises(self):
+        """Non-positive worker counts raise ValueError."""
+        with pytest.raises(ValueError, match="max_workers must be positive"):
+            XHShowSignatureProvider(executor="thread", max_workers=0)
+
+    @pytest.mark.asyncio
+    @patch("xhs_scraper.signature.Xhshow")
+    @patch("xhs_scraper.signature.SessionManager")
+    async def test_asign_inline_without_executor(
+        self, mock_session_manager, mock_xhshow
+    ):
+        """Without an executor asign_get signs inline and starts no pool."""
+        mock_xhshow.return_value.sign_headers_get.return_value = {"x-s": "sig"}
+
+        provider = XHShowSignatureProvider()
+        headers = await provider.asign_get("/api/get", {"a": 1}, {"a1": "x"})
+
+        assert headers == {"x-s": "sig"}
+        assert provider._executor is None
+
+    @pytest.mark.asyncio
+    @patch("xhs_scraper.signature.Xhshow")
+    @patch("xhs_scraper.signature.SessionManager")
+    async def test_asign_on_thread_pool(self, mock_session_manager, mock_xhshow):
+        """With a thread executor signing runs off the event loop thread."""
+        import threading
+
+        loop_thread = threading.get_ident()
+        signing_threads = []
+
+        def sign_headers_post(**kwargs):
+            signing_threads.append(threading.get_ident())
+            return {"x-s": "sig"}
+
+        mock_xhshow.return_value.sign_headers_post.side_effect = sign_headers_post
+
+        provider = XHShowSignatureProvider(executor="thread", max_workers=2)
+        try:
+            headers = await provider.asign_post("/api/post", {"k": "v"}, {"a1": "x"})
+        finally:
+            provider.shutdown()
+
+        assert headers == {"x-s": "sig"}
+        assert signing_threads and signing_threads[0] != loop_thread
+        assert provider._executor is None
+
+    @pytest.mark.asyncio
+    async def test_asign_on_process_pool(self):
+        """With a process executor real xhshow signatures are produced."""
+        provider = XHShowSignatureProvider(executor="process", max_workers=1)
+        try:
+            headers = await provider.asign_get(
+                "/api/sns/web/v1/user/otherinfo",
+                {"target_user_id": "123"},
+                {"a1": "test_a1_value"},
+            )
+        finally:
+            provider.shutdown()
+
+        assert headers["x-s"]
+        assert headers["x-s-common"]
+
+
+class TestXHShowSignatureProviderCommonCache:
+    """Test per-cookie-set caching of x-s-common."""
+
+    COOKIES = {"a1": "test_a1_value", "web_session": "session_1"}
+
+    def test_x_s_common_reused_for_same_cookies(self):
+        """Same cookies produce the same cached x-s-common."""
+        provider = XHShowSignatureProvider()
+        first = provider.sign_get("/api/a", {"q": 1}, dict(self.COOKIES))
+        second = provider.sign_post("/api/b", {"p": 2}, dict(self.COOKIES))
+
+        assert first["x-s-common"] == second["x-s-common"]
+        assert first["x-s"] != second["x-s"]
+
+    def test_cache_invalidated_on_cookie_change(self):
+        """Changed cookies compute a fresh x-s-common."""
+        provider = XHShowSignatureProvider()
+        with patch.object(
+            provider, "_sign_xs_common", wraps=provider._sign_xs_common
+        ) as compute:
+            provider.sign_get("/api/a", None, dict(self.COOKIES))
+            provider.sign_get("/api/a", None, dict(self.COOKIES))
+            assert compute.call_count == 1
+
+            provider.sign_get(
+                "/api/a", None, {**self.COOKIES, "web_session": "session_2"}
+            )
+            assert compute.call_count == 2
+
+    def test_clear_cache(self):
+        """clear_cache() forces recomputation."""
+        provider = XHShowSignatureProvider()
+        provider.sign_get("/api/a", None, dict(self.COOKIES))
+        provider.clear_cache()
+        with patch.object(
+            provider, "_sign_xs_common", wraps=provider._sign_xs_common
+        ) as compute:
+            provider.sign_get("/api/a", None, dict(self.COOKIES))
+        assert compute.call_count == 1
+
+    def test_cache_disabled(self):
+        """cache_common=False leaves xhshow's per-call x-s-common untouched."""
+        provider = XHShowSignatureProvider(cache_common=False)
+        provider.sign_get("/api/a", None, dict(self.COOKIES))
+        assert not provider._xs_common_cache
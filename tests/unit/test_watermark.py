@@ -0,0 +1,94 @@
+"""Unit tests for xhs_scraper.utils.watermark module."""
+
+import pytest
+
+from xhs_scraper.testing import FakeXHSAPI
+from xhs_scraper.utils.watermark import HighWaterMarkStore
+
+PATH = "/api/sns/web/v1/user_posted"
+
+
+async def _crawl(make_client, api, marks, **kwargs):
+    async with make_client(api, watermark_store=marks) as client:
+        result = await client.notes.get_user_notes("u1", incremental=True, **kwargs)
+    return [note.note_id for note in result.items]
+
+
+class TestHighWaterMarkStore:
+    """Test the mark store."""
+
+    def test_update_keeps_newest(self):
+        """Marks keep the newest ids first, capped at ``keep``."""
+        marks = HighWaterMarkStore(keep=3)
+        marks.update("u", ["c", "b", "a"])
+        mark = marks.update("u", ["e", "d"], new_sticky=["s"])
+        assert mark.ids == ["e", "d", "c"]
+        assert mark.sticky == ["s"]
+
+    def test_persists_to_file(self, tmp_path):
+        """Marks survive reopening the store."""
+        path = tmp_path / "marks.json"
+        HighWaterMarkStore(path).update("u", ["a"])
+        assert HighWaterMarkStore(path).get("u").ids == ["a"]
+
+    def test_delete(self, tmp_path):
+        """Deleted marks are gone from memory and disk."""
+        path = tmp_path / "marks.json"
+        marks = HighWaterMarkStore(path)
+        marks.update("u", ["a"])
+        marks.delete("u")
+        assert HighWaterMarkStore(path).get("u") is None
+
+
+class TestIncrementalCrawl:
+    """Test get_user_notes(incremental=True)."""
+
+    @pytest.mark.asyncio
+    async def test_returns_only_new_notes(self, make_client):
+        """After a full first crawl, only newly published notes are fetched."""
+        api = FakeXHSAPI(notes_per_user=90, user_page_size=10)
+        marks = HighWaterMarkStore()
+
+        assert len(await _crawl(make_client, api, marks)) == 90
+        assert api.requests_by_path[PATH] == 9
+
+        assert await _crawl(make_client, api, marks) == []
+        assert api.requests_by_path[PATH] == 10
+
+        new_ids = api.publish("u1", count=3)
+        assert await _crawl(make_client, api, marks) == new_ids
+        assert api.requests_by_path[PATH] == 11
+        assert marks.get("u1").ids[:3] == new_ids
+
+    @pytest.mark.asyncio
+    async def test_sticky_notes_do_not_stop_pagination(self, make_client):
+        """Pinned old notes are returned once and never end the crawl early."""
+        api = FakeXHSAPI(notes_per_user=30, user_page_size=10, sticky_notes=2)
+        marks = HighWaterMarkStore()
+
+        first = await _crawl(make_client, api, marks)
+        assert len(first) == 30
+        assert marks.get("u1").sticky == first[:2]
+
+        new_ids = api.publish("u1", count=12)
+        assert await _crawl(make_client, api, marks) == new_ids
+
+    @pytest.mark.asyncio
+    async def test_max_pages_does_not_advance_mark(self, make_client):
+        """A crawl cut short by max_pages leaves the mark unchanged."""
+        api = FakeXHSAPI(notes_per_user=20, user_page_size=10)
+        marks = HighWaterMarkStore()
+        await _crawl(make_client, api, marks)
+        before = marks.get("u1").ids
+
+        new_ids = api.publish("u1", count=15)
+        assert await _crawl(make_client, api, marks, max_pages=1) == new_ids[:10]
+        assert marks.get("u1").ids == before
+        assert await _crawl(make_client, api, marks) == new_ids
+
+    @pytest.mark.asyncio
+    async def test_requires_store(self, make_client):
+        """incremental needs a watermark store."""
+        async with make_client(FakeXHSAPI()) as client:
+            with pytest.raises(ValueError, match="watermark_store"):
+                await client.notes.get_user_notes("u1", incremental=True)
@@ -0,0 +1,169 @@
+"""Unit tests for xhs_scraper.utils.work_queue module."""
+
+import asyncio
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+from xhs_scraper.exceptions import CookieExpiredError
+from xhs_scraper.testing import FakeXHSAPI
+from xhs_scraper.utils.work_queue import QueueWorker, WorkQueue
+
+
+@pytest.fixture
+def queue(tmp_path):
+    queue = WorkQueue(tmp_path / "queue.db", retry_delay=0, max_attempts=2)
+    yield queue
+    queue.close()
+
+
+class TestWorkQueue:
+    """Test leasing, acknowledgement and dead letters."""
+
+    def test_put_deduplicates(self, queue):
+        """Tasks are unique per kind and key, even once done."""
+        assert queue.put("note", {"note_id": "a"})
+        assert not queue.put("note", {"note_id": "a"})
+        assert queue.put_many("note", [{"note_id": "a"}, {"note_id": "b"}]) == 1
+        [task] = queue.lease(limit=1)
+        queue.ack(task)
+        assert not queue.put("note", task.payload)
+        assert queue.counts() == {"pending": 1, "leased": 0, "done": 1, "dead": 0}
+
+    def test_leases_are_exclusive_and_ordered_by_priority(self, queue):
+        """A leased task is invisible to other workers until it expires."""
+        queue.put("note", {"note_id": "low"})
+        queue.put("note", {"note_id": "high"}, priority=5)
+        other = WorkQueue(queue.path)
+        first = queue.lease("w1")
+        second = other.lease("w2")
+        assert first[0].payload == {"note_id": "high"}
+        assert second[0].payload == {"note_id": "low"}
+        assert other.lease("w2") == []
+        other.close()
+
+    def test_expired_lease_is_redelivered(self, queue):
+        """A crashed worker's task comes back after the visibility timeout."""
+        queue.put("note", {"note_id": "a"})
+        [lost] = queue.lease(visibility_timeout=0.01)
+        time.sleep(0.02)
+        [again] = queue.lease()
+        assert again.id == lost.id and again.attempts == 2
+        assert not queue.ack(lost)
+        assert queue.ack(again)
+
+    def test_failures_retry_then_dead_letter(self, queue):
+        """nack() retries until max_attempts, then dead-letters the task."""
+        queue.put("note", {"note_id": "a"})
+        [task] = queue.lease()
+        queue.nack(task, "boom 1")
+        [task] = queue.lease()
+        assert task.last_error == "boom 1"
+        queue.nack(task, RuntimeError("boom 2"))
+
+        assert queue.lease() == []
+        [dead] = queue.dead_letters()
+        assert dead.payload == {"note_id": "a"}
+        assert (dead.attempts, dead.error) == (2, "boom 2")
+        assert queue.requeue_dead() == 1
+        assert queue.lease()[0].attempts == 1
+
+    def test_dead_lettering_a_key_twice(self, tmp_path):
+        """A re-put task can fail again even if its row id was reused."""
+        queue = WorkQueue(tmp_path / "once.db", max_attempts=1)
+        for error in ("first", "second"):
+            assert queue.put("note", {"note_id": "a"})
+            [task] = queue.lease()
+            assert queue.nack(task, error)
+
+        dead = queue.dead_letters()
+        assert [d.error for d in dead] == ["first", "second"]
+        assert len({d.id for d in dead}) == 2
+        assert queue.requeue_dead([dead[1].id]) == 1
+        assert queue.lease()[0].last_error == "second"
+        queue.close()
+
+    def test_release_does_not_use_an_attempt(self, queue):
+        """Released tasks keep their attempt count."""
+        queue.put("note", {"note_id": "a"})
+        [task] = queue.lease()
+        queue.release(task)
+        assert queue.lease()[0].attempts == 1
+
+
+class TestQueueWorker:
+    """Test consuming the queue with the scrapers."""
+
+    @pytest.mark.asyncio
+    async def test_worker_runs_scrapers_and_follow_ups(self, queue, make_client):
+        """Search tasks fan out into note tasks via on_result."""
+        api = FakeXHSAPI()
+        results = {}
+
+        def on_result(task, result):
+            results[(task.kind, task.key)] = result
+            if task.kind == "search":
+                queue.put_many(
+                    "note",
+                    [
+                        {"note_id": note.note_id, "xsec_token": note.xsec_token}
+                        for note in result.items[:3]
+                    ],
+                    key=lambda payload: payload["note_id"],
+                )
+
+        queue.put("search", {"keyword": "coffee"})
+        async with make_client(api) as client:
+            worker = QueueWorker(
+                queue, client, on_result=on_result, concurrency=2, poll_interval=0.01
+            )
+            await worker.run()
+
+        assert worker.processed == 4
+        assert queue.counts()["done"] == 4
+        assert sum(kind == "note" for kind, _ in results) == 3
+
+    @pytest.mark.asyncio
+    async def test_expired_cookies_release_task_and_stop(self, queue):
+        """Auth failures stop the worker without using the task's attempt."""
+
+        async def expired(client, payload):
+            raise CookieExpiredError("expired")
+
+        queue.put("note", {"note_id": "a"})
+        worker = QueueWorker(queue, MagicMock(), handlers={"note": expired})
+        with pytest.raises(CookieExpiredError):
+            await worker.run()
+        [task] = queue.lease()
+        assert task.attempts == 1
+
+    @pytest.mark.asyncio
+    async def test_fatal_error_cancels_and_releases_siblings(self, queue):
+        """In-flight sibling tasks are released, not nacked, on auth failures."""
+        started = asyncio.Event()
+
+        async def slow(client, payload):
+            started.set()
+            await asyncio.Event().wait()
+
+        async def expired(client, payload):
+            await started.wait()
+            raise CookieExpiredError("expired")
+
+        queue.put("slow", {"note_id": "a"}, priority=5)
+        queue.put("note", {"note_id": "b"})
+        worker = QueueWorker(
+            queue,
+            MagicMock(),
+            handlers={"slow": slow, "note": expired},
+            concurrency=2,
+            poll_interval=0.01,
+        )
+        with pytest.raises(CookieExpiredError):
+            await worker.run()
+
+        assert worker.failed == 0
+        tasks = queue.lease(limit=2)
+        assert sorted(task.kind for task in tasks) == ["note", "slow"]
+        assert all(task.attempts == 1 and task.last_error is None for task in tasks)
@@ -1,21 +1,46 @@
 # XHS Scraper Public API
-from xhs_scraper.client import XHSClient
+#
+# Exceptions are imported eagerly; everything else is loaded on first
+# attribute access (PEP 562), so short-lived jobs that only export or
+# download do not pay for httpx, pydantic, xhshow and aiohttp at import time.
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
+
 from xhs_scraper.exceptions import (
     XHSError,
     SignatureError,
     CaptchaRequiredError,
     CookieExpiredError,
     RateLimitError,
+    CircuitOpenError,
     APIError,
 )
-from xhs_scraper.utils.cookies import (
-    load_cookies_from_file,
-    save_cookies_to_file,
-    extract_chrome_cookies,
-)
-from xhs_scraper.utils.qr_login import qr_login
-from xhs_scraper.utils.export import export_to_json, export_to_csv
-from xhs_scraper.utils.media import download_media
+
+if TYPE_CHECKING:
+    from xhs_scraper.client import XHSClient
+    from xhs_scraper.utils.cookies import (
+        load_cookies_from_file,
+        save_cookies_to_file,
+        extract_chrome_cookies,
+    )
+    from xhs_scraper.utils.qr_login import qr_login
+    from xhs_scraper.utils.export import export_to_json, export_to_csv
+    from xhs_scraper.utils.media import download_media
+    from xhs_scraper.pipeline import Pipeline
+    from xhs_scraper.sharded import ShardedCrawler
+
+_LAZY_ATTRIBUTES = {
+    "XHSClient": "xhs_scraper.client",
+    "load_cookies_from_file": "xhs_scraper.utils.cookies",
+    "save_cookies_to_file": "xhs_scraper.utils.cookies",
+    "extract_chrome_cookies": "xhs_scraper.utils.cookies",
+    "qr_login": "xhs_scraper.utils.qr_login",
+    "export_to_json": "xhs_scraper.utils.export",
+    "export_to_csv": "xhs_scraper.utils.export",
+    "download_media": "xhs_scraper.utils.media",
+    "Pipeline": "xhs_scraper.pipeline",
+    "ShardedCrawler": "xhs_scraper.sharded",
+}
 
 __all__ = [
     # Client
@@ -26,6 +51,7 @@ __all__ = [
     "CaptchaRequiredError",
     "CookieExpiredError",
     "RateLimitError",
+    "CircuitOpenError",
     "APIError",
     # Cookie utilities
     "load_cookies_from_file",
@@ -38,4 +64,20 @@ __all__ = [
     "export_to_csv",
     # Media utilities
     "download_media",
+    # Crawl pipelines
+    "Pipeline",
+    "ShardedCrawler",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    module = _LAZY_ATTRIBUTES.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list:
+    return sorted(set(globals()) | set(__all__))
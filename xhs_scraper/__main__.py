@@ -0,0 +1,7 @@
+"""Run the command-line crawler with ``python -m xhs_scraper``."""
+
+import sys
+
+from xhs_scraper.cli import main
+
+sys.exit(main())
@@ -0,0 +1,467 @@
+"""Command-line crawler.
+
+Installed as the ``xhs-scraper`` console script (also ``python -m
+xhs_scraper``). Each subcommand runs its targets concurrently through a
+Pipeline, spread over one or more accounts, and streams results to a sink:
+
+    xhs-scraper search 露营装备 咖啡 --pages 5 --details -o notes.jsonl
+    xhs-scraper user-notes USER_ID ... --incremental --cache-dir .xhs-cache
+    xhs-scraper comments NOTE_ID ... --accounts accounts.json --concurrency 8
+    xhs-scraper notes --input notes.jsonl -o details.csv
+    xhs-scraper media --input details.jsonl --dir downloads
+    xhs-scraper export details.jsonl -o details.csv
+
+Results are written as JSON Lines by default (``-o -`` is stdout); ``json``
+and ``csv`` formats are collected and written when the crawl ends.
+``--accounts`` takes a JSON file holding a list of cookie objects (or an
+object mapping account names to cookies); targets are spread over the
+accounts round-robin, and ``--rate-limit`` applies to each account.
+``--cache-dir`` holds the crawl state reused between runs: checkpoints for
+``--checkpoint`` (kept only for targets that did not finish), high-water marks for ``--incremental`` and the seen-id
+set for ``--dedup``.
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import logging
+import sys
+import tempfile
+from contextlib import AsyncExitStack
+from datetime import datetime
+from pathlib import Path
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+FORMATS = ("jsonl", "json", "csv")
+
+
+def _time_bound(value: str) -> Any:
+    """Parse a --created-after/--created-before value (ISO date or Unix seconds)."""
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(
+            f"expected an ISO date/time or Unix seconds, got {value!r}"
+        )
+
+
+def _positive_int(value: str) -> int:
+    number = int(value)
+    if number <= 0:
+        raise argparse.ArgumentTypeError("must be positive")
+    return number
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the argument parser."""
+    common = argparse.ArgumentParser(add_help=False)
+    accounts = common.add_mutually_exclusive_group()
+    accounts.add_argument("--cookies", help="JSON file with one account's cookies")
+    accounts.add_argument(
+        "--accounts", help="JSON file with a list (or name map) of account cookies"
+    )
+    common.add_argument(
+        "--concurrency",
+        type=_positive_int,
+        default=4,
+        help="targets in flight per account (default 4)",
+    )
+    common.add_argument(
+        "--rate-limit",
+        type=float,
+        default=2.0,
+        help="requests per second per account (default 2.0)",
+    )
+    common.add_argument(
+        "--cache-dir",
+        default=".xhs-cache",
+        help="directory for checkpoints, high-water marks and seen ids",
+    )
+    common.add_argument(
+        "--checkpoint",
+        action="store_true",
+        help="save progress per target and resume interrupted crawls",
+    )
+    common.add_argument(
+        "--dedup",
+        action="store_true",
+        help="skip items already collected by earlier runs (user-notes, comments)",
+    )
+    common.add_argument(
+        "-o", "--output", default="-", help="output file, '-' for stdout (default)"
+    )
+    common.add_argument(
+        "--format",
+        choices=FORMATS,
+        help="output format (default: from the output extension, else jsonl)",
+    )
+    common.add_argument(
+        "--codec", default="auto", help="JSON codec: auto, stdlib, orjson, msgspec"
+    )
+    common.add_argument("--base-url", help="override the API origin")
+    common.add_argument("-v", "--verbose", action="store_true")
+
+    parser = argparse.ArgumentParser(
+        prog="xhs-scraper", description="Crawl Xiaohongshu notes, users and comments."
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    search = commands.add_parser("search", parents=[common], help="search notes")
+    search.add_argument("keywords", nargs="+")
+    search.add_argument("--pages", type=_positive_int, default=1)
+    search.add_argument(
+        "--sort", choices=("GENERAL", "TIME_DESC", "POPULARITY"), default="GENERAL"
+    )
+    search.add_argument(
+        "--note-type", choices=("ALL", "VIDEO", "IMAGE"), default="ALL"
+    )
+    search.add_argument(
+        "--details", action="store_true", help="fetch each result's full note"
+    )
+
+    user_notes = commands.add_parser(
+        "user-notes", parents=[common], help="crawl users' posted notes"
+    )
+    user_notes.add_argument("user_ids", nargs="+")
+    user_notes.add_argument("--max-pages", type=_positive_int, default=100)
+    user_notes.add_argument(
+        "--incremental",
+        action="store_true",
+        help="only notes since the last run (not with --checkpoint)",
+    )
+
+    for sub in (search, user_notes):
+        sub.add_argument("--created-after", type=_time_bound)
+        sub.add_argument("--created-before", type=_time_bound)
+
+    comments = commands.add_parser(
+        "comments", parents=[common], help="crawl notes' comments"
+    )
+    comments.add_argument("note_ids", nargs="+")
+    comments.add_argument("--max-pages", type=_positive_int, default=100)
+
+    notes = commands.add_parser("notes", parents=[common], help="fetch full notes")
+    media = commands.add_parser(
+        "media", parents=[common], help="download notes' images and videos"
+    )
+    for sub in (notes, media):
+        sub.add_argument(
+            "refs", nargs="*", metavar="NOTE_ID[:XSEC_TOKEN]", help="notes to fetch"
+        )
+        sub.add_argument(
+            "--input", help="JSON Lines file of notes (e.g. search output)"
+        )
+    media.add_argument("--dir", default="downloads", help="download directory")
+
+    export = commands.add_parser(
+        "export", parents=[common], help="convert a JSON Lines result file"
+    )
+    export.add_argument("input", help="JSON Lines file to convert")
+    return parser
+
+
+def _output_format(args: argparse.Namespace) -> str:
+    if args.format:
+        return args.format
+    suffix = Path(args.output).suffix.lstrip(".").lower()
+    return suffix if suffix in FORMATS else "jsonl"
+
+
+def _load_accounts(args: argparse.Namespace) -> List[Dict[str, Any]]:
+    from xhs_scraper.utils.cookies import load_cookies_from_file
+
+    if args.cookies:
+        return [load_cookies_from_file(args.cookies)]
+    if args.accounts:
+        data = load_cookies_from_file(args.accounts)
+        accounts = list(data.values()) if isinstance(data, dict) else list(data)
+        if not accounts or not all(isinstance(a, dict) and a for a in accounts):
+            raise ValueError(f"{args.accounts} must hold non-empty cookie objects")
+        return accounts
+    raise ValueError("one of --cookies or --accounts is required")
+
+
+def _read_jsonl(path: str) -> List[Dict[str, Any]]:
+    with open(path, "r", encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def _note_refs(args: argparse.Namespace) -> List[Any]:
+    refs: List[Any] = []
+    for ref in args.refs:
+        note_id, _, token = ref.partition(":")
+        refs.append((note_id, token))
+    if args.input:
+        for record in _read_jsonl(args.input):
+            # Pipeline output wraps notes as {"note": ..., "comments": ...}.
+            refs.append(record.get("note", record))
+    if not refs:
+        raise ValueError("give note ids or --input")
+    return refs
+
+
+class _Sink:
+    """Pipeline sink writing results in the requested format."""
+
+    def __init__(self, output: str, fmt: str, codec: str):
+        from xhs_scraper.pipeline import JSONLinesSink
+        from xhs_scraper.utils.codec import get_codec
+
+        self.output = output
+        self.format = fmt
+        self.codec = get_codec(codec)
+        self.count = 0
+        self._items: List[Any] = []
+        self._lines: Optional[JSONLinesSink] = None
+        if fmt == "jsonl" and output != "-":
+            Path(output).unlink(missing_ok=True)
+            self._lines = JSONLinesSink(output, codec=self.codec)
+
+    async def __call__(self, item: Any) -> None:
+        from xhs_scraper.pipeline import CrawlResult
+        from xhs_scraper.utils.checkpoint import to_plain
+
+        self.count += 1
+        if self._lines is not None:
+            await self._lines(item)
+            return
+        data = item.to_dict() if isinstance(item, CrawlResult) else to_plain(item)
+        if self.format == "jsonl":
+            sys.stdout.write(self.codec.dumps(data).decode("utf-8") + "\n")
+        else:
+            self._items.append(data)
+
+    async def aclose(self) -> None:
+        from xhs_scraper.utils.export import export_to_csv, export_to_json
+
+        if self._lines is not None:
+            await self._lines.aclose()
+        elif self.format == "jsonl":
+            sys.stdout.flush()
+        elif self.output != "-":
+            export = export_to_json if self.format == "json" else export_to_csv
+            export(self._items, self.output, codec=self.codec)
+        elif self.format == "json":
+            # dumps_pretty() returns str, unlike dumps().
+            sys.stdout.write(self.codec.dumps_pretty(self._items) + "\n")
+        else:
+            with tempfile.TemporaryDirectory() as tmp:
+                path = export_to_csv(self._items, Path(tmp) / "out.csv", self.codec)
+                sys.stdout.write(path.read_text(encoding="utf-8-sig"))
+
+
+async def _open_clients(
+    args: argparse.Namespace, stack: AsyncExitStack, seen: Any
+) -> List[Any]:
+    from xhs_scraper.client import XHSClient
+    from xhs_scraper.utils.checkpoint import SQLiteCheckpointStore
+    from xhs_scraper.utils.watermark import HighWaterMarkStore
+
+    cache = Path(args.cache_dir)
+    options: Dict[str, Any] = {
+        "rate_limit": args.rate_limit,
+        "result_mode": "dict",
+        "codec": args.codec,
+    }
+    if args.base_url:
+        options["base_url"] = args.base_url
+    if args.checkpoint or getattr(args, "incremental", False) or seen is not None:
+        cache.mkdir(parents=True, exist_ok=True)
+    if args.checkpoint:
+        store = SQLiteCheckpointStore(cache / "checkpoints.db")
+        stack.callback(store.close)
+        options["checkpoint_store"] = store
+    if getattr(args, "incremental", False):
+        options["watermark_store"] = HighWaterMarkStore(cache / "watermarks.json")
+
+    clients = []
+    for cookies in _load_accounts(args):
+        client = XHSClient(cookies=cookies, **options)
+        clients.append(await stack.enter_async_context(client))
+    return clients
+
+
+def _finish(client: Any, key: Optional[str]) -> None:
+    """Drop a finished target's checkpoint so the next run crawls it afresh."""
+    if key is not None:
+        client.checkpoint_store.delete(key)
+
+
+def _fetch_stage(args: argparse.Namespace, clients: List[Any], seen: Any) -> Callable:
+    """Stage function turning one target into results, for the subcommand."""
+    from xhs_scraper.parsers import result_field
+    from xhs_scraper.pipeline import media_stage, note_detail_stage, search_stage
+
+    rotation = itertools.cycle(clients)
+    command = args.command
+    window = {
+        "created_after": getattr(args, "created_after", None),
+        "created_before": getattr(args, "created_before", None),
+    }
+
+    if command == "search":
+
+        async def search(keyword: str) -> AsyncIterator[Any]:
+            client = next(rotation)
+            results = search_stage(
+                client,
+                max_pages=args.pages,
+                sort=args.sort,
+                note_type=args.note_type,
+                **window,
+            )
+            async for note in results(keyword):
+                if args.details:
+                    yield await note_detail_stage(client)(note)
+                else:
+                    yield note
+
+        return search
+
+    if command == "user-notes":
+
+        async def user_notes(user_id: str) -> AsyncIterator[Any]:
+            client = next(rotation)
+            key = f"user_notes:{user_id}" if args.checkpoint else None
+            result = await client.notes.get_user_notes(
+                user_id,
+                max_pages=args.max_pages,
+                resume_from=key,
+                incremental=args.incremental,
+                seen_ids=seen,
+                **window,
+            )
+            for note in result_field(result, "items") or []:
+                yield note
+            _finish(client, key)
+
+        return user_notes
+
+    if command == "comments":
+
+        async def comments(note_id: str) -> AsyncIterator[Any]:
+            client = next(rotation)
+            key = f"comments:{note_id}" if args.checkpoint else None
+            result = await client.comments.get_comments(
+                note_id,
+                max_pages=args.max_pages,
+                resume_from=key,
+                seen_ids=seen,
+            )
+            for comment in result_field(result, "items") or []:
+                yield {"note_id": note_id, **comment}
+            _finish(client, key)
+
+        return comments
+
+    if command == "notes":
+
+        async def notes(ref: Any) -> Any:
+            return await note_detail_stage(next(rotation))(ref)
+
+        return notes
+
+    download = media_stage(args.dir)
+
+    async def media(ref: Any) -> Any:
+        # Notes from --input that already list their media skip the fetch.
+        note = ref
+        if not (isinstance(ref, dict) and (ref.get("images") or ref.get("video"))):
+            note = await note_detail_stage(next(rotation))(ref)
+        result = await download(note)
+        return {
+            "note_id": result_field(note, "note_id"),
+            "files": [str(path) for path in result.media],
+        }
+
+    return media
+
+
+def _targets(args: argparse.Namespace) -> Sequence[Any]:
+    if args.command == "search":
+        return args.keywords
+    if args.command == "user-notes":
+        return args.user_ids
+    if args.command == "comments":
+        return args.note_ids
+    return _note_refs(args)
+
+
+async def _crawl(args: argparse.Namespace) -> int:
+    from xhs_scraper.pipeline import Pipeline
+    from xhs_scraper.utils.idset import CompactIdSet
+
+    seen = None
+    seen_path = Path(args.cache_dir) / "seen.ids"
+    if args.dedup:
+        seen = CompactIdSet.load(seen_path) if seen_path.exists() else CompactIdSet()
+
+    targets = _targets(args)
+    sink = _Sink(args.output, _output_format(args), args.codec)
+    async with AsyncExitStack() as stack:
+        clients = await _open_clients(args, stack, seen)
+        pipeline = (
+            Pipeline(queue_size=max(100, 10 * args.concurrency))
+            .stage(
+                "fetch",
+                _fetch_stage(args, clients, seen),
+                concurrency=args.concurrency * len(clients),
+            )
+            .stage("sink", sink)
+        )
+        stats = await pipeline.run(targets)
+
+    if seen is not None:
+        seen.save(seen_path)
+    failed = stats["fetch"].failed
+    print(
+        f"{sink.count} results from {len(targets)} targets, {failed} failed",
+        file=sys.stderr,
+    )
+    return 1 if failed else 0
+
+
+def _export(args: argparse.Namespace) -> int:
+    from xhs_scraper.utils.export import export_to_csv, export_to_json
+
+    records = _read_jsonl(args.input)
+    fmt = _output_format(args)
+    if args.output == "-" or fmt == "jsonl":
+        raise ValueError("export needs -o with a .json or .csv file (or --format)")
+    if fmt == "json":
+        export_to_json(records, args.output, codec=args.codec)
+    else:
+        export_to_csv(records, args.output, codec=args.codec)
+    print(f"{len(records)} records written to {args.output}", file=sys.stderr)
+    return 0
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Run the command line.
+
+    Returns:
+        Exit status: 0 on success, 1 if targets failed, 2 on usage errors
+    """
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.checkpoint and getattr(args, "incremental", False):
+        parser.error("--checkpoint and --incremental cannot be combined")
+    logging.basicConfig(
+        level=logging.INFO if args.verbose else logging.WARNING,
+        format="%(levelname)s %(name)s: %(message)s",
+    )
+    try:
+        if args.command == "export":
+            return _export(args)
+        return asyncio.run(_crawl(args))
+    except (ValueError, FileNotFoundError) as exc:
+        parser.error(str(exc))
+    except KeyboardInterrupt:
+        return 130
@@ -3,27 +3,62 @@
 This module defines XHSClient, the core HTTP client used by scraper modules.
 The client:
 - owns an internal httpx.AsyncClient (async context manager)
-- signs requests via SignatureProvider (xhshow abstraction)
-- optionally rate limits requests via TokenBucketRateLimiter
+- signs requests via SignatureProvider (xhshow abstraction), optionally on a
+  thread or process pool
+- optionally rate limits requests via TokenBucketRateLimiter, or any limiter
+  with an async acquire() such as a coordinator's RemoteRateLimiter
+- optionally fails fast on degraded endpoints via CircuitBreaker
+- optionally hedges slow idempotent GETs via HedgingPolicy
+- optionally records traffic (RequestRecorder) or serves it from a custom
+  transport such as a ReplayArchive
+- optionally collects per-endpoint latency and status metrics via
+  RequestMetrics
+- runs on_request/on_response/on_error callbacks registered on its
+  RequestHooks
+- optionally monitors event-loop lag and blocking callbacks via LoopMonitor
+- returns scraper results as pydantic models, plain dicts or __slots__
+  records (result_mode)
+- optionally decodes responses and encodes POST bodies with a faster JSON
+  codec (orjson, msgspec)
+- optionally checkpoints paginated crawls so they can resume after a crash
+  (CheckpointStore, resume_from=)
+- optionally tracks per-user high-water marks for incremental crawls
+  (HighWaterMarkStore, incremental=True)
 """
 
 from __future__ import annotations
 
+import asyncio
 from dataclasses import dataclass
+import functools
 import importlib
-from typing import Any, Dict, Mapping, Optional
+import time
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Mapping, Optional
 
 import httpx
 
 from .exceptions import (
     APIError,
     CaptchaRequiredError,
+    CircuitOpenError,
     CookieExpiredError,
     RateLimitError,
     SignatureError,
 )
+from .parsers import RESULT_MODES
 from .signature import SignatureProvider, XHShowSignatureProvider
+from .utils.circuit_breaker import CircuitBreaker
+from .utils.codec import STDLIB, JSONCodec, get_codec
+from .utils.hedging import HedgingPolicy
+from .utils.hooks import RequestEvent, RequestHooks
+from .utils.loop_monitor import LoopMonitor
+from .utils.metrics import RequestMetrics
 from .utils.rate_limiter import TokenBucketRateLimiter
+from .utils.replay import RequestRecorder
+
+if TYPE_CHECKING:
+    from .utils.checkpoint import CheckpointStore
+    from .utils.watermark import HighWaterMarkStore
 
 
 def _normalize_path(path: str) -> str:
@@ -41,6 +76,16 @@ def _extract_error_message(payload: Any, fallback: str) -> str:
     return fallback
 
 
+def _error_label(exc: BaseException) -> str:
+    if isinstance(exc, CircuitOpenError):
+        return "circuit_open"
+    if isinstance(exc, APIError) and exc.status_code == 0:
+        return "transport_error"
+    if isinstance(exc, asyncio.CancelledError):
+        return "cancelled"
+    return "error"
+
+
 @dataclass(frozen=True)
 class _Scrapers:
     notes: Any
@@ -61,6 +106,26 @@ class XHSClient:
         rate_limit: Optional[float] = None,
         signature_provider: Optional[SignatureProvider] = None,
         timeout: float = 30.0,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+        hedging: Optional[HedgingPolicy] = None,
+        http2: bool = False,
+        max_connections: Optional[int] = 100,
+        max_keepalive_connections: Optional[int] = 20,
+        keepalive_expiry: Optional[float] = 5.0,
+        prewarm_connections: int = 0,
+        signing_executor: Optional[str] = None,
+        signing_workers: Optional[int] = None,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+        recorder: Optional[RequestRecorder] = None,
+        base_url: Optional[str] = None,
+        metrics: Optional[RequestMetrics] = None,
+        hooks: Optional[RequestHooks] = None,
+        loop_monitor: Optional[LoopMonitor] = None,
+        result_mode: str = "model",
+        codec: Optional[str | JSONCodec] = None,
+        checkpoint_store: Optional[CheckpointStore] = None,
+        watermark_store: Optional[HighWaterMarkStore] = None,
+        rate_limiter: Optional[Any] = None,
     ):
         if not isinstance(cookies, Mapping) or not cookies:
             raise ValueError("cookies must be a non-empty mapping")
@@ -68,12 +133,60 @@ class XHSClient:
         if rate_limit is not None and rate_limit <= 0:
             raise ValueError("rate_limit must be positive")
 
+        if rate_limit is not None and rate_limiter is not None:
+            raise ValueError("rate_limit and rate_limiter cannot be combined")
+
+        if max_connections is not None and max_connections <= 0:
+            raise ValueError("max_connections must be positive")
+
+        if max_keepalive_connections is not None and max_keepalive_connections < 0:
+            raise ValueError("max_keepalive_connections must be non-negative")
+
+        if prewarm_connections < 0:
+            raise ValueError("prewarm_connections must be non-negative")
+
+        if signing_executor not in (None, "thread", "process"):
+            raise ValueError("signing_executor must be None, 'thread' or 'process'")
+
+        if signing_executor == "process" and signature_provider is not None:
+            raise ValueError(
+                "signing_executor='process' only applies to the built-in signer; "
+                "custom signature providers sign in a thread"
+            )
+
+        if result_mode not in RESULT_MODES:
+            raise ValueError("result_mode must be 'model', 'dict' or 'slots'")
+
         self.cookies: Dict[str, str] = dict(cookies)
         self._timeout = timeout
-        self._signature_provider = signature_provider or XHShowSignatureProvider()
-        self._rate_limiter = (
-            TokenBucketRateLimiter(rate=rate_limit) if rate_limit is not None else None
+        self._http2 = http2
+        self._limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self._prewarm_connections = prewarm_connections
+        self._transport = transport
+        self._base_url = base_url or self.BASE_URL
+        self._recorder = recorder
+        self._owns_signature_provider = signature_provider is None
+        self._signature_provider = signature_provider or XHShowSignatureProvider(
+            executor=signing_executor, max_workers=signing_workers
         )
+        self._async_signing = signing_executor is not None
+        self._rate_limiter = rate_limiter
+        if rate_limit is not None:
+            self._rate_limiter = TokenBucketRateLimiter(rate=rate_limit)
+
+        self._circuit_breaker = circuit_breaker
+        self._hedging = hedging
+        self._metrics = metrics
+        self._hooks = hooks if hooks is not None else RequestHooks()
+        self._loop_monitor = loop_monitor
+        self._result_mode = result_mode
+        self._codec = get_codec(codec)
+        self._checkpoint_store = checkpoint_store
+        self._watermark_store = watermark_store
 
         self._http: Optional[httpx.AsyncClient] = None
 
@@ -97,7 +210,7 @@ class XHSClient:
     async def __aenter__(self) -> "XHSClient":
         if self._http is None:
             self._http = httpx.AsyncClient(
-                base_url=self.BASE_URL,
+                base_url=self._base_url,
                 timeout=self._timeout,
                 cookies=self.cookies,
                 headers={
@@ -107,13 +220,38 @@ class XHSClient:
                     "referer": "https://www.xiaohongshu.com/",
                 },
                 follow_redirects=True,
+                http2=self._http2,
+                limits=self._limits,
+                transport=self._transport,
             )
+            if self._prewarm_connections:
+                await self._prewarm()
+        if self._loop_monitor is not None:
+            self._loop_monitor.start(rate_limiter=self._rate_limiter)
         return self
 
+    async def _prewarm(self) -> None:
+        """Open connections ahead of the first real request.
+
+        Sends concurrent unsigned HEAD requests so TCP and TLS setup happen up
+        front; the connections then stay in the keep-alive pool. With HTTP/2 a
+        single connection is multiplexed, so only one is opened. Failures are
+        ignored since prewarming is only an optimization.
+        """
+        count = 1 if self._http2 else self._prewarm_connections
+        await asyncio.gather(
+            *(self._http.head("/") for _ in range(count)),
+            return_exceptions=True,
+        )
+
     async def __aexit__(self, exc_type, exc, tb) -> None:
         await self.aclose()
 
     async def aclose(self) -> None:
+        if self._loop_monitor is not None:
+            await self._loop_monitor.stop()
+        if self._owns_signature_provider:
+            self._signature_provider.shutdown()
         if self._http is None:
             return
         await self._http.aclose()
@@ -135,6 +273,38 @@ class XHSClient:
     def search(self) -> Any:
         return self._scrapers.search
 
+    @property
+    def metrics(self) -> Optional[RequestMetrics]:
+        return self._metrics
+
+    @property
+    def hooks(self) -> RequestHooks:
+        return self._hooks
+
+    @property
+    def loop_monitor(self) -> Optional[LoopMonitor]:
+        return self._loop_monitor
+
+    @property
+    def result_mode(self) -> str:
+        return self._result_mode
+
+    @property
+    def codec(self) -> JSONCodec:
+        return self._codec
+
+    @property
+    def checkpoint_store(self) -> Optional[CheckpointStore]:
+        return self._checkpoint_store
+
+    @property
+    def watermark_store(self) -> Optional[HighWaterMarkStore]:
+        return self._watermark_store
+
+    @property
+    def rate_limiter(self) -> Optional[Any]:
+        return self._rate_limiter
+
     async def _request(
         self,
         method: str,
@@ -161,6 +331,7 @@ class XHSClient:
             CaptchaRequiredError: HTTP 471
             RateLimitError: HTTP 429
             CookieExpiredError: HTTP 401/403
+            CircuitOpenError: circuit breaker open for this endpoint
             APIError: any other non-2xx status or invalid JSON
         """
         if self._http is None:
@@ -174,11 +345,151 @@ class XHSClient:
         params = params or {}
         payload = payload or {}
 
+        if self._metrics is not None or self._hooks:
+            return await self._request_instrumented(
+                normalized_method, uri, params, payload, headers
+            )
+
+        response = await self._dispatch(
+            normalized_method, uri, params, payload, headers
+        )
+        return self._parse_response(response)
+
+    async def _request_instrumented(
+        self,
+        method: str,
+        uri: str,
+        params: Dict[str, Any],
+        payload: Dict[str, Any],
+        headers: Optional[Dict[str, str]],
+    ) -> Dict[str, Any]:
+        """_request() body with metrics and lifecycle hooks, when configured."""
+        metrics = self._metrics
+        hooks = self._hooks
+        event: Optional[RequestEvent] = None
+        if hooks:
+            event = RequestEvent(
+                method=method,
+                path=uri,
+                params=params,
+                payload=payload,
+                headers=dict(headers or {}),
+            )
+            await hooks.emit_request(event)
+            headers = event.headers
+
+        started = time.perf_counter()
+        try:
+            response = await self._dispatch(method, uri, params, payload, headers)
+        except BaseException as exc:
+            total = time.perf_counter() - started
+            if metrics is not None:
+                metrics.record_request(uri, status=_error_label(exc), total=total)
+            if event is not None and isinstance(exc, Exception):
+                event.duration = total
+                event.error = exc
+                await hooks.emit_error(event)
+            raise
+
+        parse_started = time.perf_counter()
+        error: Optional[Exception] = None
+        try:
+            return self._parse_response(response)
+        except Exception as exc:
+            error = exc
+            raise
+        finally:
+            finished = time.perf_counter()
+            bytes_sent = len(response.request.content)
+            bytes_received = len(response.content)
+            if metrics is not None:
+                metrics.record_request(
+                    uri,
+                    status=str(response.status_code),
+                    total=finished - started,
+                    parse=finished - parse_started,
+                    bytes_sent=bytes_sent,
+                    bytes_received=bytes_received,
+                )
+            if event is not None:
+                event.duration = finished - started
+                event.status_code = response.status_code
+                event.bytes_sent = bytes_sent
+                event.bytes_received = bytes_received
+                event.error = error
+                if error is None:
+                    await hooks.emit_response(event)
+                else:
+                    await hooks.emit_error(event)
+
+    async def _dispatch(
+        self,
+        method: str,
+        uri: str,
+        params: Dict[str, Any],
+        payload: Dict[str, Any],
+        headers: Optional[Dict[str, str]],
+    ) -> httpx.Response:
+        """Send through hedging and the circuit breaker, when configured."""
+        send = self._send
+        if (
+            method == "GET"
+            and self._hedging is not None
+            and self._hedging.applies_to(uri)
+        ):
+            send = self._send_hedged
+
+        breaker = self._circuit_breaker
+        if breaker is None:
+            return await send(
+                method, uri, params=params, payload=payload, headers=headers
+            )
+
+        breaker.before_call(uri)
+        try:
+            response = await send(
+                method, uri, params=params, payload=payload, headers=headers
+            )
+        except APIError:
+            breaker.record_failure(uri)
+            raise
+        except BaseException:
+            breaker.release(uri)
+            raise
+        if response.status_code >= 500:
+            breaker.record_failure(uri)
+        else:
+            breaker.record_success(uri)
+        return response
+
+    async def _send(
+        self,
+        method: str,
+        uri: str,
+        *,
+        params: Dict[str, Any],
+        payload: Dict[str, Any],
+        headers: Optional[Dict[str, str]],
+        on_send: Optional[Callable[[], None]] = None,
+    ) -> httpx.Response:
+        """Rate limit, sign and send a single request.
+
+        ``on_send`` is called once rate limiting and signing are done, just
+        before the request is handed to the transport.
+
+        Raises:
+            APIError: On transport errors (status_code 0)
+        """
+        metrics = self._metrics
+        started = time.perf_counter()
         if self._rate_limiter is not None:
             await self._rate_limiter.acquire()
+        signing_started = time.perf_counter()
 
         signed_headers: Dict[str, str]
-        if normalized_method == "GET":
+        if self._async_signing:
+            signed_headers = await self._sign_async(method, uri, params, payload)
+        elif method == "GET":
             signed_headers = self._signature_provider.sign_get(
                 uri=uri, params=params, cookies=self.cookies
             )
@@ -191,20 +502,158 @@ class XHSClient:
         if headers:
             merged_headers.update(headers)
 
+        body: Dict[str, Any] = {"json": payload if method == "POST" else None}
+        if method == "POST" and self._codec is not STDLIB:
+            # Pre-encoded with the same compact layout httpx uses for json=.
+            body = {"json": None, "content": self._codec.dumps(payload)}
+
+        if on_send is not None:
+            on_send()
+        sent = time.perf_counter()
+        network: Optional[float] = None
         try:
             response = await self._http.request(
-                normalized_method,
+                method,
                 uri,
-                params=params if normalized_method == "GET" else None,
-                json=payload if normalized_method == "POST" else None,
+                params=params if method == "GET" else None,
+                **body,
                 headers=merged_headers,
             )
+            network = time.perf_counter() - sent
         except httpx.RequestError as exc:
+            network = time.perf_counter() - sent
             raise APIError(status_code=0, message=str(exc), response_data=None) from exc
+        finally:
+            if metrics is not None:
+                metrics.record_attempt(
+                    uri,
+                    rate_limit_wait=signing_started - started,
+                    sign=sent - signing_started,
+                    network=network,
+                )
+
+        if self._recorder is not None:
+            self._recorder.record(response)
+        return response
+
+    async def _sign_async(
+        self,
+        method: str,
+        uri: str,
+        params: Dict[str, Any],
+        payload: Dict[str, Any],
+    ) -> Dict[str, str]:
+        """Sign off the event loop.
+
+        Uses the provider's asign_get()/asign_post() when available, otherwise
+        runs the synchronous signer in the loop's default executor.
+        """
+        provider = self._signature_provider
+        if method == "GET":
+            asign = getattr(provider, "asign_get", None)
+            if asign is not None:
+                return await asign(uri=uri, params=params, cookies=self.cookies)
+            sign = functools.partial(
+                provider.sign_get, uri=uri, params=params, cookies=self.cookies
+            )
+        else:
+            asign = getattr(provider, "asign_post", None)
+            if asign is not None:
+                return await asign(uri=uri, payload=payload, cookies=self.cookies)
+            sign = functools.partial(
+                provider.sign_post, uri=uri, payload=payload, cookies=self.cookies
+            )
+        return await asyncio.get_running_loop().run_in_executor(None, sign)
 
+    async def _send_hedged(
+        self,
+        method: str,
+        uri: str,
+        *,
+        params: Dict[str, Any],
+        payload: Dict[str, Any],
+        headers: Optional[Dict[str, str]],
+    ) -> httpx.Response:
+        """Send a request, hedging with a second copy if it is slow.
+
+        If the first attempt has not completed within the policy's delay and
+        the hedge budget allows it, an identical (separately signed and rate
+        limited) attempt is started. The first attempt to return a response
+        wins and the other is cancelled; if both fail, the first error is
+        raised.
+
+        Latencies and the hedge delay are measured from when an attempt is
+        handed to the transport, so time queued in the rate limiter or spent
+        signing neither triggers hedges nor skews the percentile. A primary
+        cancelled because its hedge won is recorded with its elapsed time, a
+        lower bound on its latency.
+        """
+        policy = self._hedging
+        policy.record_request()
+        sent_at: List[Optional[float]] = [None, None]
+        primary_sent = asyncio.Event()
+
+        async def attempt(index: int) -> httpx.Response:
+            def on_send() -> None:
+                sent_at[index] = time.monotonic()
+                if index == 0:
+                    primary_sent.set()
+
+            response = await self._send(
+                method,
+                uri,
+                params=params,
+                payload=payload,
+                headers=headers,
+                on_send=on_send,
+            )
+            policy.record_latency(uri, time.monotonic() - sent_at[index])
+            return response
+
+        primary = asyncio.ensure_future(attempt(0))
+        tasks = [primary]
+        sending = asyncio.ensure_future(primary_sent.wait())
+        hedge_won = False
+        try:
+            await asyncio.wait(
+                [primary, sending], return_when=asyncio.FIRST_COMPLETED
+            )
+            done, _ = await asyncio.wait(tasks, timeout=policy.delay(uri))
+            if done or not policy.try_acquire_hedge():
+                return await primary
+
+            tasks.append(asyncio.ensure_future(attempt(1)))
+            pending = set(tasks)
+            first_error: Optional[BaseException] = None
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in tasks:
+                    if task not in done:
+                        continue
+                    if task.exception() is None:
+                        hedge_won = task is not primary
+                        return task.result()
+                    if first_error is None:
+                        first_error = task.exception()
+            raise first_error
+        finally:
+            sending.cancel()
+            if hedge_won and not primary.done() and sent_at[0] is not None:
+                policy.record_latency(uri, time.monotonic() - sent_at[0])
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+    def _parse_response(self, response: httpx.Response) -> Dict[str, Any]:
+        """Decode a response and map error statuses to exceptions."""
         response_payload: Any
         try:
-            response_payload = response.json()
+            if self._codec is STDLIB:
+                response_payload = response.json()
+            else:
+                response_payload = self._codec.loads(response.content)
         except ValueError:
             response_payload = None
 
@@ -261,6 +710,7 @@ class XHSClient:
             CaptchaRequiredError: HTTP 471
             RateLimitError: HTTP 429
             CookieExpiredError: HTTP 401/403
+            CircuitOpenError: circuit breaker open for this endpoint
             APIError: any other non-2xx status or invalid JSON
         """
         return await self._request(
@@ -63,6 +63,33 @@ class RateLimitError(XHSError):
     pass
 
 
+class CircuitOpenError(XHSError):
+    """
+    Raised when a request is rejected by an open circuit breaker.
+
+    The endpoint has recently failed too often (5xx responses or network errors),
+    so the request fails fast instead of waiting on a degraded endpoint.
+
+    Attributes:
+        endpoint (str): Endpoint key whose circuit is open
+        retry_after (float): Seconds until the circuit will allow a probe request
+    """
+
+    def __init__(self, endpoint: str, retry_after: float = 0.0):
+        """
+        Initialize CircuitOpenError.
+
+        Args:
+            endpoint (str): Endpoint key whose circuit is open
+            retry_after (float): Seconds until a probe request is allowed
+        """
+        self.endpoint = endpoint
+        self.retry_after = max(0.0, retry_after)
+        super().__init__(
+            f"Circuit open for {endpoint}, retry after {self.retry_after:.1f}s"
+        )
+
+
 class APIError(XHSError):
     """
     Raised for general API errors with detailed response information.
@@ -71,3 +71,123 @@ class PaginatedResponse(BaseModel, Generic[T]):
     items: Optional[List[T]] = None
     cursor: Optional[str] = None
     has_more: Optional[bool] = False
+
+
+class SlotsRecord:
+    """Base for compact ``__slots__`` result records.
+
+    Records are returned instead of pydantic models when XHSClient is
+    created with ``result_mode="slots"``. They carry the same field names as
+    their model counterparts but skip validation.
+    """
+
+    __slots__ = ()
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to a plain dict, recursively (like model_dump())."""
+        return {name: _plain(getattr(self, name)) for name in self.__slots__}
+
+    def __eq__(self, other: Any) -> bool:
+        if type(other) is not type(self):
+            return NotImplemented
+        return all(getattr(self, n) == getattr(other, n) for n in self.__slots__)
+
+    __hash__ = None  # mutable, like the models
+
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{n}={getattr(self, n)!r}" for n in self.__slots__)
+        return f"{type(self).__name__}({fields})"
+
+
+def _plain(value: Any) -> Any:
+    if isinstance(value, SlotsRecord):
+        return value.to_dict()
+    if isinstance(value, list):
+        return [_plain(item) for item in value]
+    return value
+
+
+class UserRecord(SlotsRecord):
+    """Slots counterpart of UserResponse."""
+
+    __slots__ = ("user_id", "nickname", "avatar", "bio", "followers", "following")
+
+    def __init__(
+        self,
+        user_id: Optional[str] = None,
+        nickname: Optional[str] = None,
+        avatar: Optional[str] = None,
+        bio: Optional[str] = None,
+        followers: Optional[int] = None,
+        following: Optional[int] = None,
+    ):
+        self.user_id = user_id
+        self.nickname = nickname
+        self.avatar = avatar
+        self.bio = bio
+        self.followers = followers
+        self.following = following
+
+
+class CommentRecord(SlotsRecord):
+    """Slots counterpart of CommentResponse."""
+
+    __slots__ = ("comment_id", "content", "user", "create_time", "sub_comments")
+
+    def __init__(
+        self,
+        comment_id: Optional[str] = None,
+        content: Optional[str] = None,
+        user: Optional[UserRecord] = None,
+        create_time: Optional[int] = None,
+        sub_comments: Optional[List["CommentRecord"]] = None,
+    ):
+        self.comment_id = comment_id
+        self.content = content
+        self.user = user
+        self.create_time = create_time
+        self.sub_comments = sub_comments
+
+
+class NoteRecord(SlotsRecord):
+    """Slots counterpart of NoteResponse."""
+
+    __slots__ = (
+        "note_id",
+        "title",
+        "desc",
+        "images",
+        "video",
+        "user",
+        "stats",
+        "liked_count",
+        "commented_count",
+        "shared_count",
+        "xsec_token",
+    )
+
+    def __init__(
+        self,
+        note_id: Optional[str] = None,
+        title: Optional[str] = None,
+        desc: Optional[str] = None,
+        images: Optional[List[str]] = None,
+        video: Optional[str] = None,
+        user: Optional[UserRecord] = None,
+        stats: Optional[Dict[str, Any]] = None,
+        liked_count: Optional[int] = None,
+        commented_count: Optional[int] = None,
+        shared_count: Optional[int] = None,
+        xsec_token: Optional[str] = None,
+    ):
+        self.note_id = note_id
+        self.title = title
+        self.desc = desc
+        self.images = images
+        self.video = video
+        self.user = user
+        self.stats = stats
+        self.liked_count = liked_count
+        self.commented_count = commented_count
+        self.shared_count = shared_count
+        self.xsec_token = xsec_token
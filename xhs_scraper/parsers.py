@@ -0,0 +1,396 @@
+"""Batch page parsers for XHS API responses.
+
+Each parser converts a whole page of raw API items into response models with
+a single pydantic validation call (a TypeAdapter over the list, built once
+at import time) instead of constructing models one item at a time. Items
+that fail validation are dropped and reported in the ParseResult rather
+than aborting the page.
+
+Parsers also honor XHSClient's result modes:
+
+- ``"model"``: validated pydantic models (default)
+- ``"dict"``: plain dicts shaped like ``model.model_dump()``
+- ``"slots"``: compact SlotsRecord objects with the model field names
+
+The raw modes skip model construction. Values that are already of the
+field's type pass through unchecked; anything else is coerced or rejected
+by pydantic's own validator for that field type, so every mode keeps and
+drops the same items.
+"""
+
+from dataclasses import dataclass, field
+from functools import partial
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Generic,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+    TypeVar,
+)
+
+from pydantic import TypeAdapter, ValidationError
+
+from xhs_scraper.models import (
+    CommentRecord,
+    CommentResponse,
+    NoteRecord,
+    NoteResponse,
+    UserRecord,
+    UserResponse,
+)
+
+T = TypeVar("T")
+
+RESULT_MODES = ("model", "dict", "slots")
+
+_COMMENTS = TypeAdapter(List[CommentResponse])
+_NOTES = TypeAdapter(List[NoteResponse])
+
+
+@dataclass
+class ParseResult(Generic[T]):
+    """Models parsed from one page, plus what was rejected."""
+
+    items: List[T]
+    rejected: int = 0
+    errors: List[str] = field(default_factory=list)
+
+
+def _validate(
+    adapter: TypeAdapter,
+    records: List[Any],
+    rejected: int = 0,
+    errors: Optional[List[str]] = None,
+) -> ParseResult:
+    errors = errors if errors is not None else []
+    try:
+        return ParseResult(adapter.validate_python(records), rejected, errors)
+    except ValidationError as exc:
+        bad: Dict[int, str] = {}
+        for error in exc.errors(include_url=False):
+            index, *loc = error["loc"]
+            where = ".".join(map(str, loc)) or "item"
+            bad.setdefault(index, f"{where}: {error['msg']}")
+
+    good = [record for index, record in enumerate(records) if index not in bad]
+    return ParseResult(
+        adapter.validate_python(good),
+        rejected + len(bad),
+        errors + list(bad.values()),
+    )
+
+
+def _project(
+    items: Iterable[Any], projection: Callable[[Any], Any]
+) -> ParseResult:
+    """Map raw items to results, counting items that cannot be mapped."""
+    records: List[Any] = []
+    errors: List[str] = []
+    for item in items:
+        try:
+            records.append(projection(item))
+        except ValidationError as exc:
+            error = exc.errors(include_url=False)[0]
+            errors.append(f"{error['input']!r}: {error['msg']}")
+        except (AttributeError, TypeError, ValueError) as exc:
+            errors.append(f"item: {exc}")
+    return ParseResult(records, len(errors), errors)
+
+
+def _count(value: Any) -> Any:
+    # Empty or zero counts are reported as missing, as before batching.
+    return value or None
+
+
+_INT = TypeAdapter(Optional[int])
+_STR = TypeAdapter(Optional[str])
+_STRS = TypeAdapter(Optional[List[str]])
+_DICT = TypeAdapter(Optional[Dict[str, Any]])
+_LIST = TypeAdapter(Optional[List[Any]])
+
+
+# The raw-mode field checks below return common values as they are and hand
+# anything else to pydantic, which coerces it or raises ValidationError
+# exactly as model validation would.
+def _int(value: Any) -> Optional[int]:
+    if value is None or type(value) is int:
+        return value
+    if type(value) is str and value.isascii() and value.isdigit():
+        return int(value)
+    return _INT.validate_python(value)
+
+
+def _str(value: Any) -> Optional[str]:
+    if value is None or type(value) is str:
+        return value
+    return _STR.validate_python(value)
+
+
+def _strs(value: Any) -> Optional[List[str]]:
+    if value is None or (type(value) is list and all(type(v) is str for v in value)):
+        return value
+    return _STRS.validate_python(value)
+
+
+def _dict(value: Any) -> Optional[Dict[str, Any]]:
+    if value is None or type(value) is dict:
+        return value
+    return _DICT.validate_python(value)
+
+
+def _list(value: Any) -> Optional[List[Any]]:
+    if value is None or type(value) is list:
+        return value
+    return _LIST.validate_python(value)
+
+
+def _same(value: Any) -> Any:
+    return value
+
+
+def _raw_count(value: Any) -> Optional[int]:
+    return _int(value or None)
+
+
+def _dict_factory(model: Any) -> Callable[..., Dict[str, Any]]:
+    # Plain dicts with every model field, in model_dump() order.
+    empty = dict.fromkeys(model.model_fields)
+    return lambda **fields: {**empty, **fields}
+
+
+@dataclass(frozen=True)
+class _Makers:
+    """Constructors used to build results for one result mode."""
+
+    user: Callable[..., Any]
+    comment: Callable[..., Any]
+    note: Callable[..., Any]
+    count: Callable[[Any], Any]
+    text: Callable[[Any], Any]
+
+
+# "model" mode builds partial field dicts that pydantic then validates.
+_FIELDS = _Makers(dict, dict, dict, _count, _same)
+_MAKERS = {
+    "dict": _Makers(
+        _dict_factory(UserResponse),
+        _dict_factory(CommentResponse),
+        _dict_factory(NoteResponse),
+        _raw_count,
+        _str,
+    ),
+    "slots": _Makers(UserRecord, CommentRecord, NoteRecord, _raw_count, _str),
+}
+
+
+def _user(user_data: Dict[str, Any], makers: _Makers) -> Any:
+    text = makers.text
+    return makers.user(
+        user_id=text(user_data.get("user_id")),
+        nickname=text(user_data.get("nickname") or user_data.get("nick_name")),
+        avatar=text(user_data.get("avatar")),
+    )
+
+
+def _user_posted_note(item: Dict[str, Any], makers: _Makers) -> Any:
+    interact_info = item.get("interact_info", {})
+    text = makers.text
+    return makers.note(
+        note_id=text(item.get("note_id")),
+        title=text(item.get("display_title")),
+        user=_user(item.get("user", {}), makers),
+        liked_count=makers.count(interact_info.get("liked_count")),
+        xsec_token=text(item.get("xsec_token")),
+    )
+
+
+def _search_note(item: Dict[str, Any], makers: _Makers) -> Any:
+    note_card = item.get("note_card", {})
+    interact_info = note_card.get("interact_info", {})
+    text = makers.text
+    return makers.note(
+        note_id=text(item.get("id")),
+        title=text(note_card.get("display_title")),
+        user=_user(note_card.get("user", {}), makers),
+        liked_count=makers.count(interact_info.get("liked_count")),
+        commented_count=makers.count(interact_info.get("comment_count")),
+        shared_count=makers.count(interact_info.get("shared_count")),
+        xsec_token=text(item.get("xsec_token")),
+    )
+
+
+def _raw_user(data: Dict[str, Any], makers: _Makers) -> Any:
+    return makers.user(
+        user_id=_str(data.get("user_id")),
+        nickname=_str(data.get("nickname")),
+        avatar=_str(data.get("avatar")),
+        bio=_str(data.get("bio")),
+        followers=_int(data.get("followers")),
+        following=_int(data.get("following")),
+    )
+
+
+def _raw_comment(data: Dict[str, Any], makers: _Makers) -> Any:
+    user = data.get("user")
+    sub_comments = _list(data.get("sub_comments"))
+    return makers.comment(
+        comment_id=_str(data.get("comment_id")),
+        content=_str(data.get("content")),
+        user=_raw_user(user, makers) if user is not None else None,
+        create_time=_int(data.get("create_time")),
+        sub_comments=(
+            [_raw_comment(sub, makers) for sub in sub_comments]
+            if sub_comments is not None
+            else None
+        ),
+    )
+
+
+def _raw_note(data: Dict[str, Any], makers: _Makers) -> Any:
+    user = data.get("user")
+    return makers.note(
+        note_id=_str(data.get("note_id")),
+        title=_str(data.get("title")),
+        desc=_str(data.get("desc")),
+        images=_strs(data.get("images")),
+        video=_str(data.get("video")),
+        user=_raw_user(user, makers) if user is not None else None,
+        stats=_dict(data.get("stats")),
+        liked_count=_int(data.get("liked_count")),
+        commented_count=_int(data.get("commented_count")),
+        shared_count=_int(data.get("shared_count")),
+        xsec_token=_str(data.get("xsec_token")),
+    )
+
+
+def result_field(item: Any, name: str) -> Any:
+    """Read a field from a result in any result mode (model, dict or record)."""
+    if isinstance(item, dict):
+        return item.get(name)
+    return getattr(item, name, None)
+
+
+def note_ref(note: Any) -> Tuple[Optional[str], str]:
+    """(note_id, xsec_token) of a pair or a note result in any result mode."""
+    if isinstance(note, tuple):
+        return note
+    return result_field(note, "note_id"), result_field(note, "xsec_token") or ""
+
+
+def build_page(container: Any, mode: str, **fields: Any) -> Any:
+    """Build a page container model (PaginatedResponse, SearchResultResponse).
+
+    In the raw result modes the container is built with model_construct()
+    so its dict or record items are not validated into models.
+    """
+    if mode == "model":
+        return container(**fields)
+    return container.model_construct(**fields)
+
+
+def parse_comments(items: Iterable[Any], mode: str = "model") -> ParseResult:
+    """Parse a page of comment/page or comment/sub/page items.
+
+    Args:
+        items: Raw comment dicts
+        mode: Result mode ("model", "dict" or "slots")
+
+    Returns:
+        ParseResult of CommentResponse, dict or CommentRecord
+    """
+    if mode == "model":
+        return _validate(_COMMENTS, list(items))
+    return _project(items, partial(_raw_comment, makers=_MAKERS[mode]))
+
+
+def parse_user_notes(items: Iterable[Any], mode: str = "model") -> ParseResult:
+    """Parse a page of user_posted notes.
+
+    Args:
+        items: Raw note dicts from data.notes
+        mode: Result mode ("model", "dict" or "slots")
+
+    Returns:
+        ParseResult of NoteResponse, dict or NoteRecord
+    """
+    if mode == "model":
+        projected = _project(items, partial(_user_posted_note, makers=_FIELDS))
+        return _validate(_NOTES, projected.items, projected.rejected, projected.errors)
+    return _project(items, partial(_user_posted_note, makers=_MAKERS[mode]))
+
+
+def parse_search_notes(items: Iterable[Any], mode: str = "model") -> ParseResult:
+    """Parse a page of search/notes results.
+
+    Args:
+        items: Raw search result dicts from data.items
+        mode: Result mode ("model", "dict" or "slots")
+
+    Returns:
+        ParseResult of NoteResponse, dict or NoteRecord
+    """
+    if mode == "model":
+        projected = _project(items, partial(_search_note, makers=_FIELDS))
+        return _validate(_NOTES, projected.items, projected.rejected, projected.errors)
+    return _project(items, partial(_search_note, makers=_MAKERS[mode]))
+
+
+def restore_items(kind: str, records: Iterable[Dict[str, Any]], mode: str) -> List[Any]:
+    """Rebuild results saved as plain dicts (e.g. in a checkpoint).
+
+    Args:
+        kind: "note" or "comment"
+        records: Dicts shaped like model_dump() of the result models
+        mode: Result mode ("model", "dict" or "slots")
+
+    Returns:
+        List of NoteResponse/CommentResponse, dict or record results
+    """
+    records = list(records)
+    if mode == "model":
+        adapter = _NOTES if kind == "note" else _COMMENTS
+        return adapter.validate_python(records)
+    build = _raw_note if kind == "note" else _raw_comment
+    makers = _MAKERS[mode]
+    return [build(record, makers) for record in records]
+
+
+def parse_note(note_card: Dict[str, Any], mode: str = "model") -> Any:
+    """Parse a single feed note_card.
+
+    Returns:
+        NoteResponse, dict or NoteRecord
+    """
+    if mode == "model":
+        return NoteResponse(**note_card)
+    return _raw_note(note_card, _MAKERS[mode])
+
+
+def parse_user(fields: Dict[str, Any], mode: str = "model") -> Any:
+    """Build a user result from UserResponse field values.
+
+    Returns:
+        UserResponse, dict or UserRecord
+    """
+    if mode == "model":
+        return UserResponse(**fields)
+    return _raw_user(fields, _MAKERS[mode])
+
+
+__all__ = [
+    "RESULT_MODES",
+    "ParseResult",
+    "build_page",
+    "note_ref",
+    "parse_comments",
+    "parse_user_notes",
+    "parse_search_notes",
+    "parse_note",
+    "parse_user",
+    "restore_items",
+    "result_field",
+]
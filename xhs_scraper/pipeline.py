@@ -0,0 +1,419 @@
+"""Producer/consumer crawl pipelines.
+
+A Pipeline runs stages as pools of async workers connected by bounded
+queues, so searching, fetching details, downloading media and writing
+results overlap instead of running one after another. A full queue blocks
+the stage feeding it, so a slow sink throttles the stages upstream
+(backpressure) instead of buffering the whole crawl in memory.
+
+Usage:
+    async with XHSClient(cookies=cookies) as client:
+        pipeline = (
+            Pipeline(queue_size=100)
+            .stage("search", search_stage(client, max_pages=5))
+            .stage("detail", note_detail_stage(client), concurrency=8)
+            .stage("comments", comments_stage(client), concurrency=4)
+            .stage("media", media_stage("downloads"), concurrency=4)
+            .stage("sink", JSONLinesSink("notes.jsonl"))
+        )
+        stats = await pipeline.run(["coffee", "tea"])
+
+A stage function takes one item and either returns an awaitable (its
+result is passed on; None drops the item) or is an async generator (every
+yielded item is passed on, for fan-out such as one keyword to many notes).
+"""
+
+import asyncio
+import inspect
+import logging
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AsyncIterable,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Literal,
+    Optional,
+    Union,
+)
+
+from xhs_scraper.parsers import note_ref, result_field
+from xhs_scraper.utils.checkpoint import to_plain
+
+if TYPE_CHECKING:
+    from xhs_scraper.client import XHSClient
+    from xhs_scraper.utils.codec import JSONCodec
+
+logger = logging.getLogger(__name__)
+
+_DONE = object()
+
+
+@dataclass
+class StageStats:
+    """Counters of one pipeline stage.
+
+    Attributes:
+        name: Stage name
+        received: Items taken from the input queue
+        emitted: Items passed to the next stage
+        failed: Items whose processing raised
+        blocked_seconds: Time workers spent waiting for room in the next
+            queue; a high value means a downstream stage is the bottleneck
+        max_queue: Highest observed length of the input queue
+    """
+
+    name: str
+    received: int = 0
+    emitted: int = 0
+    failed: int = 0
+    blocked_seconds: float = 0.0
+    max_queue: int = 0
+
+
+@dataclass
+class Stage:
+    """One pipeline stage.
+
+    Attributes:
+        name: Stage name, used in stats and logs
+        func: Async function or async generator function of one item
+        concurrency: Number of workers
+        queue_size: Capacity of the input queue (None uses the pipeline's)
+    """
+
+    name: str
+    func: Callable[[Any], Any]
+    concurrency: int = 1
+    queue_size: Optional[int] = None
+
+
+class Pipeline:
+    """Chain of concurrent stages connected by bounded queues.
+
+    Args:
+        queue_size: Default capacity of the queue in front of each stage
+        on_error: ``"skip"`` logs a failing item and continues;
+            ``"raise"`` cancels the pipeline and re-raises the error
+    """
+
+    def __init__(
+        self, queue_size: int = 100, on_error: Literal["skip", "raise"] = "skip"
+    ):
+        """Initialize an empty pipeline.
+
+        Raises:
+            ValueError: If queue_size is not positive or on_error is unknown
+        """
+        if queue_size <= 0:
+            raise ValueError("queue_size must be positive")
+        if on_error not in ("skip", "raise"):
+            raise ValueError("on_error must be 'skip' or 'raise'")
+        self.queue_size = queue_size
+        self.on_error = on_error
+        self.stages: List[Stage] = []
+
+    def stage(
+        self,
+        name: str,
+        func: Callable[[Any], Any],
+        concurrency: int = 1,
+        queue_size: Optional[int] = None,
+    ) -> "Pipeline":
+        """Append a stage.
+
+        If ``func`` has an ``aclose()`` coroutine method (like
+        JSONLinesSink), it is awaited once the stage has drained.
+
+        Returns:
+            The pipeline, for chaining
+
+        Raises:
+            ValueError: If concurrency or queue_size is not positive, or
+                the name is taken
+        """
+        if concurrency <= 0:
+            raise ValueError("concurrency must be positive")
+        if queue_size is not None and queue_size <= 0:
+            raise ValueError("queue_size must be positive")
+        if any(stage.name == name for stage in self.stages):
+            raise ValueError(f"duplicate stage name {name!r}")
+        self.stages.append(Stage(name, func, concurrency, queue_size))
+        return self
+
+    async def run(
+        self, inputs: Union[Iterable[Any], AsyncIterable[Any]]
+    ) -> Dict[str, StageStats]:
+        """Feed ``inputs`` through all stages and wait until they drain.
+
+        Items emitted by the last stage are discarded, so it is usually a
+        sink.
+
+        Returns:
+            Stats per stage name, in stage order
+
+        Raises:
+            ValueError: If the pipeline has no stages
+            Exception: The first stage error, with on_error="raise"
+        """
+        if not self.stages:
+            raise ValueError("pipeline has no stages")
+        queues = [
+            asyncio.Queue(stage.queue_size or self.queue_size) for stage in self.stages
+        ]
+        stats = {stage.name: StageStats(stage.name) for stage in self.stages}
+
+        tasks = [asyncio.ensure_future(self._feed(inputs, queues[0]))]
+        for index, stage in enumerate(self.stages):
+            output = queues[index + 1] if index + 1 < len(queues) else None
+            next_workers = (
+                self.stages[index + 1].concurrency if output is not None else 0
+            )
+            tasks.append(
+                asyncio.ensure_future(
+                    self._run_stage(
+                        stage, queues[index], output, next_workers, stats[stage.name]
+                    )
+                )
+            )
+        try:
+            await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+        return stats
+
+    async def _feed(
+        self, inputs: Union[Iterable[Any], AsyncIterable[Any]], queue: asyncio.Queue
+    ) -> None:
+        if hasattr(inputs, "__aiter__"):
+            async for item in inputs:
+                await queue.put(item)
+        else:
+            for item in inputs:
+                await queue.put(item)
+        for _ in range(self.stages[0].concurrency):
+            await queue.put(_DONE)
+
+    async def _run_stage(
+        self,
+        stage: Stage,
+        queue: asyncio.Queue,
+        output: Optional[asyncio.Queue],
+        next_workers: int,
+        stats: StageStats,
+    ) -> None:
+        workers = [
+            self._worker(stage, queue, output, stats) for _ in range(stage.concurrency)
+        ]
+        await asyncio.gather(*workers)
+        aclose = getattr(stage.func, "aclose", None)
+        if aclose is not None:
+            await aclose()
+        if output is not None:
+            for _ in range(next_workers):
+                await output.put(_DONE)
+
+    async def _worker(
+        self,
+        stage: Stage,
+        queue: asyncio.Queue,
+        output: Optional[asyncio.Queue],
+        stats: StageStats,
+    ) -> None:
+        async def emit(result: Any) -> None:
+            if result is None:
+                return
+            stats.emitted += 1
+            if output is None:
+                return
+            if output.full():
+                started = time.monotonic()
+                await output.put(result)
+                stats.blocked_seconds += time.monotonic() - started
+            else:
+                output.put_nowait(result)
+
+        while True:
+            stats.max_queue = max(stats.max_queue, queue.qsize())
+            item = await queue.get()
+            if item is _DONE:
+                return
+            stats.received += 1
+            try:
+                result = stage.func(item)
+                if inspect.isawaitable(result):
+                    result = await result
+                if hasattr(result, "__aiter__"):
+                    async for produced in result:
+                        await emit(produced)
+                else:
+                    await emit(result)
+            except Exception as exc:
+                stats.failed += 1
+                if self.on_error == "raise":
+                    raise
+                logger.warning("Stage %r failed on %r: %s", stage.name, item, exc)
+
+
+@dataclass
+class CrawlResult:
+    """A note with what later stages collected for it.
+
+    Attributes:
+        note: The note (model, dict or record, per the client's result_mode)
+        comments: Comments from comments_stage(), if it ran
+        media: Downloaded files from media_stage(), if it ran
+    """
+
+    note: Any
+    comments: Optional[List[Any]] = None
+    media: Optional[List[Path]] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Plain-dict form, as written by JSONLinesSink."""
+        data = {"note": to_plain(self.note)}
+        if self.comments is not None:
+            data["comments"] = [to_plain(comment) for comment in self.comments]
+        if self.media is not None:
+            data["media"] = [str(path) for path in self.media]
+        return data
+
+
+def _crawl_result(item: Any) -> CrawlResult:
+    return item if isinstance(item, CrawlResult) else CrawlResult(item)
+
+
+def search_stage(
+    client: "XHSClient", max_pages: int = 1, **options: Any
+) -> Callable[[str], AsyncIterable[Any]]:
+    """Stage turning a keyword into its search results.
+
+    Args:
+        client: Open XHSClient
+        max_pages: Result pages fetched per keyword
+        **options: search_notes() options (sort, note_type, created_after, ...)
+    """
+
+    async def search(keyword: str) -> AsyncIterable[Any]:
+        for page in range(1, max_pages + 1):
+            result = await client.search.search_notes(keyword, page=page, **options)
+            items = result_field(result, "items") or []
+            for note in items:
+                yield note
+            if not items or not result_field(result, "has_more"):
+                return
+
+    return search
+
+
+def note_detail_stage(client: "XHSClient") -> Callable[[Any], Any]:
+    """Stage fetching full notes for search results or (note_id, xsec_token)."""
+
+    async def detail(note: Any) -> Any:
+        note_id, xsec_token = note_ref(note)
+        if not note_id:
+            return None
+        return await client.notes.get_note(note_id, xsec_token)
+
+    return detail
+
+
+def comments_stage(
+    client: "XHSClient", max_pages: int = 1
+) -> Callable[[Any], Any]:
+    """Stage attaching a note's comments, producing a CrawlResult."""
+
+    async def comments(item: Any) -> CrawlResult:
+        result = _crawl_result(item)
+        page = await client.comments.get_comments(
+            result_field(result.note, "note_id"), max_pages=max_pages
+        )
+        result.comments = list(result_field(page, "items") or [])
+        return result
+
+    return comments
+
+
+def media_stage(
+    output_dir: Union[str, Path], filename_pattern: str = "{note_id}_{index}.{ext}"
+) -> Callable[[Any], Any]:
+    """Stage downloading a note's images and video, producing a CrawlResult."""
+    from xhs_scraper.utils.media import download_media
+
+    async def media(item: Any) -> CrawlResult:
+        result = _crawl_result(item)
+        urls = list(result_field(result.note, "images") or [])
+        video = result_field(result.note, "video")
+        if video:
+            urls.append(video)
+        result.media = await download_media(
+            urls,
+            output_dir,
+            filename_pattern=filename_pattern,
+            note_id=result_field(result.note, "note_id"),
+        )
+        return result
+
+    return media
+
+
+class JSONLinesSink:
+    """Sink stage appending each item to a JSON Lines file.
+
+    Writes run in a worker thread so disk I/O overlaps the network stages.
+    Use it with concurrency=1 to keep lines whole and in arrival order.
+
+    Args:
+        path: Output file (appended to)
+        codec: JSON codec name or instance (see xhs_scraper.utils.codec)
+    """
+
+    def __init__(
+        self, path: Union[str, Path], codec: Union[str, "JSONCodec", None] = None
+    ):
+        """Initialize sink; the file is opened on the first item."""
+        from xhs_scraper.utils.codec import get_codec
+
+        self.path = Path(path)
+        self.codec = get_codec(codec)
+        self.written = 0
+        self._file = None
+
+    async def __call__(self, item: Any) -> None:
+        data = item.to_dict() if isinstance(item, CrawlResult) else to_plain(item)
+        line = self.codec.dumps(data) + b"\n"
+        await asyncio.to_thread(self._write, line)
+        self.written += 1
+
+    def _write(self, line: bytes) -> None:
+        if self._file is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = open(self.path, "ab")
+        self._file.write(line)
+
+    async def aclose(self) -> None:
+        """Flush and close the file."""
+        if self._file is not None:
+            await asyncio.to_thread(self._file.close)
+            self._file = None
+
+
+__all__ = [
+    "Pipeline",
+    "Stage",
+    "StageStats",
+    "CrawlResult",
+    "JSONLinesSink",
+    "search_stage",
+    "note_detail_stage",
+    "comments_stage",
+    "media_stage",
+]
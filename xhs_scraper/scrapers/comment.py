@@ -6,13 +6,46 @@ from XHS notes using cursor-based pagination.
 
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, List, Optional
+import logging
+from typing import TYPE_CHECKING, Any, List, Optional, Set
 
 from xhs_scraper.models import CommentResponse, PaginatedResponse
+from xhs_scraper.parsers import (
+    ParseResult,
+    build_page,
+    parse_comments,
+    restore_items,
+    result_field,
+)
+from xhs_scraper.utils.checkpoint import load_for_stream, to_plain
+from xhs_scraper.utils.idset import SeenIds
 
 if TYPE_CHECKING:
     from xhs_scraper.client import XHSClient
 
+logger = logging.getLogger(__name__)
+
+
+def _log_rejected(kind: str, parsed: ParseResult) -> None:
+    if parsed.rejected:
+        logger.debug(
+            "Skipped %d malformed %s: %s", parsed.rejected, kind, parsed.errors
+        )
+
+
+def _unseen(items: List[Any], seen_ids: SeenIds) -> List[Any]:
+    """Raw comments not in ``seen_ids``, without repeats within the page."""
+    page_ids: Set[str] = set()
+    unseen = []
+    for item in items:
+        comment_id = item.get("comment_id") if isinstance(item, dict) else None
+        if comment_id:
+            if comment_id in seen_ids or comment_id in page_ids:
+                continue
+            page_ids.add(comment_id)
+        unseen.append(item)
+    return unseen
+
 
 class CommentScraper:
     """Scraper for fetching comments from XHS notes."""
@@ -30,6 +63,8 @@ class CommentScraper:
         note_id: str,
         cursor: str = "",
         max_pages: int = 100,
+        resume_from: Optional[str] = None,
+        seen_ids: Optional[SeenIds] = None,
     ) -> PaginatedResponse[CommentResponse]:
         """Fetch comments for a note with cursor pagination.
 
@@ -37,6 +72,12 @@ class CommentScraper:
             note_id: The ID of the note to fetch comments for.
             cursor: Pagination cursor (empty string for first page).
             max_pages: Maximum number of pages to fetch (default 100).
+            resume_from: Checkpoint key. Progress is saved to the client's
+                checkpoint_store after every page, and an existing checkpoint
+                is resumed (its cursor replaces ``cursor``).
+            seen_ids: Comment ids already collected, shared across calls or
+                jobs (a set, CompactIdSet or BloomIdSet). Comments in it are
+                skipped and returned comments are added to it.
 
         Returns:
             PaginatedResponse containing comment items and next cursor.
@@ -47,12 +88,26 @@ class CommentScraper:
             CaptchaRequiredError: If CAPTCHA is required.
             RateLimitError: If rate limited.
             CookieExpiredError: If cookies are expired.
+            ValueError: If resume_from is given without a checkpoint store,
+                or names a checkpoint of another stream.
         """
+        mode = self._client.result_mode
         seen_cursors: set[str] = set()
         all_comments: List[CommentResponse] = []
         current_cursor = cursor
         page_count = 0
 
+        store = self._client.checkpoint_store
+        stream = f"comments:{note_id}"
+        if resume_from is not None:
+            checkpoint = load_for_stream(store, resume_from, stream)
+            if checkpoint is not None:
+                all_comments = restore_items("comment", checkpoint.items, mode)
+                seen_cursors = set(checkpoint.seen)
+                current_cursor = checkpoint.cursor
+                if checkpoint.done:
+                    page_count = max_pages
+
         while page_count < max_pages:
             # Detect duplicate cursor (end of pagination)
             if current_cursor in seen_cursors:
@@ -73,26 +128,42 @@ class CommentScraper:
                 params=params,
             )
 
-            # Parse response
+            # Parse response, skipping malformed comment data
             items = response_data.get("items", [])
-            for item_data in items:
-                try:
-                    comment = CommentResponse(**item_data)
-                    all_comments.append(comment)
-                except Exception:
-                    # Skip malformed comment data
-                    pass
+            if seen_ids is not None:
+                items = _unseen(items, seen_ids)
+            parsed = parse_comments(items, mode)
+            _log_rejected("comments", parsed)
+            all_comments.extend(parsed.items)
 
             # Check for more pages
+            fetched_cursor = current_cursor
             current_cursor = response_data.get("cursor", "")
             has_more = response_data.get("has_more", False)
 
             page_count += 1
 
-            if not has_more or not current_cursor:
+            done = not has_more or not current_cursor
+            if resume_from is not None:
+                store.save_page(
+                    resume_from,
+                    stream,
+                    cursor=current_cursor,
+                    items=[to_plain(comment) for comment in parsed.items],
+                    seen=[fetched_cursor],
+                    done=done or current_cursor in seen_cursors,
+                )
+            if seen_ids is not None:
+                # Only once parsed and checkpointed, so nothing is marked seen
+                # without having been returned.
+                parsed_ids = (result_field(c, "comment_id") for c in parsed.items)
+                seen_ids.update(filter(None, parsed_ids))
+            if done:
                 break
 
-        return PaginatedResponse[CommentResponse](
+        return build_page(
+            PaginatedResponse[CommentResponse],
+            mode,
             items=all_comments,
             cursor=current_cursor,
             has_more=False,
@@ -132,19 +203,15 @@ class CommentScraper:
             payload=payload,
         )
 
-        # Parse response
-        items = response_data.get("items", [])
-        comments: List[CommentResponse] = []
-        for item_data in items:
-            try:
-                comment = CommentResponse(**item_data)
-                comments.append(comment)
-            except Exception:
-                # Skip malformed comment data
-                pass
-
-        return PaginatedResponse[CommentResponse](
-            items=comments,
+        # Parse response, skipping malformed comment data
+        mode = self._client.result_mode
+        parsed = parse_comments(response_data.get("items", []), mode)
+        _log_rejected("sub-comments", parsed)
+
+        return build_page(
+            PaginatedResponse[CommentResponse],
+            mode,
+            items=parsed.items,
             cursor=response_data.get("cursor", ""),
             has_more=response_data.get("has_more", False),
         )
@@ -2,12 +2,28 @@
 
 This module provides NoteScraper class for:
 - Fetching individual notes via get_note()
+- Fetching many notes concurrently via get_notes()
 - Fetching user's posted notes via get_user_notes() with cursor-based pagination
 """
 
-from typing import Dict, Any, Optional, List, Set
-from ..models import NoteResponse, PaginatedResponse, UserResponse
+import asyncio
+import logging
+from typing import Dict, Any, Iterable, Optional, List, Set, Tuple, Union
+from ..models import NoteResponse, PaginatedResponse
 from ..client import XHSClient
+from ..parsers import (
+    build_page,
+    note_ref,
+    parse_note,
+    parse_user_notes,
+    restore_items,
+    result_field,
+)
+from ..utils.checkpoint import load_for_stream, to_plain
+from ..utils.idset import SeenIds
+from ..utils.note_id import TimeBound, TimeRange
+
+logger = logging.getLogger(__name__)
 
 
 class NoteScraper:
@@ -63,15 +79,61 @@ class NoteScraper:
         items = response_data.get("data", {}).get("items", [])
         if items:
             note_card = items[0].get("note_card", {})
-            return NoteResponse(**note_card)
+            return parse_note(note_card, self._client.result_mode)
+
+        return parse_note({}, self._client.result_mode)
+
+    async def get_notes(
+        self,
+        notes: Iterable[Union[Tuple[str, str], Any]],
+        *,
+        created_after: Optional[TimeBound] = None,
+        created_before: Optional[TimeBound] = None,
+        concurrency: int = 5,
+    ) -> List[NoteResponse]:
+        """Fetch many notes concurrently.
+
+        Notes whose id shows they were created outside the
+        created_after/created_before window are skipped without a request.
+
+        Args:
+            notes: (note_id, xsec_token) pairs, or note results from other
+                scrapers (models, dicts or records with note_id/xsec_token)
+            created_after: Skip notes created earlier (datetime or Unix seconds)
+            created_before: Skip notes created at or after this time
+            concurrency: Maximum requests in flight
+
+        Returns:
+            Fetched notes, in input order
+
+        Raises:
+            ValueError: If concurrency is not positive or the window is empty
+            APIError: If an API request fails (see get_note())
+        """
+        if concurrency <= 0:
+            raise ValueError("concurrency must be positive")
+        window = TimeRange(created_after, created_before)
+        refs = [note_ref(note) for note in notes]
+        refs = [ref for ref in refs if ref[0] and window.contains(ref[0])]
+
+        semaphore = asyncio.Semaphore(concurrency)
 
-        return NoteResponse()
+        async def fetch(note_id: str, xsec_token: str) -> NoteResponse:
+            async with semaphore:
+                return await self.get_note(note_id, xsec_token)
+
+        return list(await asyncio.gather(*(fetch(*ref) for ref in refs)))
 
     async def get_user_notes(
         self,
         user_id: str,
         cursor: str = "",
         max_pages: int = 100,
+        resume_from: Optional[str] = None,
+        incremental: bool = False,
+        created_after: Optional[TimeBound] = None,
+        created_before: Optional[TimeBound] = None,
+        seen_ids: Optional[SeenIds] = None,
     ) -> PaginatedResponse[NoteResponse]:
         """Fetch user's posted notes with cursor-based pagination.
 
@@ -82,6 +144,21 @@ class NoteScraper:
             user_id: The user ID whose notes to fetch
             cursor: Pagination cursor (empty string starts from beginning)
             max_pages: Maximum number of pages to fetch (default 100)
+            resume_from: Checkpoint key. Progress is saved to the client's
+                checkpoint_store after every page, and an existing checkpoint
+                is resumed (its cursor replaces ``cursor``).
+            incremental: Return only notes newer than the user's high-water
+                mark in the client's watermark_store, stopping pagination at
+                the first already-known note. The mark is advanced when the
+                crawl reaches it or exhausts the listing (not when it stops
+                at max_pages, which would leave a gap).
+            created_after: Only return notes created at or after this time
+                (datetime or Unix seconds). Notes are listed newest first, so
+                pagination stops at the first older non-sticky note.
+            created_before: Only return notes created before this time
+            seen_ids: Ids already collected, shared across calls or jobs (a
+                set, CompactIdSet or BloomIdSet). Notes in it are skipped and
+                returned notes are added to it.
 
         Returns:
             PaginatedResponse containing list of NoteResponse objects,
@@ -93,12 +170,51 @@ class NoteScraper:
             CaptchaRequiredError: If CAPTCHA verification is required
             RateLimitError: If rate limit is exceeded
             CookieExpiredError: If authentication cookies are expired
+            ValueError: If resume_from is given without a checkpoint store,
+                or names a checkpoint of another stream; if incremental is
+                set without a watermark store or together with resume_from;
+                if created_after is not before created_before
         """
+        window = TimeRange(created_after, created_before)
+        mode = self._client.result_mode
         all_notes: List[NoteResponse] = []
         seen_note_ids: Set[str] = set()
         current_cursor = cursor
         pages_fetched = 0
 
+        store = self._client.checkpoint_store
+        stream = f"user_notes:{user_id}"
+        if resume_from is not None:
+            if incremental:
+                raise ValueError("resume_from and incremental cannot be combined")
+            checkpoint = load_for_stream(store, resume_from, stream)
+            if checkpoint is not None:
+                all_notes = restore_items("note", checkpoint.items, mode)
+                seen_note_ids.update(checkpoint.seen)
+                current_cursor = checkpoint.cursor
+                if checkpoint.done:
+                    return build_page(
+                        PaginatedResponse,
+                        mode,
+                        items=all_notes,
+                        cursor=current_cursor,
+                        has_more=False,
+                    )
+
+        marks = self._client.watermark_store
+        known_ids: Set[str] = set()
+        known_sticky: Set[str] = set()
+        new_ids: List[str] = []
+        new_sticky: List[str] = []
+        complete = False
+        if incremental:
+            if marks is None:
+                raise ValueError("incremental requires XHSClient(watermark_store=...)")
+            mark = marks.get(user_id)
+            if mark is not None:
+                known_ids = set(mark.ids)
+                known_sticky = set(mark.sticky)
+
         while pages_fetched < max_pages:
             params = {
                 "num": 30,
@@ -117,48 +233,98 @@ class NoteScraper:
             next_cursor = response_data.get("data", {}).get("cursor", "")
             has_more = response_data.get("data", {}).get("has_more", False)
 
-            # Process notes with duplicate detection
-            page_notes = []
+            # Skip duplicates, then parse the page in one batch
+            page_items = []
+            page_ids = []
+            reached_mark = False
+            reached_window_start = False
             for item in items:
-                note_id = item.get("note_id")
+                note_id = item.get("note_id") if isinstance(item, dict) else None
 
-                # Skip duplicates
                 if note_id and note_id in seen_note_ids:
                     continue
 
-                if note_id:
-                    seen_note_ids.add(note_id)
+                # Sticky notes are pinned above newer ones, so only non-sticky
+                # notes mark the end of new content or of the time window.
+                interact_info = (item.get("interact_info") or {}) if note_id else {}
+                sticky = bool(interact_info.get("sticky"))
+                if incremental and note_id:
+                    if sticky:
+                        if note_id in known_sticky or note_id in known_ids:
+                            continue
+                        new_sticky.append(note_id)
+                    elif note_id in known_ids:
+                        reached_mark = True
+                        break
+                    else:
+                        new_ids.append(note_id)
+
+                if window and note_id and not window.contains(note_id):
+                    if window.is_older(note_id) and not sticky:
+                        reached_window_start = True
+                        break
+                    continue
 
-                user_data = item.get("user", {})
-                interact_info = item.get("interact_info", {})
+                # Checked after the high-water mark: known notes are usually
+                # in seen_ids too, and must still end an incremental crawl.
+                if note_id and seen_ids is not None and note_id in seen_ids:
+                    continue
 
-                user = UserResponse(
-                    user_id=user_data.get("user_id"),
-                    nickname=user_data.get("nickname") or user_data.get("nick_name"),
-                    avatar=user_data.get("avatar"),
-                )
+                if note_id:
+                    seen_note_ids.add(note_id)
+                    page_ids.append(note_id)
+                page_items.append(item)
 
-                note_response = NoteResponse(
-                    note_id=note_id,
-                    title=item.get("display_title"),
-                    user=user,
-                    liked_count=int(interact_info.get("liked_count", 0))
-                    if interact_info.get("liked_count")
-                    else None,
-                    xsec_token=item.get("xsec_token"),
+            parsed = parse_user_notes(page_items, mode)
+            if parsed.rejected:
+                logger.debug(
+                    "Skipped %d malformed notes: %s", parsed.rejected, parsed.errors
                 )
-                page_notes.append(note_response)
+            page_notes = parsed.items
 
             all_notes.extend(page_notes)
             pages_fetched += 1
 
             # Stop if no more pages or cursor hasn't changed
-            if not has_more or not next_cursor or next_cursor == current_cursor:
+            exhausted = (
+                not has_more or not next_cursor or next_cursor == current_cursor
+            )
+            done = exhausted or reached_mark or reached_window_start
+            if resume_from is not None:
+                store.save_page(
+                    resume_from,
+                    stream,
+                    cursor=current_cursor if done else next_cursor,
+                    items=[to_plain(note) for note in page_notes],
+                    seen=page_ids,
+                    done=done,
+                )
+            if seen_ids is not None:
+                # Only once parsed and checkpointed, so nothing is marked seen
+                # without having been returned.
+                parsed_ids = (result_field(note, "note_id") for note in page_notes)
+                seen_ids.update(filter(None, parsed_ids))
+            if done:
+                complete = exhausted or reached_mark
                 break
 
             current_cursor = next_cursor
 
-        return PaginatedResponse(
+        if incremental:
+            if complete:
+                marks.update(user_id, new_ids, new_sticky)
+            else:
+                logger.warning(
+                    "Incremental crawl of %s stopped (max_pages=%d or "
+                    "created_after) before reaching known notes; high-water "
+                    "mark not advanced",
+                    user_id,
+                    max_pages,
+                )
+
+        return build_page(
+            PaginatedResponse,
+            mode,
             items=all_notes,
             cursor=current_cursor,
             has_more=False,  # We've exhausted all pages up to max_pages
@@ -1,20 +1,44 @@
 """Search scraper for Xiaohongshu (XHS).
 
 This module provides SearchScraper for searching notes on XHS using
-keyword-based search with page-based pagination.
+keyword-based search with page-based pagination, and KeywordMonitor for
+continuously streaming new notes for a set of keywords.
 """
 
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Literal, Optional
+import asyncio
+import heapq
+from collections import deque
+from dataclasses import dataclass, field
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AsyncIterator,
+    Deque,
+    Dict,
+    Iterable,
+    List,
+    Literal,
+    Optional,
+    Set,
+    Tuple,
+)
+import logging
 import time
 import random
 
+from xhs_scraper.exceptions import APIError, CircuitOpenError, RateLimitError
 from xhs_scraper.models import SearchResultResponse
+from xhs_scraper.parsers import build_page, parse_search_notes, result_field
+from xhs_scraper.utils.idset import SeenIds
+from xhs_scraper.utils.note_id import TimeBound, TimeRange
 
 if TYPE_CHECKING:
     from xhs_scraper.client import XHSClient
 
+logger = logging.getLogger(__name__)
+
 
 # Note type mapping: string to integer for API
 NOTE_TYPE_MAP = {
@@ -50,6 +74,232 @@ def _generate_search_id() -> str:
     return _base36_encode(e + t)
 
 
+@dataclass
+class KeywordState:
+    """Polling state of one monitored keyword.
+
+    Attributes:
+        keyword: Search keyword
+        interval: Seconds until the next poll
+        newest_id: Newest note id seen (ids start with their creation time,
+            so newer notes compare greater)
+        rate: Smoothed posting rate in new notes per second
+        polls: Polls made
+        new_notes: New notes emitted
+        last_poll: Event-loop time of the last poll
+    """
+
+    keyword: str
+    interval: float
+    newest_id: Optional[str] = None
+    rate: float = 0.0
+    polls: int = 0
+    new_notes: int = 0
+    last_poll: Optional[float] = None
+    recent_ids: Deque[str] = field(
+        default_factory=lambda: deque(maxlen=500), repr=False
+    )
+    _recent_set: Set[str] = field(default_factory=set, repr=False)
+
+    def is_new(self, note_id: str) -> bool:
+        """Whether a note is newer than everything seen for this keyword."""
+        if note_id in self._recent_set:
+            return False
+        return self.newest_id is None or note_id > self.newest_id
+
+    def remember(self, note_id: str) -> None:
+        """Record a note as seen."""
+        if len(self.recent_ids) == self.recent_ids.maxlen:
+            self._recent_set.discard(self.recent_ids[0])
+        self.recent_ids.append(note_id)
+        self._recent_set.add(note_id)
+        if self.newest_id is None or note_id > self.newest_id:
+            self.newest_id = note_id
+
+
+class KeywordMonitor:
+    """Async stream of new notes for a set of keywords.
+
+    Each keyword is searched with sort="TIME_DESC". The first poll records a
+    baseline; later polls fetch pages only until they reach a note that is
+    not newer than the newest one already seen, and emit the new notes
+    oldest first as ``(keyword, note)`` pairs.
+
+    Poll intervals adapt per keyword: the smoothed posting rate sets the
+    interval to collect about ``target_new`` notes per poll, a poll with no
+    new notes backs off by ``backoff``, and a poll that ran out of
+    ``max_pages`` before reaching known notes (whose older new notes are
+    then skipped) halves the interval. Failed
+    polls (APIError, CircuitOpenError, RateLimitError) are logged and
+    retried after backing off; other errors (expired cookies, captcha) end
+    the stream.
+
+    Usage:
+        monitor = client.search.monitor_keywords(["coffee", "tea"])
+        async for keyword, note in monitor:
+            print(keyword, note.note_id)
+        print(monitor.states["coffee"].interval)
+
+    Args:
+        scraper: SearchScraper used to poll
+        keywords: Keywords to monitor
+        min_interval: Shortest poll interval in seconds
+        max_interval: Longest poll interval in seconds
+        initial_interval: First interval (defaults to min_interval)
+        target_new: New notes per poll the interval aims for
+        max_pages: Pages fetched per poll at most
+        backoff: Interval multiplier after a poll without new notes
+        smoothing: Weight of the latest poll in the posting-rate average
+        emit_initial: Emit the notes of the baseline poll too
+        note_type: Search note type filter
+        seen_ids: Ids already emitted, shared across keywords, monitors or
+            runs (a set, CompactIdSet or BloomIdSet). New notes in it are
+            not emitted again; emitted notes are added to it.
+    """
+
+    def __init__(
+        self,
+        scraper: "SearchScraper",
+        keywords: Iterable[str],
+        *,
+        min_interval: float = 60.0,
+        max_interval: float = 3600.0,
+        initial_interval: Optional[float] = None,
+        target_new: float = 10.0,
+        max_pages: int = 5,
+        backoff: float = 2.0,
+        smoothing: float = 0.3,
+        emit_initial: bool = False,
+        note_type: Literal["ALL", "VIDEO", "IMAGE"] = "ALL",
+        seen_ids: Optional[SeenIds] = None,
+    ):
+        """Initialize monitor.
+
+        Raises:
+            ValueError: If any argument is out of range
+        """
+        keywords = list(dict.fromkeys(keywords))
+        if not keywords:
+            raise ValueError("keywords must be non-empty")
+        if not 0 < min_interval <= max_interval:
+            raise ValueError("intervals must satisfy 0 < min_interval <= max_interval")
+        if target_new <= 0 or max_pages <= 0 or backoff < 1:
+            raise ValueError("target_new and max_pages must be positive, backoff >= 1")
+        if not 0 < smoothing <= 1:
+            raise ValueError("smoothing must be in (0, 1]")
+
+        self._scraper = scraper
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.target_new = target_new
+        self.max_pages = max_pages
+        self.backoff = backoff
+        self.smoothing = smoothing
+        self.emit_initial = emit_initial
+        self.note_type = note_type
+        self.seen_ids = seen_ids
+        start = initial_interval if initial_interval is not None else min_interval
+        self.states: Dict[str, KeywordState] = {
+            keyword: KeywordState(keyword, self._clamp(start)) for keyword in keywords
+        }
+
+    def _clamp(self, interval: float) -> float:
+        return min(self.max_interval, max(self.min_interval, interval))
+
+    def __aiter__(self) -> AsyncIterator[Tuple[str, Any]]:
+        return self._run()
+
+    async def _run(self) -> AsyncIterator[Tuple[str, Any]]:
+        loop = asyncio.get_running_loop()
+        now = loop.time()
+        schedule = [(now, index, kw) for index, kw in enumerate(self.states)]
+        heapq.heapify(schedule)
+        while schedule:
+            due, index, keyword = heapq.heappop(schedule)
+            delay = due - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+            state = self.states[keyword]
+            try:
+                notes = await self.poll(state)
+            except (APIError, CircuitOpenError, RateLimitError) as exc:
+                state.interval = self._clamp(state.interval * self.backoff)
+                logger.warning(
+                    "Polling %r failed (%s); retrying in %.0fs",
+                    keyword,
+                    exc,
+                    state.interval,
+                )
+                notes = []
+
+            heapq.heappush(schedule, (loop.time() + state.interval, index, keyword))
+            for note in notes:
+                yield keyword, note
+
+    async def poll(self, state: KeywordState) -> List[Any]:
+        """Poll one keyword once and update its state and interval.
+
+        Returns:
+            New notes, oldest first (empty for a baseline poll unless
+            emit_initial is set)
+        """
+        now = asyncio.get_running_loop().time()
+        baseline = state.newest_id is None
+        new_notes: List[Any] = []
+        reached_known = baseline
+        for page in range(1, (1 if baseline else self.max_pages) + 1):
+            result = await self._scraper.search_notes(
+                state.keyword, page=page, sort="TIME_DESC", note_type=self.note_type
+            )
+            for note in result.items:
+                note_id = result_field(note, "note_id")
+                if not note_id:
+                    continue
+                if state.is_new(note_id):
+                    new_notes.append(note)
+                else:
+                    reached_known = True
+            if reached_known or not result.has_more:
+                reached_known = True
+                break
+
+        for note in new_notes:
+            state.remember(result_field(note, "note_id"))
+        new_notes.reverse()
+        state.polls += 1
+
+        if not baseline:
+            state.new_notes += len(new_notes)
+            elapsed = now - state.last_poll if state.last_poll is not None else None
+            if elapsed:
+                observed = len(new_notes) / elapsed
+                state.rate += self.smoothing * (observed - state.rate)
+            if not reached_known:
+                state.interval = self._clamp(state.interval / 2)
+            elif not new_notes:
+                state.interval = self._clamp(state.interval * self.backoff)
+            elif state.rate > 0:
+                state.interval = self._clamp(self.target_new / state.rate)
+        state.last_poll = now
+
+        if baseline and not self.emit_initial:
+            return []
+        if self.seen_ids is not None:
+            new_notes = [
+                note
+                for note in new_notes
+                if self._unseen(result_field(note, "note_id"))
+            ]
+        return new_notes
+
+    def _unseen(self, note_id: str) -> bool:
+        if note_id in self.seen_ids:
+            return False
+        self.seen_ids.add(note_id)
+        return True
+
+
 class SearchScraper:
     """Scraper for searching notes on XHS."""
 
@@ -68,6 +318,8 @@ class SearchScraper:
         page_size: int = 20,
         sort: Literal["GENERAL", "TIME_DESC", "POPULARITY"] = "GENERAL",
         note_type: Literal["ALL", "VIDEO", "IMAGE"] = "ALL",
+        created_after: Optional[TimeBound] = None,
+        created_before: Optional[TimeBound] = None,
     ) -> SearchResultResponse:
         """Search for notes by keyword.
 
@@ -77,6 +329,10 @@ class SearchScraper:
             page_size: Number of results per page (max 20, default 20).
             sort: Sort order - "GENERAL", "TIME_DESC", or "POPULARITY" (default "GENERAL").
             note_type: Filter by note type - "ALL", "VIDEO", or "IMAGE" (default "ALL").
+            created_after: Drop results created earlier, judged from their
+                note ids (datetime or Unix seconds). With sort="TIME_DESC",
+                has_more is False once a page reaches older notes.
+            created_before: Drop results created at or after this time.
 
         Returns:
             SearchResultResponse containing note items and pagination info.
@@ -87,9 +343,11 @@ class SearchScraper:
             CaptchaRequiredError: If CAPTCHA is required.
             RateLimitError: If rate limited.
             CookieExpiredError: If cookies are expired.
+            ValueError: If created_after is not before created_before.
         """
         # Normalize page_size to max 20
         normalized_page_size = min(page_size, 20)
+        window = TimeRange(created_after, created_before)
 
         payload = {
             "keyword": keyword,
@@ -109,45 +367,54 @@ class SearchScraper:
         # Parse response
         data = response_data.get("data", {})
         items_data = data.get("items", [])
-        items = []
-        for item_data in items_data:
-            try:
-                note_card = item_data.get("note_card", {})
-                user_data = note_card.get("user", {})
-                interact_info = note_card.get("interact_info", {})
+        has_more = data.get("has_more", False)
+        if window:
+            ids = [
+                item.get("id") if isinstance(item, dict) else None
+                for item in items_data
+            ]
+            if sort == "TIME_DESC" and any(window.is_older(i) for i in ids if i):
+                has_more = False
+            items_data = [
+                item
+                for item, note_id in zip(items_data, ids)
+                if not note_id or window.contains(note_id)
+            ]
+        mode = self._client.result_mode
+        parsed = parse_search_notes(items_data, mode)
+        if parsed.rejected:
+            logger.debug(
+                "Skipped %d malformed search results: %s",
+                parsed.rejected,
+                parsed.errors,
+            )
 
-                from xhs_scraper.models import NoteResponse, UserResponse
+        return build_page(
+            SearchResultResponse,
+            mode,
+            items=parsed.items,
+            has_more=has_more,
+            cursor=data.get("cursor", ""),
+        )
 
-                user = UserResponse(
-                    user_id=user_data.get("user_id"),
-                    nickname=user_data.get("nickname") or user_data.get("nick_name"),
-                    avatar=user_data.get("avatar"),
-                )
+    def monitor_keywords(
+        self, keywords: Iterable[str], **options: Any
+    ) -> KeywordMonitor:
+        """Continuously stream new notes for keywords.
 
-                note = NoteResponse(
-                    note_id=item_data.get("id"),
-                    title=note_card.get("display_title"),
-                    user=user,
-                    liked_count=int(interact_info.get("liked_count", 0))
-                    if interact_info.get("liked_count")
-                    else None,
-                    commented_count=int(interact_info.get("comment_count", 0))
-                    if interact_info.get("comment_count")
-                    else None,
-                    shared_count=int(interact_info.get("shared_count", 0))
-                    if interact_info.get("shared_count")
-                    else None,
-                    xsec_token=item_data.get("xsec_token"),
-                )
-                items.append(note)
-            except Exception:
-                pass
+        Args:
+            keywords: Keywords to monitor
+            **options: KeywordMonitor options (min_interval, max_interval,
+                target_new, max_pages, emit_initial, ...)
 
-        return SearchResultResponse(
-            items=items,
-            has_more=data.get("has_more", False),
-            cursor=data.get("cursor", ""),
-        )
+        Returns:
+            KeywordMonitor yielding ``(keyword, note)`` pairs with
+            ``async for``; its ``states`` expose per-keyword intervals
+
+        Raises:
+            ValueError: If an option is out of range
+        """
+        return KeywordMonitor(self, keywords, **options)
 
 
-__all__ = ["SearchScraper"]
+__all__ = ["SearchScraper", "KeywordMonitor", "KeywordState"]
@@ -3,6 +3,7 @@
 from typing import TYPE_CHECKING, Optional
 
 from ..models import UserResponse
+from ..parsers import parse_user
 
 if TYPE_CHECKING:
     from ..client import XHSClient
@@ -54,13 +55,16 @@ class UserScraper:
             elif item.get("type") == "follows":
                 following = int(item.get("count", 0))
 
-        return UserResponse(
-            user_id=basic_info.get("red_id"),
-            nickname=basic_info.get("nickname"),
-            avatar=basic_info.get("images"),
-            bio=basic_info.get("desc"),
-            followers=followers,
-            following=following,
+        return parse_user(
+            {
+                "user_id": basic_info.get("red_id"),
+                "nickname": basic_info.get("nickname"),
+                "avatar": basic_info.get("images"),
+                "bio": basic_info.get("desc"),
+                "followers": followers,
+                "following": following,
+            },
+            self._client.result_mode,
         )
 
     async def get_self_info(self) -> UserResponse:
@@ -94,11 +98,14 @@ class UserScraper:
             elif item.get("type") == "follows":
                 following = int(item.get("count", 0))
 
-        return UserResponse(
-            user_id=basic_info.get("red_id"),
-            nickname=basic_info.get("nickname"),
-            avatar=basic_info.get("images"),
-            bio=basic_info.get("desc"),
-            followers=followers,
-            following=following,
+        return parse_user(
+            {
+                "user_id": basic_info.get("red_id"),
+                "nickname": basic_info.get("nickname"),
+                "avatar": basic_info.get("images"),
+                "bio": basic_info.get("desc"),
+                "followers": followers,
+                "following": following,
+            },
+            self._client.result_mode,
         )
@@ -0,0 +1,352 @@
+"""Multi-process sharded crawling.
+
+One event loop is limited to one core for signing, JSON decoding and model
+validation. ShardedCrawler spreads a batch of crawl tasks over worker
+processes, each running its own XHSClient, and streams the results back to
+the parent:
+
+    crawler = ShardedCrawler({"cookies": cookies, "rate_limit": 2.0}, processes=8)
+    tasks = [("user_notes", {"user_id": uid}) for uid in user_ids]
+    for result in crawler.run(tasks):
+        if result.error is None:
+            save(result.data)
+    print(crawler.metrics.snapshot())
+
+Tasks are ``(kind, payload)`` pairs with the kinds and payloads of
+``xhs_scraper.utils.work_queue.DEFAULT_HANDLERS``. Each task is routed to a
+shard by a stable hash of its key (user_id, note_id or keyword by
+default), so the same user or note always lands in the same process and
+per-key state such as checkpoints never races.
+
+Workers run their clients in "dict" result mode and send results in
+batches, each encoded once with the configured JSON codec and passed as
+raw bytes over a pipe, instead of pickling every object. Each worker's
+RequestMetrics is merged into ``crawler.metrics`` at the end.
+
+Every worker crawls with the same cookies, so ``rate_limit`` is the
+account's total rate: it is divided among the shards that run, and the
+example above sends at most 2 requests per second in all, not 2 per
+process. A ``rate_limiter`` is passed to every worker as is; use a
+RemoteRateLimiter so that the workers draw from one shared budget.
+"""
+
+import asyncio
+import logging
+import multiprocessing
+import os
+import pickle
+import zlib
+from dataclasses import dataclass
+from multiprocessing.connection import Connection, wait
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+from xhs_scraper.exceptions import CaptchaRequiredError, CookieExpiredError
+
+logger = logging.getLogger(__name__)
+
+TaskSpec = Tuple[str, Dict[str, Any]]
+
+SHARD_KEY_FIELDS = ("user_id", "note_id", "keyword")
+
+_BATCH = b"B"
+_DONE = b"D"
+
+
+def shard_for(key: str, shards: int) -> int:
+    """Stable shard index of a key (the same in every process and run)."""
+    return zlib.crc32(key.encode("utf-8")) % shards
+
+
+def default_shard_key(kind: str, payload: Mapping[str, Any]) -> str:
+    """The task's user_id, note_id or keyword, else its kind and payload."""
+    for name in SHARD_KEY_FIELDS:
+        value = payload.get(name)
+        if value:
+            return str(value)
+    return f"{kind}:{sorted(payload.items())!r}"
+
+
+@dataclass
+class ShardResult:
+    """Outcome of one task.
+
+    Attributes:
+        kind: Task kind
+        payload: Task payload
+        shard: Index of the process that ran it
+        data: Result as plain dicts, or None on error
+        error: ``"ExceptionType: message"`` if the task failed
+    """
+
+    kind: str
+    payload: Dict[str, Any]
+    shard: int
+    data: Any = None
+    error: Optional[str] = None
+
+
+@dataclass
+class ShardStats:
+    """Per-shard counters.
+
+    Attributes:
+        shard: Shard index
+        tasks: Tasks assigned
+        succeeded: Tasks that returned a result
+        failed: Tasks that raised
+        exit_code: Process exit code (None while running)
+    """
+
+    shard: int
+    tasks: int = 0
+    succeeded: int = 0
+    failed: int = 0
+    exit_code: Optional[int] = None
+
+
+class ShardedCrawler:
+    """Run crawl tasks across worker processes, one XHSClient each.
+
+    Args:
+        client_options: XHSClient keyword arguments (must be picklable;
+            ``metrics`` and ``result_mode`` are set by the crawler, and
+            ``rate_limit`` is split evenly across the running shards)
+        processes: Worker processes (defaults to the CPU count)
+        concurrency: Tasks in flight per process
+        handlers: Handlers by task kind, merged over DEFAULT_HANDLERS;
+            must be module-level functions so they can be pickled
+        shard_key: Function of (kind, payload) returning the routing key
+        client_factory: Picklable callable building the client from the
+            options (defaults to XHSClient)
+        codec: JSON codec name for result transfer ("auto" picks orjson
+            or msgspec when installed)
+        batch_size: Results per message to the parent
+    """
+
+    def __init__(
+        self,
+        client_options: Mapping[str, Any],
+        processes: Optional[int] = None,
+        concurrency: int = 4,
+        handlers: Optional[Dict[str, Callable]] = None,
+        shard_key: Callable[[str, Mapping[str, Any]], str] = default_shard_key,
+        client_factory: Optional[Callable[..., Any]] = None,
+        codec: str = "auto",
+        batch_size: int = 50,
+    ):
+        """Initialize crawler.
+
+        Raises:
+            ValueError: If processes, concurrency or batch_size is not positive
+        """
+        processes = processes if processes is not None else os.cpu_count() or 1
+        if processes <= 0 or concurrency <= 0 or batch_size <= 0:
+            raise ValueError("processes, concurrency and batch_size must be positive")
+        from xhs_scraper.utils.metrics import RequestMetrics
+
+        self.client_options = dict(client_options)
+        self.processes = processes
+        self.concurrency = concurrency
+        self.handlers = dict(handlers or {})
+        self.shard_key = shard_key
+        self.client_factory = client_factory
+        self.codec = codec
+        self.batch_size = batch_size
+        self.metrics = RequestMetrics()
+        self.stats: List[ShardStats] = []
+
+    def shard(self, tasks: Iterable[TaskSpec]) -> List[List[TaskSpec]]:
+        """Split tasks into one list per process by their shard key."""
+        shards: List[List[TaskSpec]] = [[] for _ in range(self.processes)]
+        for kind, payload in tasks:
+            key = self.shard_key(kind, payload)
+            shards[shard_for(key, self.processes)].append((kind, payload))
+        return shards
+
+    def run(self, tasks: Iterable[TaskSpec]) -> Iterator[ShardResult]:
+        """Run tasks and yield results as workers report them.
+
+        Results arrive in batches per shard, not in input order. Metrics and
+        stats are complete once the iterator is exhausted.
+
+        Raises:
+            RuntimeError: If a worker process dies without finishing
+        """
+        from xhs_scraper.utils.codec import get_codec
+
+        codec = get_codec(self.codec)
+        shards = self.shard(tasks)
+        self.stats = [ShardStats(index, len(part)) for index, part in enumerate(shards)]
+        options = self._worker_options(sum(1 for part in shards if part))
+        context = multiprocessing.get_context("spawn")
+
+        workers = {}
+        for index, part in enumerate(shards):
+            if not part:
+                self.stats[index].exit_code = 0
+                continue
+            receiver, sender = context.Pipe(duplex=False)
+            process = context.Process(
+                target=_shard_main,
+                args=(index, part, options, sender),
+                name=f"xhs-shard-{index}",
+                daemon=True,
+            )
+            process.start()
+            sender.close()
+            workers[receiver] = (index, process)
+
+        try:
+            while workers:
+                for conn in wait(list(workers)):
+                    index, process = workers[conn]
+                    try:
+                        message = conn.recv_bytes()
+                    except EOFError:
+                        process.join()
+                        del workers[conn]
+                        self.stats[index].exit_code = process.exitcode
+                        raise RuntimeError(
+                            f"shard {index} exited with code {process.exitcode} "
+                            "before finishing"
+                        )
+                    if message[:1] == _BATCH:
+                        for record in codec.loads(message[1:]):
+                            yield self._result(index, record)
+                    else:
+                        self.metrics.merge(pickle.loads(message[1:]))
+                        process.join()
+                        conn.close()
+                        del workers[conn]
+                        self.stats[index].exit_code = process.exitcode
+        finally:
+            for conn, (_, process) in workers.items():
+                process.terminate()
+                process.join()
+                conn.close()
+
+    def _worker_options(self, shards: int) -> Dict[str, Any]:
+        client_options = dict(self.client_options)
+        if client_options.get("rate_limit") is not None and shards:
+            # The shards share one account, so they share its rate too.
+            client_options["rate_limit"] /= shards
+        return {
+            "client_options": client_options,
+            "client_factory": self.client_factory,
+            "handlers": self.handlers,
+            "concurrency": self.concurrency,
+            "codec": self.codec,
+            "batch_size": self.batch_size,
+        }
+
+    def _result(self, index: int, record: Dict[str, Any]) -> ShardResult:
+        stats = self.stats[index]
+        if record.get("error") is None:
+            stats.succeeded += 1
+        else:
+            stats.failed += 1
+        return ShardResult(
+            kind=record["kind"],
+            payload=record["payload"],
+            shard=index,
+            data=record.get("data"),
+            error=record.get("error"),
+        )
+
+
+def _plain_result(result: Any) -> Any:
+    from xhs_scraper.utils.checkpoint import to_plain
+
+    if result is None or isinstance(result, (dict, list, str, int, float, bool)):
+        return result
+    items = getattr(result, "items", None)
+    if isinstance(items, list):
+        # Page containers built with model_construct() hold raw items.
+        return {
+            "items": [to_plain(item) for item in items],
+            "cursor": getattr(result, "cursor", None),
+            "has_more": getattr(result, "has_more", None),
+        }
+    return to_plain(result)
+
+
+def _shard_main(
+    index: int, tasks: Sequence[TaskSpec], options: Dict[str, Any], conn: Connection
+) -> None:
+    """Entry point of a worker process."""
+    try:
+        asyncio.run(_run_shard(tasks, options, conn))
+    finally:
+        conn.close()
+
+
+async def _run_shard(
+    tasks: Sequence[TaskSpec], options: Dict[str, Any], conn: Connection
+) -> None:
+    from xhs_scraper.client import XHSClient
+    from xhs_scraper.utils.codec import get_codec
+    from xhs_scraper.utils.metrics import RequestMetrics
+    from xhs_scraper.utils.work_queue import DEFAULT_HANDLERS
+
+    codec = get_codec(options["codec"])
+    handlers = {**DEFAULT_HANDLERS, **options["handlers"]}
+    metrics = RequestMetrics()
+    factory = options["client_factory"] or XHSClient
+    client = factory(**options["client_options"], metrics=metrics, result_mode="dict")
+
+    pending = iter(tasks)
+    batch: List[Dict[str, Any]] = []
+    fatal: Optional[str] = None
+
+    def flush() -> None:
+        if batch:
+            conn.send_bytes(_BATCH + codec.dumps(batch))
+            batch.clear()
+
+    def record(kind: str, payload: Dict[str, Any], **outcome: Any) -> None:
+        batch.append({"kind": kind, "payload": payload, **outcome})
+        if len(batch) >= options["batch_size"]:
+            flush()
+
+    async def consume() -> None:
+        nonlocal fatal
+        for kind, payload in pending:
+            if fatal is not None:
+                record(kind, payload, error=fatal)
+                continue
+            try:
+                handler = handlers[kind]
+                result = await handler(client, payload)
+            except (CookieExpiredError, CaptchaRequiredError) as exc:
+                # Every other task would fail the same way.
+                fatal = f"{type(exc).__name__}: {exc}"
+                record(kind, payload, error=fatal)
+            except Exception as exc:
+                record(kind, payload, error=f"{type(exc).__name__}: {exc}")
+            else:
+                record(kind, payload, data=_plain_result(result))
+
+    async with client:
+        await asyncio.gather(*(consume() for _ in range(options["concurrency"])))
+    flush()
+    conn.send_bytes(_DONE + pickle.dumps(metrics))
+
+
+__all__ = [
+    "ShardedCrawler",
+    "ShardResult",
+    "ShardStats",
+    "shard_for",
+    "default_shard_key",
+]
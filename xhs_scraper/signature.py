@@ -2,10 +2,45 @@
 
 This module provides a clean interface to the xhshow signing functionality,
 abstracting away the complexity of direct xhshow usage.
+
+xhshow is imported, and its client constructed, on the first signature, so
+importing this module (and XHSClient) stays cheap.
 """
 
-from typing import Protocol, Dict, Any, Optional
-from xhshow import Xhshow, SessionManager
+import asyncio
+import functools
+import multiprocessing
+import threading
+from collections import OrderedDict
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import TYPE_CHECKING, Protocol, Dict, Any, Optional, Tuple
+
+if TYPE_CHECKING:
+    from xhshow import Xhshow, SessionManager
+
+_EXECUTOR_KINDS = ("thread", "process")
+_XHSHOW_NAMES = ("Xhshow", "SessionManager")
+
+# Cookie sets whose x-s-common is kept; one per client sharing the provider.
+_XS_COMMON_CACHE_SIZE = 16
+
+
+def _load_xhshow() -> Tuple[Any, Any]:
+    """Import xhshow into the module namespace (once) and return its classes."""
+    namespace = globals()
+    if not all(name in namespace for name in _XHSHOW_NAMES):
+        import xhshow
+
+        for name in _XHSHOW_NAMES:
+            namespace.setdefault(name, getattr(xhshow, name))
+    return namespace["Xhshow"], namespace["SessionManager"]
+
+
+def __getattr__(name: str) -> Any:
+    if name in _XHSHOW_NAMES:
+        _load_xhshow()
+        return globals()[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 class SignatureProvider(Protocol):
@@ -67,12 +102,81 @@ class XHShowSignatureProvider:
 
     This class wraps the xhshow signing functionality and provides
     a clean, documented interface for generating signed headers.
+
+    The asign_get()/asign_post() coroutines run signing off the event loop
+    when an executor is configured:
+
+    - "thread": signing runs in a thread pool, keeping the event loop
+      responsive. Signing is pure Python, so calls are serialized on the
+      shared session and do not use more than one core.
+    - "process": signing runs in a process pool. Each worker process keeps
+      its own xhshow client and session, so signing scales across cores.
+
+    The x-s-common header depends only on the cookies, yet is the most
+    expensive part of signing. With ``cache_common`` enabled it is computed
+    once per distinct cookie set and reused until the cookies change, which
+    also keeps the browser fingerprint stable within a session.
+
+    Args:
+        executor: None (sign inline), "thread" or "process"
+        max_workers: Worker count for the executor (defaults to the
+            concurrent.futures default)
+        cache_common: Cache x-s-common per cookie set (default True)
     """
 
-    def __init__(self):
-        """Initialize the signature provider with xhshow client."""
-        self._client = Xhshow()
-        self._session = SessionManager()
+    def __init__(
+        self,
+        executor: Optional[str] = None,
+        max_workers: Optional[int] = None,
+        cache_common: bool = True,
+    ):
+        """Initialize the signature provider.
+
+        The xhshow client and session are created on first use.
+        """
+        if executor is not None and executor not in _EXECUTOR_KINDS:
+            raise ValueError("executor must be None, 'thread' or 'process'")
+        if max_workers is not None and max_workers <= 0:
+            raise ValueError("max_workers must be positive")
+
+        self._xhshow: Optional["Xhshow"] = None
+        self._xhshow_session: Optional["SessionManager"] = None
+        self._xs_common_cache: "OrderedDict[Tuple[Tuple[str, str], ...], str]" = (
+            OrderedDict()
+        )
+        self._cache_common = cache_common
+        self._executor_kind = executor
+        self._max_workers = max_workers
+        self._executor: Optional[Executor] = None
+        self._lock = threading.Lock()
+        self._init_lock = threading.Lock()
+
+    @property
+    def _client(self) -> "Xhshow":
+        if self._xhshow is None:
+            self._create_client()
+        return self._xhshow
+
+    @property
+    def _session(self) -> "SessionManager":
+        if self._xhshow_session is None:
+            self._create_client()
+        return self._xhshow_session
+
+    def _create_client(self) -> None:
+        with self._init_lock:
+            if self._xhshow is not None:
+                return
+            xhshow_cls, session_cls = _load_xhshow()
+            client = xhshow_cls()
+            if self._cache_common:
+                # Xhshow.sign_headers() calls self.sign_xs_common(), so
+                # shadowing it on the instance caches x-s-common without
+                # changing signatures.
+                self._uncached_sign_xs_common = client.sign_xs_common
+                client.sign_xs_common = self._cached_sign_xs_common
+            self._xhshow_session = session_cls()
+            self._xhshow = client
 
     def sign_get(
         self,
@@ -131,3 +235,129 @@ class XHShowSignatureProvider:
             session=self._session,
         )
         return headers
+
+    def _sign_xs_common(self, cookie_dict: Dict[str, Any]) -> str:
+        return self._uncached_sign_xs_common(cookie_dict)
+
+    def _cached_sign_xs_common(self, cookie_dict: Dict[str, Any]) -> str:
+        key = tuple(sorted((str(k), str(v)) for k, v in cookie_dict.items()))
+        value = self._xs_common_cache.get(key)
+        if value is None:
+            value = self._sign_xs_common(cookie_dict)
+            self._xs_common_cache[key] = value
+            if len(self._xs_common_cache) > _XS_COMMON_CACHE_SIZE:
+                self._xs_common_cache.popitem(last=False)
+        else:
+            self._xs_common_cache.move_to_end(key)
+        return value
+
+    def clear_cache(self) -> None:
+        """Drop cached cookie-derived signing state."""
+        self._xs_common_cache.clear()
+
+    async def asign_get(
+        self,
+        uri: str,
+        params: Optional[Dict[str, Any]] = None,
+        cookies: Optional[Dict[str, str]] = None,
+    ) -> Dict[str, str]:
+        """Generate signed headers for GET request on the configured executor.
+
+        Args:
+            uri: Target URI/endpoint path
+            params: Query parameters dictionary
+            cookies: Cookie dictionary for the session
+
+        Returns:
+            Dictionary containing signed headers required for the request.
+        """
+        return await self._sign_async("GET", uri, params, cookies)
+
+    async def asign_post(
+        self,
+        uri: str,
+        payload: Optional[Dict[str, Any]] = None,
+        cookies: Optional[Dict[str, str]] = None,
+    ) -> Dict[str, str]:
+        """Generate signed headers for POST request on the configured executor.
+
+        Args:
+            uri: Target URI/endpoint path
+            payload: Request body payload dictionary
+            cookies: Cookie dictionary for the session
+
+        Returns:
+            Dictionary containing signed headers required for the request.
+        """
+        return await self._sign_async("POST", uri, payload, cookies)
+
+    async def _sign_async(
+        self,
+        method: str,
+        uri: str,
+        data: Optional[Dict[str, Any]],
+        cookies: Optional[Dict[str, str]],
+    ) -> Dict[str, str]:
+        if self._executor_kind is None:
+            return self._sign_locked(method, uri, data, cookies)
+
+        loop = asyncio.get_running_loop()
+        if self._executor_kind == "process":
+            func = functools.partial(_sign_in_worker, method, uri, data, cookies)
+        else:
+            func = functools.partial(self._sign_locked, method, uri, data, cookies)
+        return await loop.run_in_executor(self._get_executor(), func)
+
+    def _sign_locked(
+        self,
+        method: str,
+        uri: str,
+        data: Optional[Dict[str, Any]],
+        cookies: Optional[Dict[str, str]],
+    ) -> Dict[str, str]:
+        # SessionManager counters are not thread-safe.
+        with self._lock:
+            if method == "GET":
+                return self.sign_get(uri, data, cookies)
+            return self.sign_post(uri, data, cookies)
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self._executor_kind == "process":
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self._max_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self._max_workers,
+                    thread_name_prefix="xhs-sign",
+                )
+        return self._executor
+
+    def shutdown(self) -> None:
+        """Shut down the signing executor, if one was started.
+
+        A new executor is started on the next asign_get()/asign_post() call.
+        """
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+_worker_provider: Optional[XHShowSignatureProvider] = None
+
+
+def _sign_in_worker(
+    method: str,
+    uri: str,
+    data: Optional[Dict[str, Any]],
+    cookies: Optional[Dict[str, str]],
+) -> Dict[str, str]:
+    """Sign a request inside a process pool worker."""
+    global _worker_provider
+    if _worker_provider is None:
+        _worker_provider = XHShowSignatureProvider()
+    if method == "GET":
+        return _worker_provider.sign_get(uri, data, cookies)
+    return _worker_provider.sign_post(uri, data, cookies)
@@ -0,0 +1,5 @@
+"""Test and benchmark helpers for XHS scraper."""
+
+from .fake_api import FakeXHSAPI, FakeXHSServer, fixed, lognormal, uniform
+
+__all__ = ["FakeXHSAPI", "FakeXHSServer", "fixed", "lognormal", "uniform"]
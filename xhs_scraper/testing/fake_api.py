@@ -0,0 +1,653 @@
+"""Local fake XHS API for load and chaos testing.
+
+FakeXHSAPI emulates the endpoints used by the scrapers in this package with
+deterministic synthetic data, configurable page counts, latency and injected
+error rates. Response shapes follow what the scrapers parse, and synthetic
+image files are served under /media/. It can be used in-process through an
+httpx transport, or served over HTTP on localhost:
+
+    api = FakeXHSAPI(latency=lognormal(0.05, 0.5), error_rates={429: 0.01})
+
+    async with XHSClient(cookies=cookies, transport=api.transport()) as client:
+        ...
+
+    with FakeXHSServer(api) as server:
+        async with XHSClient(cookies=cookies, base_url=server.url) as client:
+            ...
+
+Run standalone with ``python -m xhs_scraper.testing.fake_api --port 8080``.
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import math
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple
+from urllib.parse import parse_qsl, urlsplit
+
+import httpx
+
+LatencySampler = Callable[[random.Random], float]
+
+# Fixed epoch for synthetic note ids: 2025-01-01T00:00:00Z.
+_EPOCH = 1735689600
+
+_ERROR_MESSAGES = {
+    401: "Login expired",
+    403: "Forbidden",
+    429: "Too many requests",
+    461: "Signature verification failed",
+    471: "Captcha required",
+    500: "Internal server error",
+    502: "Bad gateway",
+    503: "Service unavailable",
+    504: "Gateway timeout",
+}
+
+
+def fixed(seconds: float) -> LatencySampler:
+    """Latency sampler returning a constant delay."""
+    return lambda rng: seconds
+
+
+def uniform(low: float, high: float) -> LatencySampler:
+    """Latency sampler drawing uniformly from [low, high]."""
+    return lambda rng: rng.uniform(low, high)
+
+
+def lognormal(median: float, sigma: float) -> LatencySampler:
+    """Latency sampler with a log-normal distribution (long upper tail)."""
+    mu = math.log(median)
+    return lambda rng: rng.lognormvariate(mu, sigma)
+
+
+def _rng(*parts: Any) -> random.Random:
+    digest = hashlib.blake2b(":".join(map(str, parts)).encode(), digest_size=8)
+    return random.Random(int.from_bytes(digest.digest(), "big"))
+
+
+def _object_id(rng: random.Random, timestamp: int) -> str:
+    """24-hex ObjectId-style id with a leading timestamp, like XHS ids."""
+    return f"{timestamp:08x}{rng.getrandbits(64):016x}"
+
+
+class FakeXHSAPI:
+    """Synthetic, deterministic emulation of the XHS web API.
+
+    Args:
+        seed: Seed for all generated data
+        notes_per_user: Notes posted by every synthetic user
+        user_page_size: Maximum notes per user_posted page
+        sticky_notes: Oldest notes of each user pinned (sticky) to the top
+            of their user_posted listing
+        comment_pages: Pages of top-level comments per note
+        comments_per_page: Comments per comment page
+        sub_comment_pages: Pages of replies per root comment
+        search_pages: Result pages available per keyword
+        latency: Latency sampler, e.g. fixed(), uniform() or lognormal()
+        error_rates: Probability of answering with each HTTP status instead
+            of data, e.g. {429: 0.01, 461: 0.001, 503: 0.02}
+        require_signature: Answer 461 when the x-s header is missing
+        media_bytes: Size of every synthetic image served under /media/
+        media_base_url: Prefix of image URLs in note cards; point it at
+            f"{server.url}/media" to download media from FakeXHSServer
+    """
+
+    def __init__(
+        self,
+        *,
+        seed: int = 0,
+        notes_per_user: int = 90,
+        user_page_size: int = 30,
+        sticky_notes: int = 0,
+        comment_pages: int = 3,
+        comments_per_page: int = 20,
+        sub_comment_pages: int = 1,
+        search_pages: int = 5,
+        latency: Optional[LatencySampler] = None,
+        error_rates: Optional[Mapping[int, float]] = None,
+        require_signature: bool = False,
+        media_bytes: int = 65536,
+        media_base_url: str = "https://sns-img.example/media",
+    ):
+        """Initialize fake API."""
+        rates = dict(error_rates or {})
+        if any(rate < 0 for rate in rates.values()) or sum(rates.values()) > 1:
+            raise ValueError("error_rates must be non-negative and sum to at most 1")
+
+        self.seed = seed
+        self.notes_per_user = notes_per_user
+        self.user_page_size = user_page_size
+        self.sticky_notes = sticky_notes
+        self.comment_pages = comment_pages
+        self.comments_per_page = comments_per_page
+        self.sub_comment_pages = sub_comment_pages
+        self.search_pages = search_pages
+        self.latency = latency
+        self.error_rates = rates
+        self.require_signature = require_signature
+        self.media_bytes = media_bytes
+        self.media_base_url = media_base_url
+
+        self.requests_total = 0
+        self.requests_by_path: Dict[str, int] = {}
+        self.errors_by_status: Dict[int, int] = {}
+        self._published: Dict[str, List[str]] = {}
+        self._search_published: Dict[str, List[str]] = {}
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._routes: Dict[Tuple[str, str], Callable[..., Dict[str, Any]]] = {
+            ("POST", "/api/sns/web/v1/feed"): self._feed,
+            ("GET", "/api/sns/web/v1/user_posted"): self._user_posted,
+            ("POST", "/api/sns/web/v1/search/notes"): self._search_notes,
+            ("GET", "/api/sns/web/v2/comment/page"): self._comment_page,
+            ("POST", "/api/sns/web/v2/comment/sub/page"): self._sub_comment_page,
+            ("GET", "/api/sns/web/v1/user/otherinfo"): self._user_info,
+            ("GET", "/api/sns/web/v1/user/selfinfo"): self._self_info,
+        }
+
+    def publish(self, user_id: str, count: int = 1) -> List[str]:
+        """Post ``count`` new notes for a user, newer than all existing ones.
+
+        Returns:
+            The new note ids, newest first
+        """
+        with self._lock:
+            published = self._published.setdefault(user_id, [])
+            rng = _rng(self.seed, "publish", user_id, len(published))
+            new_ids = []
+            for _ in range(count):
+                timestamp = _EPOCH + 86400 * 31 + 3600 * len(published)
+                published.insert(0, _object_id(rng, timestamp))
+                new_ids.insert(0, published[0])
+            return new_ids
+
+    def publish_search(self, keyword: str, count: int = 1) -> List[str]:
+        """Add ``count`` new notes at the top of a keyword's search results.
+
+        Returns:
+            The new note ids, newest first
+        """
+        with self._lock:
+            published = self._search_published.setdefault(keyword, [])
+            rng = _rng(self.seed, "publish_search", keyword, len(published))
+            new_ids = []
+            for _ in range(count):
+                timestamp = _EPOCH + 60 * (len(published) + 1)
+                published.insert(0, _object_id(rng, timestamp))
+                new_ids.insert(0, published[0])
+            return new_ids
+
+    # ------------------------------------------------------------------
+    # Request handling
+    # ------------------------------------------------------------------
+
+    def sample_latency(self) -> float:
+        """Draw a response delay in seconds."""
+        if self.latency is None:
+            return 0.0
+        with self._lock:
+            return max(0.0, self.latency(self._rng))
+
+    def handle(
+        self,
+        method: str,
+        path: str,
+        query: Mapping[str, str],
+        body: Optional[Mapping[str, Any]],
+        headers: Optional[Mapping[str, str]] = None,
+    ) -> Tuple[int, Dict[str, Any]]:
+        """Answer one request.
+
+        Args:
+            method: HTTP method
+            path: URL path
+            query: Query parameters
+            body: Decoded JSON body (POST)
+            headers: Request headers (lower-case names)
+
+        Returns:
+            (status code, JSON payload)
+        """
+        method = method.upper()
+        with self._lock:
+            self.requests_total += 1
+            self.requests_by_path[path] = self.requests_by_path.get(path, 0) + 1
+            roll = self._rng.random()
+
+        if method == "HEAD" or path == "/":
+            return 200, {}
+
+        route = self._routes.get((method, path))
+        if route is None:
+            return 404, {"success": False, "msg": f"Unknown endpoint {method} {path}"}
+
+        if self.require_signature and not (headers or {}).get("x-s"):
+            return self._error(461)
+
+        threshold = 0.0
+        for status, rate in self.error_rates.items():
+            threshold += rate
+            if roll < threshold:
+                return self._error(status)
+
+        params = dict(query)
+        params.update(body or {})
+        return 200, route(params)
+
+    def _error(self, status: int) -> Tuple[int, Dict[str, Any]]:
+        with self._lock:
+            self.errors_by_status[status] = self.errors_by_status.get(status, 0) + 1
+        message = _ERROR_MESSAGES.get(status, "Injected error")
+        return status, {"success": False, "code": status, "msg": message}
+
+    def media(self, path: str) -> bytes:
+        """Synthetic, deterministic file content for a /media/ path."""
+        with self._lock:
+            self.requests_total += 1
+            self.requests_by_path["/media"] = self.requests_by_path.get("/media", 0) + 1
+        block = hashlib.blake2b(path.encode(), digest_size=64).digest()
+        return (block * (self.media_bytes // len(block) + 1))[: self.media_bytes]
+
+    def transport(self) -> httpx.MockTransport:
+        """Build an in-process httpx transport backed by this fake API."""
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            delay = self.sample_latency()
+            if delay:
+                await asyncio.sleep(delay)
+            if request.url.path.startswith("/media/"):
+                return httpx.Response(
+                    200,
+                    content=self.media(request.url.path),
+                    headers={"content-type": "image/jpeg"},
+                    request=request,
+                )
+            body = json.loads(request.content) if request.content else None
+            status, payload = self.handle(
+                request.method,
+                request.url.path,
+                dict(request.url.params),
+                body,
+                request.headers,
+            )
+            return httpx.Response(status, json=payload, request=request)
+
+        return httpx.MockTransport(handler)
+
+    # ------------------------------------------------------------------
+    # Synthetic data
+    # ------------------------------------------------------------------
+
+    def _user(self, user_id: str) -> Dict[str, Any]:
+        rng = _rng(self.seed, "user", user_id)
+        return {
+            "user_id": user_id,
+            "nickname": f"user_{user_id[-6:]}",
+            "avatar": f"https://sns-avatar.example/{user_id}.jpg",
+            "followers": rng.randint(0, 500000),
+            "following": rng.randint(0, 2000),
+        }
+
+    def _user_note_ids(self, user_id: str) -> List[str]:
+        """Note ids posted by a user, newest first (sticky notes on top)."""
+        rng = _rng(self.seed, "user_notes", user_id)
+        timestamp = _EPOCH + rng.randint(0, 86400 * 30)
+        ids = list(self._published.get(user_id, ()))
+        for _ in range(self.notes_per_user):
+            ids.append(_object_id(rng, timestamp))
+            timestamp -= rng.randint(600, 86400 * 3)
+        if self.sticky_notes:
+            sticky = ids[-self.sticky_notes :]
+            ids = sticky + ids[: -self.sticky_notes]
+        return ids
+
+    def _note_card(self, note_id: str, user_id: Optional[str] = None) -> Dict[str, Any]:
+        rng = _rng(self.seed, "note", note_id)
+        if user_id is None:
+            user_id = _object_id(rng, _EPOCH - rng.randint(0, 86400 * 365))
+        user = self._user(user_id)
+        image_count = rng.randint(1, 9)
+        return {
+            "note_id": note_id,
+            "type": "normal",
+            "title": f"note {note_id[-6:]}",
+            "display_title": f"note {note_id[-6:]}",
+            "desc": "synthetic note " * rng.randint(1, 20),
+            "user": {k: user[k] for k in ("user_id", "nickname", "avatar")},
+            "images": [
+                f"{self.media_base_url}/{note_id}/{i}.jpg" for i in range(image_count)
+            ],
+            "interact_info": {
+                "liked_count": str(rng.randint(0, 100000)),
+                "comment_count": str(rng.randint(0, 5000)),
+                "shared_count": str(rng.randint(0, 2000)),
+            },
+            "time": int(note_id[:8], 16) * 1000,
+            "xsec_token": f"AB{note_id[-10:]}",
+        }
+
+    def _feed(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        note_id = str(params.get("note_id", ""))
+        return {
+            "success": True,
+            "data": {"items": [{"id": note_id, "note_card": self._note_card(note_id)}]},
+        }
+
+    def _user_posted(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        user_id = str(params.get("user_id", ""))
+        cursor = str(params.get("cursor", ""))
+        num = min(int(params.get("num", self.user_page_size)), self.user_page_size)
+
+        ids = self._user_note_ids(user_id)
+        start = ids.index(cursor) + 1 if cursor in ids else 0
+        page = ids[start : start + num]
+        has_more = start + num < len(ids)
+
+        sticky = set(ids[: self.sticky_notes])
+        notes = []
+        for note_id in page:
+            card = self._note_card(note_id, user_id)
+            notes.append(
+                {
+                    "note_id": note_id,
+                    "display_title": card["display_title"],
+                    "type": card["type"],
+                    "user": card["user"],
+                    "interact_info": {
+                        "liked_count": card["interact_info"]["liked_count"],
+                        "sticky": note_id in sticky,
+                    },
+                    "xsec_token": card["xsec_token"],
+                }
+            )
+
+        return {
+            "success": True,
+            "data": {
+                "notes": notes,
+                "cursor": page[-1] if page else "",
+                "has_more": has_more,
+            },
+        }
+
+    def _search_notes(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        keyword = str(params.get("keyword", ""))
+        page = int(params.get("page", 1))
+        page_size = min(int(params.get("page_size", 20)), 20)
+
+        # Results are newest first: notes published with publish_search(),
+        # then search_pages pages of 20 generated notes.
+        published = self._search_published.get(keyword, [])
+        total = len(published) + self.search_pages * 20
+        start = (page - 1) * page_size
+        generated: Dict[int, List[str]] = {}
+
+        items = []
+        for index in range(max(start, 0), min(start + page_size, total)):
+            if index < len(published):
+                note_id = published[index]
+            else:
+                base_page, offset = divmod(index - len(published), 20)
+                if base_page not in generated:
+                    generated[base_page] = self._search_page_ids(keyword, base_page + 1)
+                note_id = generated[base_page][offset]
+            card = self._note_card(note_id)
+            items.append(
+                {
+                    "id": note_id,
+                    "model_type": "note",
+                    "xsec_token": card["xsec_token"],
+                    "note_card": {
+                        "display_title": card["display_title"],
+                        "type": card["type"],
+                        "user": card["user"],
+                        "interact_info": card["interact_info"],
+                    },
+                }
+            )
+
+        return {
+            "success": True,
+            "data": {"items": items, "has_more": start + page_size < total},
+        }
+
+    def _search_page_ids(self, keyword: str, page: int) -> List[str]:
+        rng = _rng(self.seed, "search", keyword, page)
+        timestamp = _EPOCH - (page - 1) * 86400
+        ids = []
+        for _ in range(20):
+            timestamp -= rng.randint(60, 7200)
+            ids.append(_object_id(rng, timestamp))
+        return ids
+
+    def _comments(
+        self, note_id: str, scope: str, page: int, count: int
+    ) -> List[Dict[str, Any]]:
+        rng = _rng(self.seed, scope, note_id, page)
+        comments = []
+        for _ in range(count):
+            create_time = _EPOCH * 1000 + rng.randint(0, 86400000 * 30)
+            user_id = _object_id(rng, create_time // 1000)
+            user = self._user(user_id)
+            comments.append(
+                {
+                    "comment_id": _object_id(rng, create_time // 1000),
+                    "content": "synthetic comment " * rng.randint(1, 5),
+                    "user": {k: user[k] for k in ("user_id", "nickname", "avatar")},
+                    "create_time": create_time,
+                    "sub_comments": [],
+                }
+            )
+        return comments
+
+    def _comment_page(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        note_id = str(params.get("note_id", ""))
+        page = _page_from_cursor(params.get("cursor", ""))
+        has_more = page + 1 < self.comment_pages
+        return {
+            "success": True,
+            "items": self._comments(note_id, "comments", page, self.comments_per_page),
+            "cursor": f"page-{page + 1}" if has_more else "",
+            "has_more": has_more,
+        }
+
+    def _sub_comment_page(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        scope = f"{params.get('note_id', '')}:{params.get('root_comment_id', '')}"
+        page = _page_from_cursor(params.get("cursor", ""))
+        has_more = page + 1 < self.sub_comment_pages
+        return {
+            "success": True,
+            "items": self._comments(scope, "replies", page, self.comments_per_page),
+            "cursor": f"page-{page + 1}" if has_more else "",
+            "has_more": has_more,
+        }
+
+    def _user_info(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        user = self._user(str(params.get("target_user_id", "")))
+        return {
+            "success": True,
+            "data": {
+                "basic_info": {
+                    "red_id": user["user_id"],
+                    "nickname": user["nickname"],
+                    "images": user["avatar"],
+                    "desc": "synthetic user",
+                },
+                "interactions": [
+                    {"type": "follows", "count": str(user["following"])},
+                    {"type": "fans", "count": str(user["followers"])},
+                ],
+            },
+        }
+
+    def _self_info(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        return self._user_info({"target_user_id": "0" * 24})
+
+
+def _page_from_cursor(cursor: Any) -> int:
+    cursor = str(cursor or "")
+    if cursor.startswith("page-"):
+        try:
+            return int(cursor[5:])
+        except ValueError:
+            return 0
+    return 0
+
+
+class FakeXHSServer:
+    """Serve a FakeXHSAPI over HTTP on localhost in a background thread.
+
+    Args:
+        api: Fake API to serve (defaults to FakeXHSAPI())
+        host: Interface to bind
+        port: Port to bind (0 picks a free port)
+    """
+
+    def __init__(
+        self, api: Optional[FakeXHSAPI] = None, host: str = "127.0.0.1", port: int = 0
+    ):
+        """Initialize server (not yet listening)."""
+        self.api = api or FakeXHSAPI()
+        self._address = (host, port)
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        """Base URL of the running server."""
+        if self._server is None:
+            raise RuntimeError("FakeXHSServer is not running")
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "FakeXHSServer":
+        """Start listening in a daemon thread."""
+        api = self.api
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Headers and body go out in separate writes; avoid the ~40ms
+            # Nagle/delayed-ACK stall on every keep-alive response.
+            disable_nagle_algorithm = True
+
+            def _respond(self) -> None:
+                parts = urlsplit(self.path)
+                length = int(self.headers.get("content-length") or 0)
+                raw = self.rfile.read(length) if length else b""
+                try:
+                    body = json.loads(raw) if raw else None
+                except ValueError:
+                    body = None
+
+                delay = api.sample_latency()
+                if delay:
+                    time.sleep(delay)
+
+                if parts.path.startswith("/media/"):
+                    self._send(200, api.media(parts.path), "image/jpeg")
+                    return
+
+                status, payload = api.handle(
+                    self.command,
+                    parts.path,
+                    dict(parse_qsl(parts.query, keep_blank_values=True)),
+                    body,
+                    {k.lower(): v for k, v in self.headers.items()},
+                )
+                data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+                self._send(status, data, "application/json;charset=UTF-8")
+
+            def _send(self, status: int, data: bytes, content_type: str) -> None:
+                self.send_response(status)
+                self.send_header("content-type", content_type)
+                self.send_header("content-length", str(len(data)))
+                self.end_headers()
+                if self.command != "HEAD":
+                    self.wfile.write(data)
+
+            do_GET = do_POST = do_HEAD = _respond
+
+            def log_message(self, format: str, *args: Any) -> None:
+                pass
+
+        self._server = ThreadingHTTPServer(self._address, Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name="fake-xhs-api", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop the server and wait for its thread."""
+        if self._server is None:
+            return
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
+        self._server = None
+        self._thread = None
+
+    def __enter__(self) -> "FakeXHSServer":
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.stop()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run a local fake XHS API server.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--notes-per-user", type=int, default=90)
+    parser.add_argument("--comment-pages", type=int, default=3)
+    parser.add_argument("--search-pages", type=int, default=5)
+    parser.add_argument(
+        "--latency-median", type=float, default=0.0, help="log-normal median seconds"
+    )
+    parser.add_argument("--latency-sigma", type=float, default=0.5)
+    parser.add_argument(
+        "--error",
+        action="append",
+        default=[],
+        metavar="STATUS=RATE",
+        help="inject an error rate, e.g. --error 429=0.01 (repeatable)",
+    )
+    args = parser.parse_args()
+
+    error_rates = {}
+    for spec in args.error:
+        status, rate = spec.split("=", 1)
+        error_rates[int(status)] = float(rate)
+
+    api = FakeXHSAPI(
+        seed=args.seed,
+        notes_per_user=args.notes_per_user,
+        comment_pages=args.comment_pages,
+        search_pages=args.search_pages,
+        latency=(
+            lognormal(args.latency_median, args.latency_sigma)
+            if args.latency_median > 0
+            else None
+        ),
+        error_rates=error_rates,
+    )
+    server = FakeXHSServer(api, host=args.host, port=args.port).start()
+    print(f"Fake XHS API listening on {server.url}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
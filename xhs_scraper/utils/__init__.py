@@ -1,4 +1,29 @@
-from .export import export_to_json, export_to_csv
-from .media import download_media
+# Loaded lazily (PEP 562) so importing one utility module, e.g.
+# xhs_scraper.utils.rate_limiter, does not import httpx and pydantic too.
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .export import export_to_json, export_to_csv
+    from .media import download_media
+
+_LAZY_ATTRIBUTES = {
+    "export_to_json": ".export",
+    "export_to_csv": ".export",
+    "download_media": ".media",
+}
 
 __all__ = ["export_to_json", "export_to_csv", "download_media"]
+
+
+def __getattr__(name: str) -> Any:
+    module = _LAZY_ATTRIBUTES.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list:
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,323 @@
+"""Crash-safe checkpoints for cursor-paginated crawls.
+
+A checkpoint store persists, after every page, a pagination stream's last
+cursor, the ids (or cursors) it has already seen and the items collected so
+far. Scrapers that take ``resume_from=key`` save their progress under that
+key and, when a checkpoint for it already exists, continue from where the
+previous run stopped instead of starting again at cursor "":
+
+    store = SQLiteCheckpointStore("crawl.db")
+    async with XHSClient(cookies=cookies, checkpoint_store=store) as client:
+        notes = await client.notes.get_user_notes(user_id, resume_from=user_id)
+
+Completed streams keep their checkpoint (marked done), so repeating the call
+returns the saved result without requests; delete() the key to crawl again.
+
+Two stores are provided:
+
+- JSONCheckpointStore: one JSON file per key, rewritten atomically. Simple
+  to inspect; suited to short streams.
+- SQLiteCheckpointStore: one database, appending each page's items and ids
+  in a single transaction. Suited to long account and comment crawls.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Protocol, Union
+
+
+@dataclass
+class Checkpoint:
+    """Saved progress of one pagination stream.
+
+    Attributes:
+        key: Checkpoint key passed as ``resume_from``
+        stream: Identity of the stream (endpoint and target), used to
+            refuse resuming a key with a different crawl
+        cursor: Cursor of the next page to fetch
+        seen: Note ids or cursors already seen
+        items: Items collected so far, as plain dicts
+        pages: Pages fetched so far
+        done: Whether the stream was exhausted
+        updated_at: Unix time of the last save
+    """
+
+    key: str
+    stream: str
+    cursor: str = ""
+    seen: List[str] = field(default_factory=list)
+    items: List[Dict[str, Any]] = field(default_factory=list)
+    pages: int = 0
+    done: bool = False
+    updated_at: float = 0.0
+
+
+def to_plain(item: Any) -> Dict[str, Any]:
+    """Convert a scraped result (model, dict or record) to a plain dict."""
+    if isinstance(item, dict):
+        return item
+    if hasattr(item, "model_dump"):
+        return item.model_dump()
+    return item.to_dict()
+
+
+class CheckpointStore(Protocol):
+    """Protocol defining the checkpoint store interface.
+
+    JSONCheckpointStore and SQLiteCheckpointStore implement it; any object
+    with these methods can be passed as ``XHSClient(checkpoint_store=...)``.
+    """
+
+    def load(self, key: str) -> Optional[Checkpoint]:
+        """Return the checkpoint saved under ``key``, or None."""
+        ...
+
+    def save_page(
+        self,
+        key: str,
+        stream: str,
+        *,
+        cursor: str,
+        items: Iterable[Dict[str, Any]],
+        seen: Iterable[str],
+        done: bool = False,
+    ) -> None:
+        """Atomically record one fetched page.
+
+        Args:
+            key: Checkpoint key
+            stream: Stream identity
+            cursor: Cursor of the next page
+            items: New items from this page, as plain dicts
+            seen: Ids or cursors first seen on this page
+            done: Whether the stream is exhausted
+        """
+        ...
+
+    def delete(self, key: str) -> None:
+        """Remove the checkpoint saved under ``key`` (no error if missing)."""
+        ...
+
+    def keys(self) -> List[str]:
+        """Return all saved checkpoint keys."""
+        ...
+
+
+def load_for_stream(
+    store: Optional[CheckpointStore], key: str, stream: str
+) -> Optional[Checkpoint]:
+    """Load a checkpoint and check it belongs to ``stream``.
+
+    Raises:
+        ValueError: If no store is configured, or the key holds a
+            checkpoint of a different stream
+    """
+    if store is None:
+        raise ValueError("resume_from requires XHSClient(checkpoint_store=...)")
+    checkpoint = store.load(key)
+    if checkpoint is not None and checkpoint.stream != stream:
+        raise ValueError(
+            f"checkpoint {key!r} belongs to {checkpoint.stream!r}, not {stream!r}"
+        )
+    return checkpoint
+
+
+class JSONCheckpointStore:
+    """Checkpoints as one JSON file per key in a directory.
+
+    Each save rewrites the key's file through a temporary file and
+    os.replace(), so a crash leaves either the previous or the new page.
+
+    Args:
+        directory: Directory holding the checkpoint files (created if needed)
+    """
+
+    def __init__(self, directory: Union[str, Path]):
+        """Initialize store."""
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, key: str) -> Path:
+        # The readable part alone is ambiguous ("a/b" and "a_b"); the digest
+        # of the exact key keeps every key in its own file.
+        safe = "".join(c if c.isalnum() or c in "-_." else "_" for c in key)
+        digest = hashlib.sha256(key.encode("utf-8")).hexdigest()[:16]
+        return self.directory / f"{safe[:64]}-{digest}.json"
+
+    def load(self, key: str) -> Optional[Checkpoint]:
+        try:
+            data = json.loads(self._path(key).read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return None
+        if data.get("key") != key:
+            return None
+        return Checkpoint(**data)
+
+    def save_page(
+        self,
+        key: str,
+        stream: str,
+        *,
+        cursor: str,
+        items: Iterable[Dict[str, Any]],
+        seen: Iterable[str],
+        done: bool = False,
+    ) -> None:
+        checkpoint = self.load(key) or Checkpoint(key=key, stream=stream)
+        checkpoint.stream = stream
+        checkpoint.cursor = cursor
+        checkpoint.items.extend(items)
+        checkpoint.seen.extend(seen)
+        checkpoint.pages += 1
+        checkpoint.done = done
+        checkpoint.updated_at = time.time()
+
+        path = self._path(key)
+        tmp = path.with_suffix(".json.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(checkpoint.__dict__, f, ensure_ascii=False)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+
+    def delete(self, key: str) -> None:
+        self._path(key).unlink(missing_ok=True)
+
+    def keys(self) -> List[str]:
+        keys = []
+        for path in sorted(self.directory.glob("*.json")):
+            try:
+                keys.append(json.loads(path.read_text(encoding="utf-8"))["key"])
+            except (ValueError, KeyError):
+                continue
+        return keys
+
+
+class SQLiteCheckpointStore:
+    """Checkpoints in a SQLite database.
+
+    Pages are appended in one transaction each, so saving stays cheap as a
+    stream grows. The database runs in WAL mode; the connection may be used
+    from several threads.
+
+    Args:
+        path: Database file path (":memory:" for a temporary store)
+    """
+
+    _SCHEMA = """
+        CREATE TABLE IF NOT EXISTS checkpoints (
+            key TEXT PRIMARY KEY,
+            stream TEXT NOT NULL,
+            cursor TEXT NOT NULL,
+            pages INTEGER NOT NULL,
+            done INTEGER NOT NULL,
+            updated_at REAL NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS checkpoint_items (
+            key TEXT NOT NULL,
+            seq INTEGER NOT NULL,
+            data TEXT NOT NULL,
+            PRIMARY KEY (key, seq)
+        );
+        CREATE TABLE IF NOT EXISTS checkpoint_seen (
+            key TEXT NOT NULL,
+            value TEXT NOT NULL,
+            PRIMARY KEY (key, value)
+        );
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        """Initialize store, creating the schema if needed."""
+        self.path = str(path)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(self._SCHEMA)
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self._conn.close()
+
+    def load(self, key: str) -> Optional[Checkpoint]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT stream, cursor, pages, done, updated_at "
+                "FROM checkpoints WHERE key = ?",
+                (key,),
+            ).fetchone()
+            if row is None:
+                return None
+            items = self._conn.execute(
+                "SELECT data FROM checkpoint_items WHERE key = ? ORDER BY seq",
+                (key,),
+            ).fetchall()
+            seen = self._conn.execute(
+                "SELECT value FROM checkpoint_seen WHERE key = ? ORDER BY rowid",
+                (key,),
+            ).fetchall()
+        stream, cursor, pages, done, updated_at = row
+        return Checkpoint(
+            key=key,
+            stream=stream,
+            cursor=cursor,
+            seen=[value for (value,) in seen],
+            items=[json.loads(data) for (data,) in items],
+            pages=pages,
+            done=bool(done),
+            updated_at=updated_at,
+        )
+
+    def save_page(
+        self,
+        key: str,
+        stream: str,
+        *,
+        cursor: str,
+        items: Iterable[Dict[str, Any]],
+        seen: Iterable[str],
+        done: bool = False,
+    ) -> None:
+        with self._lock, self._conn:
+            (start,) = self._conn.execute(
+                "SELECT COALESCE(MAX(seq) + 1, 0) FROM checkpoint_items WHERE key = ?",
+                (key,),
+            ).fetchone()
+            self._conn.executemany(
+                "INSERT INTO checkpoint_items (key, seq, data) VALUES (?, ?, ?)",
+                (
+                    (key, seq, json.dumps(item, ensure_ascii=False))
+                    for seq, item in enumerate(items, start)
+                ),
+            )
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO checkpoint_seen (key, value) VALUES (?, ?)",
+                ((key, value) for value in seen),
+            )
+            self._conn.execute(
+                "INSERT INTO checkpoints (key, stream, cursor, pages, done, updated_at) "
+                "VALUES (?, ?, ?, 1, ?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET stream = excluded.stream, "
+                "cursor = excluded.cursor, pages = pages + 1, "
+                "done = excluded.done, updated_at = excluded.updated_at",
+                (key, stream, cursor, int(done), time.time()),
+            )
+
+    def delete(self, key: str) -> None:
+        with self._lock, self._conn:
+            for table in ("checkpoints", "checkpoint_items", "checkpoint_seen"):
+                self._conn.execute(f"DELETE FROM {table} WHERE key = ?", (key,))
+
+    def keys(self) -> List[str]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT key FROM checkpoints ORDER BY key"
+            ).fetchall()
+        return [key for (key,) in rows]
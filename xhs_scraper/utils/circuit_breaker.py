@@ -0,0 +1,200 @@
+"""Per-endpoint circuit breaker for XHS scraper."""
+
+import time
+from collections import deque
+from typing import Deque, Dict, Optional
+
+from ..exceptions import CircuitOpenError
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class _CircuitState:
+    """Failure window and state for a single endpoint."""
+
+    def __init__(self, window_size: int):
+        self.state = CLOSED
+        self.outcomes: Deque[bool] = deque(maxlen=window_size)
+        self.opened_at = 0.0
+        self.probes_in_flight = 0
+        self.probe_successes = 0
+
+
+class CircuitBreaker:
+    """Circuit breaker tracking failure rates per endpoint key.
+
+    Each key (normally a normalized API path) moves between three states:
+
+    - closed: calls pass through; outcomes are recorded in a sliding window.
+      Once the window holds at least ``min_calls`` outcomes and the failure
+      rate reaches ``failure_rate_threshold`` the circuit opens.
+    - open: calls fail fast with CircuitOpenError until ``recovery_timeout``
+      seconds have elapsed.
+    - half-open: up to ``half_open_max_calls`` probe calls are let through.
+      If all of them succeed the circuit closes again; any failure re-opens it.
+
+    Args:
+        failure_rate_threshold: Failure fraction (0-1] that opens the circuit
+        window_size: Number of recent outcomes kept per endpoint
+        min_calls: Minimum outcomes in the window before the rate is evaluated
+        recovery_timeout: Seconds to stay open before probing for recovery
+        half_open_max_calls: Concurrent probe calls allowed while half-open
+    """
+
+    def __init__(
+        self,
+        failure_rate_threshold: float = 0.5,
+        window_size: int = 20,
+        min_calls: int = 10,
+        recovery_timeout: float = 30.0,
+        half_open_max_calls: int = 1,
+    ):
+        """Initialize circuit breaker.
+
+        Raises:
+            ValueError: If any threshold is out of range
+        """
+        if not 0 < failure_rate_threshold <= 1:
+            raise ValueError("failure_rate_threshold must be in (0, 1]")
+        if window_size <= 0:
+            raise ValueError("window_size must be positive")
+        if not 0 < min_calls <= window_size:
+            raise ValueError("min_calls must be between 1 and window_size")
+        if recovery_timeout < 0:
+            raise ValueError("recovery_timeout must be non-negative")
+        if half_open_max_calls <= 0:
+            raise ValueError("half_open_max_calls must be positive")
+
+        self.failure_rate_threshold = failure_rate_threshold
+        self.window_size = window_size
+        self.min_calls = min_calls
+        self.recovery_timeout = recovery_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self._circuits: Dict[str, _CircuitState] = {}
+
+    def _get(self, key: str) -> _CircuitState:
+        circuit = self._circuits.get(key)
+        if circuit is None:
+            circuit = _CircuitState(self.window_size)
+            self._circuits[key] = circuit
+        return circuit
+
+    def state(self, key: str) -> str:
+        """Get the current state of an endpoint's circuit.
+
+        Args:
+            key: Endpoint key
+
+        Returns:
+            One of "closed", "open" or "half_open"
+        """
+        circuit = self._circuits.get(key)
+        if circuit is None:
+            return CLOSED
+        if circuit.state == OPEN and self._recovery_due(circuit):
+            return HALF_OPEN
+        return circuit.state
+
+    def _recovery_due(self, circuit: _CircuitState) -> bool:
+        return time.monotonic() - circuit.opened_at >= self.recovery_timeout
+
+    def before_call(self, key: str) -> None:
+        """Check whether a call to ``key`` may proceed.
+
+        Must be paired with exactly one record_success(), record_failure()
+        or release() call when it does not raise.
+
+        Args:
+            key: Endpoint key
+
+        Raises:
+            CircuitOpenError: If the circuit is open, or half-open with all
+                probe slots taken
+        """
+        circuit = self._get(key)
+
+        if circuit.state == OPEN:
+            if not self._recovery_due(circuit):
+                retry_after = self.recovery_timeout - (
+                    time.monotonic() - circuit.opened_at
+                )
+                raise CircuitOpenError(key, retry_after=retry_after)
+            circuit.state = HALF_OPEN
+            circuit.probes_in_flight = 0
+            circuit.probe_successes = 0
+
+        if circuit.state == HALF_OPEN:
+            if circuit.probes_in_flight >= self.half_open_max_calls:
+                raise CircuitOpenError(key, retry_after=0.0)
+            circuit.probes_in_flight += 1
+
+    def record_success(self, key: str) -> None:
+        """Record a successful call to ``key``.
+
+        Args:
+            key: Endpoint key
+        """
+        circuit = self._get(key)
+
+        if circuit.state == HALF_OPEN:
+            circuit.probes_in_flight = max(0, circuit.probes_in_flight - 1)
+            circuit.probe_successes += 1
+            if circuit.probe_successes >= self.half_open_max_calls:
+                circuit.state = CLOSED
+                circuit.outcomes.clear()
+            return
+
+        circuit.outcomes.append(True)
+
+    def record_failure(self, key: str) -> None:
+        """Record a failed call to ``key``, opening the circuit if needed.
+
+        Args:
+            key: Endpoint key
+        """
+        circuit = self._get(key)
+
+        if circuit.state == HALF_OPEN:
+            self._open(circuit)
+            return
+
+        circuit.outcomes.append(False)
+        if len(circuit.outcomes) < self.min_calls:
+            return
+
+        failures = circuit.outcomes.count(False)
+        if failures / len(circuit.outcomes) >= self.failure_rate_threshold:
+            self._open(circuit)
+
+    def release(self, key: str) -> None:
+        """Release a call slot without recording an outcome.
+
+        Used when a call is cancelled before its outcome is known, so that a
+        half-open probe slot is not leaked.
+
+        Args:
+            key: Endpoint key
+        """
+        circuit = self._circuits.get(key)
+        if circuit is not None and circuit.state == HALF_OPEN:
+            circuit.probes_in_flight = max(0, circuit.probes_in_flight - 1)
+
+    def _open(self, circuit: _CircuitState) -> None:
+        circuit.state = OPEN
+        circuit.opened_at = time.monotonic()
+        circuit.probes_in_flight = 0
+        circuit.probe_successes = 0
+        circuit.outcomes.clear()
+
+    def reset(self, key: Optional[str] = None) -> None:
+        """Reset one endpoint's circuit, or all circuits if key is None.
+
+        Args:
+            key: Endpoint key (optional)
+        """
+        if key is None:
+            self._circuits.clear()
+        else:
+            self._circuits.pop(key, None)
@@ -0,0 +1,187 @@
+"""Pluggable JSON codecs for XHS scraper.
+
+XHSClient decodes responses and encodes POST bodies with a JSONCodec, and
+the export writers accept the same codec. The stdlib codec is the default;
+orjson and msgspec are used when requested and installed:
+
+    pip install xhs-scraper[orjson]    # or [msgspec]
+
+    async with XHSClient(cookies=cookies, codec="auto") as client:
+        notes = await client.notes.get_user_notes(user_id)
+    export_to_json(notes.items, "notes.json", codec=client.codec)
+
+Request bodies are encoded compactly, with ``ensure_ascii=False``, which is
+byte-for-byte what httpx sends for ``json=`` payloads of strings and
+integers. Only exotic floats such as 1e20 would be formatted differently.
+"""
+
+import json
+from abc import ABC, abstractmethod
+from typing import Any, Callable, Dict, Optional, Union
+
+Default = Optional[Callable[[Any], Any]]
+
+
+class JSONCodec(ABC):
+    """Base class of JSON codecs.
+
+    The two encoders return different types: ``dumps()`` returns compact
+    UTF-8 ``bytes`` (request bodies, JSON Lines), while ``dumps_pretty()``
+    returns ``str`` for writing to text files. Subclasses raise ValueError
+    for invalid documents, like json.loads().
+    """
+
+    name = "base"
+
+    @abstractmethod
+    def loads(self, data: Union[bytes, str]) -> Any:
+        """Decode a JSON document."""
+
+    @abstractmethod
+    def dumps(self, obj: Any, *, default: Default = None) -> bytes:
+        """Encode compactly; returns UTF-8 bytes, not str."""
+
+    @abstractmethod
+    def dumps_pretty(
+        self, obj: Any, *, indent: Optional[int] = 2, default: Default = None
+    ) -> str:
+        """Encode for export files, optionally indented; returns str, not bytes."""
+
+    def __repr__(self) -> str:
+        return f"<{type(self).__name__} {self.name}>"
+
+
+class StdlibCodec(JSONCodec):
+    """Codec backed by the standard library json module."""
+
+    name = "stdlib"
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        return json.loads(data)
+
+    def dumps(self, obj: Any, *, default: Default = None) -> bytes:
+        return json.dumps(
+            obj,
+            ensure_ascii=False,
+            separators=(",", ":"),
+            allow_nan=False,
+            default=default,
+        ).encode("utf-8")
+
+    def dumps_pretty(
+        self, obj: Any, *, indent: Optional[int] = 2, default: Default = None
+    ) -> str:
+        return json.dumps(obj, ensure_ascii=False, indent=indent, default=default)
+
+
+class OrjsonCodec(JSONCodec):
+    """Codec backed by orjson.
+
+    orjson only indents by two spaces; other indents fall back to stdlib.
+    """
+
+    name = "orjson"
+
+    def __init__(self):
+        """Initialize codec.
+
+        Raises:
+            ImportError: If orjson is not installed
+        """
+        import orjson
+
+        self._orjson = orjson
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        return self._orjson.loads(data)
+
+    def dumps(self, obj: Any, *, default: Default = None) -> bytes:
+        return self._orjson.dumps(obj, default=default)
+
+    def dumps_pretty(
+        self, obj: Any, *, indent: Optional[int] = 2, default: Default = None
+    ) -> str:
+        if indent is None:
+            return self._orjson.dumps(obj, default=default).decode("utf-8")
+        if indent == 2:
+            option = self._orjson.OPT_INDENT_2
+            return self._orjson.dumps(obj, default=default, option=option).decode()
+        return StdlibCodec().dumps_pretty(obj, indent=indent, default=default)
+
+
+class MsgspecCodec(JSONCodec):
+    """Codec backed by msgspec.json."""
+
+    name = "msgspec"
+
+    def __init__(self):
+        """Initialize codec.
+
+        Raises:
+            ImportError: If msgspec is not installed
+        """
+        import msgspec
+
+        self._msgspec = msgspec
+        self._decoder = msgspec.json.Decoder()
+        self._encoder = msgspec.json.Encoder()
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        return self._decoder.decode(data)
+
+    def dumps(self, obj: Any, *, default: Default = None) -> bytes:
+        if default is None:
+            return self._encoder.encode(obj)
+        return self._msgspec.json.encode(obj, enc_hook=default)
+
+    def dumps_pretty(
+        self, obj: Any, *, indent: Optional[int] = 2, default: Default = None
+    ) -> str:
+        data = self.dumps(obj, default=default)
+        if indent is not None:
+            data = self._msgspec.json.format(data, indent=indent)
+        return data.decode("utf-8")
+
+
+_CODECS: Dict[str, Callable[[], JSONCodec]] = {
+    "stdlib": StdlibCodec,
+    "orjson": OrjsonCodec,
+    "msgspec": MsgspecCodec,
+}
+
+STDLIB = StdlibCodec()
+
+
+def get_codec(codec: Union[str, JSONCodec, None] = None) -> JSONCodec:
+    """Resolve a codec instance.
+
+    Args:
+        codec: JSONCodec instance, a name ("stdlib", "orjson", "msgspec"),
+            "auto" for the fastest installed one, or None for stdlib
+
+    Returns:
+        JSONCodec instance
+
+    Raises:
+        ValueError: If the name is unknown
+        ImportError: If the named codec's library is not installed
+    """
+    if codec is None:
+        return STDLIB
+    if isinstance(codec, JSONCodec):
+        return codec
+    if codec == "auto":
+        for name in ("orjson", "msgspec"):
+            try:
+                return _CODECS[name]()
+            except ImportError:
+                continue
+        return STDLIB
+    if codec == "stdlib":
+        return STDLIB
+    factory = _CODECS.get(codec)
+    if factory is None:
+        raise ValueError(
+            "codec must be a JSONCodec, 'stdlib', 'orjson', 'msgspec' or 'auto'"
+        )
+    return factory()
@@ -0,0 +1,405 @@
+"""Multi-host crawl coordination over HTTP.
+
+A Coordinator serves a WorkQueue and per-account rate budgets over plain
+HTTP (standard library only), so workers on several machines share one
+crawl without doing the same work twice:
+
+    # coordinator host
+    queue = WorkQueue("crawl.db")
+    queue.put_many("user_notes", [{"user_id": uid} for uid in user_ids])
+    with Coordinator(queue, budgets={"alice": 2.0}, host="0.0.0.0", port=8765):
+        ...
+
+    # each worker host
+    remote = RemoteWorkQueue("http://coordinator:8765")
+    limiter = RemoteRateLimiter("http://coordinator:8765", account="alice")
+    async with XHSClient(cookies=alice_cookies, rate_limiter=limiter) as client:
+        await QueueWorker(remote, client, on_result=save, concurrency=4).run()
+
+RemoteWorkQueue has the lease/ack/nack interface of WorkQueue, so
+QueueWorker consumes it unchanged; leases, retries and dead letters work as
+for a local queue. Budgets are token buckets held by the coordinator: a
+worker reserves each request's token there and sleeps for the returned
+delay, so all workers using one account together stay within its rate.
+
+The protocol is JSON over POST; there is no authentication, so bind the
+coordinator to a trusted network only.
+"""
+
+import asyncio
+import json
+import logging
+import threading
+import time
+import urllib.request
+from dataclasses import asdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional
+
+from .work_queue import Task, WorkQueue
+
+logger = logging.getLogger(__name__)
+
+
+class _Budget:
+    """Token bucket that hands out reservations instead of blocking."""
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        if rate <= 0:
+            raise ValueError("budget rates must be positive")
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(rate, 1.0)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.granted = 0.0
+
+    def reserve(self, tokens: float) -> float:
+        """Take ``tokens`` (possibly on credit) and return the wait in seconds."""
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        self.tokens -= tokens
+        self.granted += tokens
+        return max(0.0, -self.tokens / self.rate)
+
+
+class Coordinator:
+    """HTTP server handing out leased tasks and per-account rate budgets.
+
+    Args:
+        queue: Work queue to serve
+        budgets: Requests per second allowed per account name
+        host: Interface to bind
+        port: Port to bind (0 picks a free port)
+        burst: Budget bucket capacity (defaults to the rate, at least 1)
+    """
+
+    def __init__(
+        self,
+        queue: WorkQueue,
+        budgets: Optional[Mapping[str, float]] = None,
+        host: str = "127.0.0.1",
+        port: int = 8765,
+        burst: Optional[float] = None,
+    ):
+        """Initialize coordinator (not yet listening).
+
+        Raises:
+            ValueError: If a budget rate is not positive
+        """
+        self.queue = queue
+        self._budgets = {
+            account: _Budget(rate, burst) for account, rate in (budgets or {}).items()
+        }
+        self._budget_lock = threading.Lock()
+        self._address = (host, port)
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+        self._routes: Dict[str, Callable[[Dict[str, Any]], Any]] = {
+            "/tasks": self._put,
+            "/lease": self._lease,
+            "/ack": lambda body: {"ok": queue.ack(_task(body))},
+            "/nack": lambda body: {"ok": queue.nack(_task(body), body.get("error"))},
+            "/release": lambda body: {
+                "ok": queue.release(_task(body), body.get("delay", 0.0))
+            },
+            "/extend": lambda body: {
+                "ok": queue.extend(_task(body), body.get("visibility_timeout"))
+            },
+            "/budget": self._reserve,
+            "/status": lambda body: self.status(),
+        }
+
+    @property
+    def url(self) -> str:
+        """Base URL of the running coordinator."""
+        if self._server is None:
+            raise RuntimeError("Coordinator is not running")
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def set_budget(
+        self, account: str, rate: float, burst: Optional[float] = None
+    ) -> None:
+        """Add or change an account's budget while running."""
+        with self._budget_lock:
+            self._budgets[account] = _Budget(rate, burst)
+
+    def status(self) -> Dict[str, Any]:
+        """Queue counts, settings and per-account budget usage."""
+        with self._budget_lock:
+            budgets = {
+                account: {"rate": budget.rate, "granted": budget.granted}
+                for account, budget in self._budgets.items()
+            }
+        return {
+            "counts": self.queue.counts(),
+            "visibility_timeout": self.queue.visibility_timeout,
+            "budgets": budgets,
+        }
+
+    def _put(self, body: Dict[str, Any]) -> Dict[str, int]:
+        payloads = body["payloads"]
+        keys = body.get("keys")
+        key = None
+        if keys is not None:
+            if not isinstance(keys, list) or len(keys) != len(payloads):
+                raise ValueError("keys must be a list with one key per payload")
+            remaining = iter(keys)
+
+            def key(payload: Dict[str, Any]) -> str:
+                # put_many() asks for keys in payload order.
+                return next(remaining)
+
+        added = self.queue.put_many(
+            body["kind"],
+            payloads,
+            key=key,
+            priority=body.get("priority", 0),
+            delay=body.get("delay", 0.0),
+        )
+        return {"added": added}
+
+    def _lease(self, body: Dict[str, Any]) -> Dict[str, List[Dict[str, Any]]]:
+        tasks = self.queue.lease(
+            body.get("owner"),
+            limit=body.get("limit", 1),
+            kinds=body.get("kinds"),
+            visibility_timeout=body.get("visibility_timeout"),
+        )
+        return {"tasks": [asdict(task) for task in tasks]}
+
+    def _reserve(self, body: Dict[str, Any]) -> Dict[str, float]:
+        account = body["account"]
+        with self._budget_lock:
+            budget = self._budgets.get(account)
+            if budget is None:
+                raise KeyError(f"no budget for account {account!r}")
+            return {"wait": budget.reserve(float(body.get("tokens", 1.0)))}
+
+    def start(self) -> "Coordinator":
+        """Start listening in a daemon thread."""
+        routes = self._routes
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self) -> None:
+                route = routes.get(self.path.split("?", 1)[0])
+                if route is None:
+                    self._reply(404, {"error": "not found"})
+                    return
+                try:
+                    length = int(self.headers.get("content-length") or 0)
+                    body = json.loads(self.rfile.read(length) or b"{}")
+                    result = route(body)
+                except (KeyError, TypeError, ValueError) as exc:
+                    self._reply(400, {"error": f"{type(exc).__name__}: {exc}"})
+                    return
+                except Exception as exc:
+                    # Reply rather than drop the connection, which workers
+                    # would see as RemoteDisconnected.
+                    logger.exception("Coordinator %s failed", self.path)
+                    self._reply(500, {"error": f"{type(exc).__name__}: {exc}"})
+                    return
+                self._reply(200, result)
+
+            do_GET = do_POST
+
+            def _reply(self, status: int, payload: Any) -> None:
+                data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+                self.send_response(status)
+                self.send_header("content-type", "application/json")
+                self.send_header("content-length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format: str, *args: Any) -> None:
+                pass
+
+        self._server = ThreadingHTTPServer(self._address, Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name="xhs-coordinator", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop the server and wait for its thread."""
+        if self._server is None:
+            return
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
+        self._server = None
+        self._thread = None
+
+    def __enter__(self) -> "Coordinator":
+        return self if self._server is not None else self.start()
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.stop()
+
+
+def _task(body: Dict[str, Any]) -> Task:
+    return Task(**body["task"])
+
+
+class _RemoteClient:
+    """Minimal JSON-over-POST client for the coordinator."""
+
+    def __init__(self, url: str, timeout: float):
+        self.url = url.rstrip("/")
+        self.timeout = timeout
+
+    def call(self, path: str, body: Optional[Dict[str, Any]] = None) -> Any:
+        request = urllib.request.Request(
+            self.url + path,
+            data=json.dumps(body or {}, ensure_ascii=False).encode("utf-8"),
+            headers={"content-type": "application/json"},
+            method="POST",
+        )
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            return json.loads(response.read())
+
+
+class RemoteWorkQueue:
+    """WorkQueue interface backed by a Coordinator.
+
+    Args:
+        url: Coordinator base URL
+        timeout: HTTP timeout in seconds
+
+    Raises:
+        urllib.error.URLError: If the coordinator is unreachable (also
+            raised by every method)
+    """
+
+    def __init__(self, url: str, timeout: float = 10.0):
+        """Connect and read the queue's settings."""
+        self._remote = _RemoteClient(url, timeout)
+        self.visibility_timeout = self._remote.call("/status")["visibility_timeout"]
+
+    def put(
+        self,
+        kind: str,
+        payload: Dict[str, Any],
+        *,
+        key: Optional[str] = None,
+        priority: int = 0,
+        delay: float = 0.0,
+    ) -> bool:
+        """Add a task (see WorkQueue.put())."""
+        added = self.put_many(
+            kind,
+            [payload],
+            key=(lambda _: key) if key is not None else None,
+            priority=priority,
+            delay=delay,
+        )
+        return added == 1
+
+    def put_many(
+        self,
+        kind: str,
+        payloads: Iterable[Dict[str, Any]],
+        *,
+        key: Optional[Callable[[Dict[str, Any]], str]] = None,
+        priority: int = 0,
+        delay: float = 0.0,
+    ) -> int:
+        """Add many tasks (see WorkQueue.put_many())."""
+        payloads = list(payloads)
+        body = {
+            "kind": kind,
+            "payloads": payloads,
+            "priority": priority,
+            "delay": delay,
+        }
+        if key is not None:
+            body["keys"] = [key(payload) for payload in payloads]
+        return self._remote.call("/tasks", body)["added"]
+
+    def lease(
+        self,
+        owner: Optional[str] = None,
+        *,
+        limit: int = 1,
+        kinds: Optional[Iterable[str]] = None,
+        visibility_timeout: Optional[float] = None,
+    ) -> List[Task]:
+        """Lease ready tasks (see WorkQueue.lease())."""
+        body = {
+            "owner": owner,
+            "limit": limit,
+            "kinds": list(kinds) if kinds is not None else None,
+            "visibility_timeout": visibility_timeout,
+        }
+        return [Task(**task) for task in self._remote.call("/lease", body)["tasks"]]
+
+    def ack(self, task: Task) -> bool:
+        """Mark a leased task done (see WorkQueue.ack())."""
+        return self._remote.call("/ack", {"task": asdict(task)})["ok"]
+
+    def nack(self, task: Task, error: Any = None) -> bool:
+        """Report a failed attempt (see WorkQueue.nack())."""
+        error = str(error) if error is not None else None
+        return self._remote.call("/nack", {"task": asdict(task), "error": error})["ok"]
+
+    def release(self, task: Task, delay: float = 0.0) -> bool:
+        """Return a task without using an attempt (see WorkQueue.release())."""
+        body = {"task": asdict(task), "delay": delay}
+        return self._remote.call("/release", body)["ok"]
+
+    def extend(self, task: Task, visibility_timeout: Optional[float] = None) -> bool:
+        """Extend a lease (see WorkQueue.extend())."""
+        body = {"task": asdict(task), "visibility_timeout": visibility_timeout}
+        return self._remote.call("/extend", body)["ok"]
+
+    def counts(self) -> Dict[str, int]:
+        """Task counts per state on the coordinator."""
+        return self._remote.call("/status")["counts"]
+
+    def is_drained(self) -> bool:
+        """Whether no task is pending or leased."""
+        counts = self.counts()
+        return counts["pending"] == 0 and counts["leased"] == 0
+
+
+class RemoteRateLimiter:
+    """Rate limiter drawing from an account's budget on a Coordinator.
+
+    Pass it to ``XHSClient(rate_limiter=...)``. Every client using the same
+    account, on any host, shares the account's rate.
+
+    Args:
+        url: Coordinator base URL
+        account: Budget name configured on the coordinator
+        timeout: HTTP timeout in seconds
+    """
+
+    def __init__(self, url: str, account: str, timeout: float = 10.0):
+        """Initialize limiter."""
+        self._remote = _RemoteClient(url, timeout)
+        self.account = account
+        self.waiters = 0
+
+    async def acquire(self, tokens: float = 1.0) -> None:
+        """Reserve tokens on the coordinator and wait until they are due.
+
+        Raises:
+            ValueError: If tokens is not positive
+            urllib.error.HTTPError: If the account has no budget
+        """
+        if tokens <= 0:
+            raise ValueError("Token request must be positive")
+        self.waiters += 1
+        try:
+            body = {"account": self.account, "tokens": tokens}
+            reply = await asyncio.to_thread(self._remote.call, "/budget", body)
+            if reply["wait"] > 0:
+                await asyncio.sleep(reply["wait"])
+        finally:
+            self.waiters -= 1
+
+
+__all__ = ["Coordinator", "RemoteWorkQueue", "RemoteRateLimiter"]
@@ -2,31 +2,49 @@
 
 import csv
 import json
+import sys
 from pathlib import Path
-from typing import Any, Union
+from typing import Any, Callable, Optional, Union
 
-from pydantic import BaseModel
+from xhs_scraper.utils.codec import JSONCodec, get_codec
 
 
-def _serialize_value(value: Any) -> Any:
-    """Serialize a value for JSON/CSV export.
+def _record_dict(value: Any) -> Optional[dict]:
+    """Return a Pydantic model or slots record as a dict, else None.
 
-    Converts Pydantic models to dicts and handles nested objects.
+    pydantic and xhs_scraper.models are only looked up once imported (no
+    instances can exist before that), so export-only jobs never import them.
     """
-    if isinstance(value, BaseModel):
+    pydantic = sys.modules.get("pydantic")
+    if pydantic is not None and isinstance(value, pydantic.BaseModel):
         return value.model_dump()
-    elif isinstance(value, dict):
-        return {k: _serialize_value(v) for k, v in value.items()}
-    elif isinstance(value, list):
-        return [_serialize_value(item) for item in value]
-    else:
-        return value
+    models = sys.modules.get("xhs_scraper.models")
+    if models is not None and isinstance(value, models.SlotsRecord):
+        return value.to_dict()
+    return None
+
+
+def _json_default(value: Any) -> Any:
+    """json.dump() fallback for Pydantic models and slots records."""
+    converted = _record_dict(value)
+    if converted is not None:
+        return converted
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _stdlib_dumps(value: Any) -> str:
+    return json.dumps(value, ensure_ascii=False)
 
 
-def _flatten_dict(data: dict, parent_key: str = "", sep: str = ".") -> dict:
+def _flatten_dict(
+    data: dict,
+    parent_key: str = "",
+    sep: str = ".",
+    dumps: Callable[[Any], str] = _stdlib_dumps,
+) -> dict:
     """Flatten nested dictionary for CSV export.
 
-    Nested dicts and lists are serialized as JSON strings.
+    Nested dicts and lists are serialized as JSON strings with ``dumps``.
     """
     items = []
     for k, v in data.items():
@@ -34,15 +52,14 @@ def _flatten_dict(data: dict, parent_key: str = "", sep: str = ".") -> dict:
 
         if isinstance(v, dict):
             # Serialize dict as JSON string
-            items.append((new_key, json.dumps(v, ensure_ascii=False)))
+            items.append((new_key, dumps(v)))
         elif isinstance(v, list):
             # Serialize list as JSON string
-            items.append((new_key, json.dumps(v, ensure_ascii=False)))
-        elif isinstance(v, BaseModel):
-            # Serialize Pydantic model as JSON string
-            items.append((new_key, json.dumps(v.model_dump(), ensure_ascii=False)))
+            items.append((new_key, dumps(v)))
         else:
-            items.append((new_key, v))
+            # Serialize Pydantic models and slots records as JSON strings
+            converted = _record_dict(v)
+            items.append((new_key, v if converted is None else dumps(converted)))
 
     return dict(items)
 
@@ -57,8 +74,9 @@ def _ensure_list(data: Union[list[Any], Any]) -> list[Any]:
 
 def _convert_to_dict(data: Any) -> dict:
     """Convert data to dictionary."""
-    if isinstance(data, BaseModel):
-        return data.model_dump()
+    converted = _record_dict(data)
+    if converted is not None:
+        return converted
     elif isinstance(data, dict):
         return data
     else:
@@ -69,6 +87,7 @@ def export_to_json(
     data: Union[list[Any], Any],
     filepath: Union[str, Path],
     indent: int = 2,
+    codec: Optional[Union[str, JSONCodec]] = None,
 ) -> Path:
     """Export data to JSON file.
 
@@ -78,6 +97,7 @@ def export_to_json(
         data: Data to export (single item or list).
         filepath: Output file path.
         indent: JSON indentation level (default: 2).
+        codec: JSON codec or codec name (default: stdlib json).
 
     Returns:
         Path object of the created file.
@@ -93,18 +113,25 @@ def export_to_json(
     # Convert data to list
     data_list = _ensure_list(data)
 
-    # Serialize all items
-    serialized_data = [_serialize_value(item) for item in data_list]
-
     # For single items, export as single dict (not wrapped in list)
     if len(data_list) == 1 and not isinstance(data, list):
-        export_data = serialized_data[0]
+        export_data = data_list[0]
     else:
-        export_data = serialized_data
+        export_data = data_list
 
-    # Write to JSON file
+    # Write to JSON file; models and records are converted as the encoder
+    # reaches them, so plain dict results are not walked twice.
     with open(filepath, "w", encoding="utf-8") as f:
-        json.dump(export_data, f, ensure_ascii=False, indent=indent)
+        if codec is None:
+            json.dump(
+                export_data, f, ensure_ascii=False, indent=indent, default=_json_default
+            )
+        else:
+            f.write(
+                get_codec(codec).dumps_pretty(
+                    export_data, indent=indent, default=_json_default
+                )
+            )
 
     return filepath
 
@@ -112,6 +139,7 @@ def export_to_json(
 def export_to_csv(
     data: Union[list[Any], Any],
     filepath: Union[str, Path],
+    codec: Optional[Union[str, JSONCodec]] = None,
 ) -> Path:
     """Export data to CSV file with flattened fields.
 
@@ -121,6 +149,8 @@ def export_to_csv(
     Args:
         data: Data to export (single item or list).
         filepath: Output file path.
+        codec: JSON codec or codec name for nested objects (default: stdlib
+            json). Other codecs write compact JSON strings.
 
     Returns:
         Path object of the created file.
@@ -147,7 +177,15 @@ def export_to_csv(
     dict_list = [_convert_to_dict(item) for item in data_list]
 
     # Flatten all dicts
-    flattened_list = [_flatten_dict(d) for d in dict_list]
+    if codec is None:
+        flattened_list = [_flatten_dict(d) for d in dict_list]
+    else:
+        json_codec = get_codec(codec)
+
+        def dumps(value: Any) -> str:
+            return json_codec.dumps(value).decode("utf-8")
+
+        flattened_list = [_flatten_dict(d, dumps=dumps) for d in dict_list]
 
     # Collect all unique field names (preserve order)
     all_keys = []
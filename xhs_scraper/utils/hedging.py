@@ -0,0 +1,111 @@
+"""Request hedging policy for XHS scraper."""
+
+import math
+from collections import deque
+from typing import Deque, Dict, Iterable, Optional
+
+
+class HedgingPolicy:
+    """Decides when and how often idempotent requests may be hedged.
+
+    A hedged request sends a second, identical request when the first has
+    not completed within the observed latency percentile of its endpoint,
+    and uses whichever response arrives first. The total number of hedges
+    is capped at ``max_hedge_ratio`` of all requests seen by the policy, so
+    hedging cannot turn into a load multiplier.
+
+    Args:
+        percentile: Latency percentile (0-1) used as the hedge delay
+        max_hedge_ratio: Maximum fraction of requests that may be hedged
+        paths: Endpoint paths eligible for hedging (None means all GETs)
+        initial_delay: Hedge delay used until ``min_samples`` latencies exist
+        min_delay: Lower bound on the hedge delay in seconds
+        window_size: Number of recent latencies kept per endpoint
+        min_samples: Samples needed before the percentile is trusted
+    """
+
+    def __init__(
+        self,
+        percentile: float = 0.95,
+        max_hedge_ratio: float = 0.05,
+        paths: Optional[Iterable[str]] = None,
+        initial_delay: float = 1.0,
+        min_delay: float = 0.05,
+        window_size: int = 200,
+        min_samples: int = 20,
+    ):
+        """Initialize hedging policy.
+
+        Raises:
+            ValueError: If any argument is out of range
+        """
+        if not 0 < percentile < 1:
+            raise ValueError("percentile must be in (0, 1)")
+        if not 0 <= max_hedge_ratio <= 1:
+            raise ValueError("max_hedge_ratio must be in [0, 1]")
+        if initial_delay < 0 or min_delay < 0:
+            raise ValueError("delays must be non-negative")
+        if window_size <= 0 or min_samples <= 0:
+            raise ValueError("window_size and min_samples must be positive")
+
+        self.percentile = percentile
+        self.max_hedge_ratio = max_hedge_ratio
+        self.paths = frozenset(paths) if paths is not None else None
+        self.initial_delay = initial_delay
+        self.min_delay = min_delay
+        self.window_size = window_size
+        self.min_samples = min_samples
+
+        self.requests_total = 0
+        self.hedges_total = 0
+        self._latencies: Dict[str, Deque[float]] = {}
+
+    def applies_to(self, path: str) -> bool:
+        """Check whether requests to ``path`` are eligible for hedging."""
+        return self.paths is None or path in self.paths
+
+    def delay(self, path: str) -> float:
+        """Get the hedge delay for ``path`` in seconds.
+
+        Args:
+            path: Endpoint path
+
+        Returns:
+            Configured percentile of recent latencies, or initial_delay while
+            fewer than min_samples latencies have been recorded
+        """
+        samples = self._latencies.get(path)
+        if samples is None or len(samples) < self.min_samples:
+            return max(self.min_delay, self.initial_delay)
+
+        ordered = sorted(samples)
+        index = min(len(ordered) - 1, math.ceil(self.percentile * len(ordered)) - 1)
+        return max(self.min_delay, ordered[index])
+
+    def record_latency(self, path: str, seconds: float) -> None:
+        """Record the latency of a completed request attempt.
+
+        Args:
+            path: Endpoint path
+            seconds: Observed latency
+        """
+        samples = self._latencies.get(path)
+        if samples is None:
+            samples = deque(maxlen=self.window_size)
+            self._latencies[path] = samples
+        samples.append(seconds)
+
+    def record_request(self) -> None:
+        """Count a hedge-eligible request towards the hedge budget."""
+        self.requests_total += 1
+
+    def try_acquire_hedge(self) -> bool:
+        """Reserve a hedge if the hedge ratio budget allows it.
+
+        Returns:
+            True if a hedge request may be sent
+        """
+        if self.hedges_total + 1 > self.max_hedge_ratio * self.requests_total:
+            return False
+        self.hedges_total += 1
+        return True
@@ -0,0 +1,172 @@
+"""Request lifecycle hooks for XHS scraper.
+
+RequestHooks lets tracing, logging or accounting code observe every request
+made by XHSClient without patching it. Callbacks receive a RequestEvent and
+may be plain functions or coroutine functions:
+
+    async with XHSClient(cookies=cookies) as client:
+
+        @client.hooks.on_response
+        def log(event):
+            print(event.method, event.path, event.status_code, event.duration)
+
+When no callback is registered the client skips the hook machinery
+entirely. Exceptions raised by callbacks are logged and never propagate
+into the request.
+"""
+
+import inspect
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+Hook = Callable[["RequestEvent"], Any]
+
+
+@dataclass
+class RequestEvent:
+    """State of one XHSClient request as seen by hooks.
+
+    on_request callbacks may add entries to ``headers`` (e.g. trace
+    propagation headers) and use ``attributes`` to pass data to the later
+    callbacks of the same request.
+    """
+
+    method: str
+    path: str
+    params: Dict[str, Any]
+    payload: Dict[str, Any]
+    headers: Dict[str, str]
+    start_time: float = field(default_factory=time.time)
+    duration: Optional[float] = None
+    status_code: Optional[int] = None
+    bytes_sent: int = 0
+    bytes_received: int = 0
+    error: Optional[BaseException] = None
+    attributes: Dict[str, Any] = field(default_factory=dict)
+
+
+class RequestHooks:
+    """Registry of request lifecycle callbacks.
+
+    - ``on_request``: before the request is rate limited, signed and sent
+    - ``on_response``: after a 2xx response was received and parsed
+    - ``on_error``: after the request failed, including error statuses
+      (``status_code`` set) and transport errors (``status_code`` None)
+    """
+
+    def __init__(self):
+        """Initialize an empty registry."""
+        self._request: List[Hook] = []
+        self._response: List[Hook] = []
+        self._error: List[Hook] = []
+
+    def __bool__(self) -> bool:
+        return bool(self._request or self._response or self._error)
+
+    def on_request(self, callback: Hook) -> Hook:
+        """Register a callback run before each request (usable as decorator)."""
+        self._request.append(callback)
+        return callback
+
+    def on_response(self, callback: Hook) -> Hook:
+        """Register a callback run after each successful response."""
+        self._response.append(callback)
+        return callback
+
+    def on_error(self, callback: Hook) -> Hook:
+        """Register a callback run after each failed request."""
+        self._error.append(callback)
+        return callback
+
+    def remove(self, callback: Hook) -> None:
+        """Unregister a callback from every lifecycle stage."""
+        for callbacks in (self._request, self._response, self._error):
+            while callback in callbacks:
+                callbacks.remove(callback)
+
+    async def emit_request(self, event: RequestEvent) -> None:
+        """Run the on_request callbacks."""
+        await self._emit(self._request, event)
+
+    async def emit_response(self, event: RequestEvent) -> None:
+        """Run the on_response callbacks."""
+        await self._emit(self._response, event)
+
+    async def emit_error(self, event: RequestEvent) -> None:
+        """Run the on_error callbacks."""
+        await self._emit(self._error, event)
+
+    @staticmethod
+    async def _emit(callbacks: List[Hook], event: RequestEvent) -> None:
+        for callback in callbacks:
+            try:
+                result = callback(event)
+                if inspect.isawaitable(result):
+                    await result
+            except Exception:
+                logger.exception("Request hook %r failed", callback)
+
+
+@dataclass(frozen=True)
+class Span:
+    """Finished request recorded by InMemorySpanExporter."""
+
+    name: str
+    method: str
+    path: str
+    start_time: float
+    duration: float
+    status_code: Optional[int]
+    bytes_sent: int
+    bytes_received: int
+    error: Optional[str]
+    attributes: Dict[str, Any]
+
+
+class InMemorySpanExporter:
+    """Collects one Span per finished request, for tests and debugging.
+
+    Usage:
+        exporter = InMemorySpanExporter().attach(client.hooks)
+        ...
+        assert exporter.spans[0].status_code == 200
+    """
+
+    def __init__(self):
+        """Initialize an empty exporter."""
+        self.spans: List[Span] = []
+
+    def attach(self, hooks: RequestHooks) -> "InMemorySpanExporter":
+        """Register on a hook registry's response and error stages."""
+        hooks.on_response(self.export)
+        hooks.on_error(self.export)
+        return self
+
+    def export(self, event: RequestEvent) -> None:
+        """Record a finished request."""
+        self.spans.append(
+            Span(
+                name=f"{event.method} {event.path}",
+                method=event.method,
+                path=event.path,
+                start_time=event.start_time,
+                duration=event.duration or 0.0,
+                status_code=event.status_code,
+                bytes_sent=event.bytes_sent,
+                bytes_received=event.bytes_received,
+                error=type(event.error).__name__ if event.error else None,
+                attributes=dict(event.attributes),
+            )
+        )
+
+    def find(self, path: str) -> List[Span]:
+        """Return recorded spans for an endpoint path."""
+        return [span for span in self.spans if span.path == path]
+
+    def clear(self) -> None:
+        """Discard recorded spans."""
+        self.spans.clear()
@@ -0,0 +1,290 @@
+"""Memory-compact sets of note, comment and user ids.
+
+A Python ``set[str]`` of 24-hex ids costs about 100 bytes per entry. For
+cross-job deduplication over tens of millions of ids this module packs each
+id into a 12-byte binary key:
+
+- CompactIdSet: exact. Keys live in one sorted bytes buffer searched with
+  bisect, plus a small hash-set front for recent additions that is merged
+  into the buffer in bulk. About 12 bytes per id once merged. Saved sets
+  can be reopened with mmap, so a large set is shared through the page
+  cache instead of being loaded.
+- BloomIdSet: probabilistic. A fixed bit array sized from the expected
+  capacity and false-positive rate (about 1.2 bytes per id at 1%); ids are
+  never reported missing once added, but may be reported present when
+  they are not.
+
+Both behave like a set of strings for ``in``, ``add()`` and ``len()``, so
+scrapers accept them wherever they take ``seen_ids``:
+
+    seen = CompactIdSet.load("seen.ids") if Path("seen.ids").exists() else CompactIdSet()
+    notes = await client.notes.get_user_notes(user_id, seen_ids=seen)
+    seen.save("seen.ids")
+
+Ids that are not 24 hex digits (cursors, other strings) are hashed to 12
+bytes with BLAKE2b instead; collisions are negligible at 96 bits.
+"""
+
+import bisect
+import hashlib
+import math
+import mmap
+import os
+import re
+from pathlib import Path
+from typing import Iterable, Optional, Set, Union
+
+KEY_SIZE = 12
+
+_MAGIC = b"XHSIDS1\n"
+_HEADER_SIZE = len(_MAGIC) + 8
+_HEX_ID = re.compile(f"[0-9a-fA-F]{{{2 * KEY_SIZE}}}")
+
+
+def pack_id(value: str) -> bytes:
+    """Pack an id into a 12-byte key.
+
+    Ids of exactly 24 hex digits are stored as their raw bytes; anything
+    else is hashed, including ids with whitespace, which fromhex() would
+    skip and pack short.
+    """
+    if _HEX_ID.fullmatch(value):
+        return bytes.fromhex(value)
+    return hashlib.blake2b(value.encode("utf-8"), digest_size=KEY_SIZE).digest()
+
+
+class _Keys:
+    """Read-only sequence view of the sorted key buffer, for bisect."""
+
+    __slots__ = ("buffer", "length")
+
+    def __init__(self, buffer: Union[bytes, mmap.mmap], length: int):
+        self.buffer = buffer
+        self.length = length
+
+    def __len__(self) -> int:
+        return self.length
+
+    def __getitem__(self, index: int) -> bytes:
+        offset = _HEADER_SIZE * isinstance(self.buffer, mmap.mmap) + index * KEY_SIZE
+        return self.buffer[offset : offset + KEY_SIZE]
+
+
+class CompactIdSet:
+    """Exact id set storing 12-byte keys in a sorted buffer.
+
+    Args:
+        ids: Initial ids
+        front_size: Minimum number of recent additions kept in the hash
+            front before merging; the front may grow to an eighth of the
+            set so merges stay amortized O(1) per id
+    """
+
+    def __init__(self, ids: Iterable[str] = (), front_size: int = 65536):
+        """Initialize set."""
+        if front_size <= 0:
+            raise ValueError("front_size must be positive")
+        self.front_size = front_size
+        self._keys = _Keys(b"", 0)
+        self._front: Set[bytes] = set()
+        self._mmap: Optional[mmap.mmap] = None
+        self.update(ids)
+
+    def __len__(self) -> int:
+        return len(self._keys) + len(self._front)
+
+    def __contains__(self, value: object) -> bool:
+        if not isinstance(value, str):
+            return False
+        return self._contains_key(pack_id(value))
+
+    def _contains_key(self, key: bytes) -> bool:
+        if key in self._front:
+            return True
+        keys = self._keys
+        index = bisect.bisect_left(keys, key)
+        return index < len(keys) and keys[index] == key
+
+    def add(self, value: str) -> bool:
+        """Add an id.
+
+        Returns:
+            True if the id was not in the set before
+        """
+        key = pack_id(value)
+        if self._contains_key(key):
+            return False
+        self._front.add(key)
+        if len(self._front) >= max(self.front_size, len(self._keys) // 8):
+            self.compact()
+        return True
+
+    def update(self, values: Iterable[str]) -> None:
+        """Add many ids."""
+        for value in values:
+            self.add(value)
+
+    def compact(self) -> None:
+        """Merge the hash front into the sorted buffer."""
+        if not self._front:
+            return
+        keys = self._keys
+        parts = []
+        previous = 0
+        for key in sorted(self._front):
+            index = bisect.bisect_left(keys, key)
+            if index > previous:
+                parts.append(self._slice(previous, index))
+            parts.append(key)
+            previous = index
+        if previous < len(keys):
+            parts.append(self._slice(previous, len(keys)))
+        length = len(keys) + len(self._front)
+        self._keys = _Keys(b"".join(parts), length)
+        self._front.clear()
+        self._close_mmap()
+
+    def _slice(self, start: int, stop: int) -> bytes:
+        offset = _HEADER_SIZE if self._mmap is not None else 0
+        buffer = self._keys.buffer
+        return buffer[offset + start * KEY_SIZE : offset + stop * KEY_SIZE]
+
+    def memory_bytes(self) -> int:
+        """Approximate heap bytes used by the keys (0 for mmap-backed keys)."""
+        base = 0 if self._mmap is not None else len(self._keys) * KEY_SIZE
+        # A set slot plus a 12-byte bytes object is about 80 bytes.
+        return base + len(self._front) * 80
+
+    def save(self, path: Union[str, Path]) -> Path:
+        """Write the set to ``path`` (atomically, via a temporary file).
+
+        Returns:
+            Path of the written file
+        """
+        self.compact()
+        path = Path(path)
+        tmp = path.with_name(path.name + ".tmp")
+        with open(tmp, "wb") as f:
+            f.write(_MAGIC)
+            f.write(len(self._keys).to_bytes(8, "little"))
+            f.write(self._slice(0, len(self._keys)))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+        return path
+
+    @classmethod
+    def load(cls, path: Union[str, Path], use_mmap: bool = True) -> "CompactIdSet":
+        """Open a set written by save().
+
+        Args:
+            path: File written by save()
+            use_mmap: Map the file instead of reading it into memory. The
+                mapping is replaced by an in-memory buffer on the first
+                merge of new ids.
+
+        Raises:
+            ValueError: If the file is not an id set
+        """
+        instance = cls()
+        with open(path, "rb") as f:
+            header = f.read(_HEADER_SIZE)
+            if len(header) != _HEADER_SIZE or not header.startswith(_MAGIC):
+                raise ValueError(f"{path} is not an id set file")
+            length = int.from_bytes(header[len(_MAGIC) :], "little")
+            if length == 0:
+                return instance
+            if use_mmap:
+                instance._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                instance._keys = _Keys(instance._mmap, length)
+            else:
+                instance._keys = _Keys(f.read(length * KEY_SIZE), length)
+        available = len(instance._keys.buffer) - _HEADER_SIZE * use_mmap
+        if available < length * KEY_SIZE:
+            raise ValueError(f"{path} is truncated")
+        return instance
+
+    def _close_mmap(self) -> None:
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+
+    def close(self) -> None:
+        """Release the file mapping, if any (keys are read into memory)."""
+        if self._mmap is not None:
+            self._keys = _Keys(self._slice(0, len(self._keys)), len(self._keys))
+            self._close_mmap()
+
+
+class BloomIdSet:
+    """Probabilistic id set backed by a Bloom filter.
+
+    ``len()`` counts distinct additions as reported by the filter, so it
+    may slightly undercount after false positives.
+
+    Args:
+        capacity: Expected number of ids
+        error_rate: Target false-positive rate at capacity
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 0.01):
+        """Initialize an empty filter.
+
+        Raises:
+            ValueError: If capacity or error_rate is out of range
+        """
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        if not 0 < error_rate < 1:
+            raise ValueError("error_rate must be between 0 and 1")
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.bits = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.bits / capacity * math.log(2)))
+        self._array = bytearray((self.bits + 7) // 8)
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _positions(self, value: str):
+        # Double hashing over a 16-byte digest of the packed key.
+        digest = hashlib.blake2b(pack_id(value), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return [(h1 + i * h2) % self.bits for i in range(self.hashes)]
+
+    def __contains__(self, value: object) -> bool:
+        if not isinstance(value, str):
+            return False
+        array = self._array
+        return all(array[p >> 3] & (1 << (p & 7)) for p in self._positions(value))
+
+    def add(self, value: str) -> bool:
+        """Add an id.
+
+        Returns:
+            True if the filter did not already report the id as present
+        """
+        array = self._array
+        added = False
+        for position in self._positions(value):
+            mask = 1 << (position & 7)
+            if not array[position >> 3] & mask:
+                array[position >> 3] |= mask
+                added = True
+        self._count += added
+        return added
+
+    def update(self, values: Iterable[str]) -> None:
+        """Add many ids."""
+        for value in values:
+            self.add(value)
+
+    def memory_bytes(self) -> int:
+        """Bytes used by the bit array."""
+        return len(self._array)
+
+
+SeenIds = Union[Set[str], CompactIdSet, BloomIdSet]
+"""Any set of ids accepted as ``seen_ids`` by the scrapers."""
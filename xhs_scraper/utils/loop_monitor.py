@@ -0,0 +1,212 @@
+"""Event-loop lag and task backlog monitor for XHS scraper.
+
+LoopMonitor runs a heartbeat task on the event loop that measures how late
+each wake-up is (loop lag) and samples the number of pending tasks and
+rate-limiter waiters. A watchdog thread watches the heartbeat; when the
+loop has not ticked for ``slow_threshold`` seconds, the callback blocking it
+is still running, so the watchdog captures the loop thread's stack and
+records it as a SlowCallback (and logs a warning). This shows which code
+blocks the loop.
+
+    monitor = LoopMonitor(slow_threshold=0.1)
+    async with XHSClient(cookies=cookies, loop_monitor=monitor) as client:
+        ...
+        print(monitor.snapshot())
+"""
+
+import asyncio
+import logging
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Deque, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class SlowCallback:
+    """A stall of the event loop and the stack that caused it."""
+
+    started_at: float
+    duration: float
+    stack: str
+
+
+class LoopMonitor:
+    """Samples event-loop lag, pending tasks and rate-limiter waiters.
+
+    Args:
+        interval: Seconds between heartbeat samples
+        slow_threshold: Loop stall in seconds that triggers stack sampling
+        history: Number of samples and slow callbacks kept
+        sample_stacks: Capture the blocking stack with a watchdog thread
+    """
+
+    def __init__(
+        self,
+        interval: float = 0.05,
+        slow_threshold: float = 0.1,
+        history: int = 1000,
+        sample_stacks: bool = True,
+    ):
+        """Initialize monitor (started by XHSClient or start()).
+
+        Raises:
+            ValueError: If any argument is out of range
+        """
+        if interval <= 0 or slow_threshold <= 0:
+            raise ValueError("interval and slow_threshold must be positive")
+        if history <= 0:
+            raise ValueError("history must be positive")
+
+        self.interval = interval
+        self.slow_threshold = slow_threshold
+        self.sample_stacks = sample_stacks
+
+        self.lag_samples: Deque[float] = deque(maxlen=history)
+        self.task_samples: Deque[int] = deque(maxlen=history)
+        self.waiter_samples: Deque[int] = deque(maxlen=history)
+        self.slow_callbacks: Deque[SlowCallback] = deque(maxlen=history)
+        self.max_lag = 0.0
+
+        self._rate_limiter: Optional[Any] = None
+        self._task: Optional[asyncio.Task] = None
+        self._watchdog: Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+        self._loop_thread_id: Optional[int] = None
+        self._last_beat = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None
+
+    def start(self, rate_limiter: Optional[Any] = None) -> None:
+        """Start monitoring the running event loop.
+
+        Args:
+            rate_limiter: Rate limiter whose ``waiters`` count is sampled;
+                limiters without one are sampled as 0
+
+        Raises:
+            RuntimeError: If called outside a running event loop
+        """
+        if self._task is not None:
+            return
+        loop = asyncio.get_running_loop()
+        self._rate_limiter = rate_limiter
+        self._loop_thread_id = threading.get_ident()
+        self._last_beat = time.monotonic()
+        self._stopped.clear()
+        self._task = loop.create_task(self._heartbeat())
+        if self.sample_stacks:
+            self._watchdog = threading.Thread(
+                target=self._watch, name="xhs-loop-watchdog", daemon=True
+            )
+            self._watchdog.start()
+
+    async def stop(self) -> None:
+        """Stop the heartbeat task and watchdog thread."""
+        if self._task is None:
+            return
+        self._stopped.set()
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        if self._watchdog is not None:
+            self._watchdog.join()
+            self._watchdog = None
+
+    async def _heartbeat(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            scheduled = loop.time()
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, loop.time() - scheduled - self.interval)
+            self._last_beat = time.monotonic()
+
+            waiters = getattr(self._rate_limiter, "waiters", 0)
+            with self._lock:
+                self.lag_samples.append(lag)
+                self.task_samples.append(len(asyncio.all_tasks(loop)))
+                self.waiter_samples.append(waiters)
+                self.max_lag = max(self.max_lag, lag)
+
+    def _watch(self) -> None:
+        # A stall is reported once, when it crosses slow_threshold; its final
+        # duration is filled in when the heartbeat resumes.
+        current: Optional[SlowCallback] = None
+        beat_at_stall = 0.0
+        while not self._stopped.wait(self.slow_threshold / 4):
+            last_beat = self._last_beat
+            stalled = time.monotonic() - last_beat - self.interval
+
+            if current is not None:
+                if last_beat != beat_at_stall:
+                    current.duration = last_beat - beat_at_stall - self.interval
+                    current = None
+                continue
+
+            if stalled >= self.slow_threshold:
+                frame = sys._current_frames().get(self._loop_thread_id)
+                stack = "".join(traceback.format_stack(frame)) if frame else ""
+                current = SlowCallback(
+                    started_at=time.time() - stalled, duration=stalled, stack=stack
+                )
+                beat_at_stall = last_beat
+                with self._lock:
+                    self.slow_callbacks.append(current)
+                logger.warning(
+                    "Event loop blocked for %.3fs (still running):\n%s", stalled, stack
+                )
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Summarize recent samples.
+
+        Returns:
+            Dictionary with lag statistics (seconds), pending task and
+            rate-limiter waiter counts, and recorded slow callbacks
+        """
+        with self._lock:
+            lags = sorted(self.lag_samples)
+            tasks = list(self.task_samples)
+            waiters = list(self.waiter_samples)
+            slow: List[SlowCallback] = list(self.slow_callbacks)
+            last_lag = self.lag_samples[-1] if self.lag_samples else None
+            max_lag = self.max_lag
+
+        def percentile(q: float) -> Optional[float]:
+            return lags[min(len(lags) - 1, int(q * len(lags)))] if lags else None
+
+        return {
+            "samples": len(lags),
+            "lag": {
+                "last": last_lag,
+                "mean": sum(lags) / len(lags) if lags else None,
+                "p99": percentile(0.99),
+                "max": max_lag,
+            },
+            "pending_tasks": {
+                "last": tasks[-1] if tasks else None,
+                "max": max(tasks, default=None),
+            },
+            "rate_limiter_waiters": {
+                "last": waiters[-1] if waiters else None,
+                "max": max(waiters, default=None),
+            },
+            "slow_callbacks": [
+                {
+                    "started_at": callback.started_at,
+                    "duration": callback.duration,
+                    "stack": callback.stack,
+                }
+                for callback in slow
+            ],
+        }
@@ -0,0 +1,410 @@
+"""Per-endpoint request metrics for XHS scraper.
+
+RequestMetrics collects, per normalized API path, request counts by status,
+send attempts, bytes sent/received and latency histograms for each phase of
+a request:
+
+- ``rate_limit_wait``: time spent waiting for a rate limiter token
+- ``sign``: time spent computing signature headers
+- ``network``: time from sending the request to receiving the full response
+- ``parse``: time spent decoding JSON and mapping error statuses
+- ``total``: end-to-end time of XHSClient._request()
+
+Metrics are available as a plain-dict snapshot or in Prometheus text format,
+optionally served on a local port:
+
+    metrics = RequestMetrics()
+    async with XHSClient(cookies=cookies, metrics=metrics) as client:
+        with metrics.serve(port=9464):
+            ...
+"""
+
+import bisect
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+PHASES = ("rate_limit_wait", "sign", "network", "parse", "total")
+
+# Upper bounds in seconds; signing sits in the sub-millisecond buckets and
+# network round trips in the tens to hundreds of milliseconds.
+DEFAULT_BUCKETS = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+
+class Histogram:
+    """Fixed-bucket latency histogram.
+
+    Args:
+        buckets: Sorted bucket upper bounds in seconds
+    """
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        """Initialize an empty histogram."""
+        self.buckets = tuple(buckets)
+        self.counts: List[int] = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        """Record one observation in seconds."""
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Estimate a quantile by linear interpolation within its bucket.
+
+        Args:
+            q: Quantile in [0, 1]
+
+        Returns:
+            Estimated value in seconds, or None if empty. Observations above
+            the largest bucket are reported as that bucket's bound.
+        """
+        if self.count == 0:
+            return None
+        rank = q * self.count
+        cumulative = 0
+        for index, count in enumerate(self.counts):
+            if count and cumulative + count >= rank:
+                if index == len(self.buckets):
+                    return self.buckets[-1]
+                lower = self.buckets[index - 1] if index else 0.0
+                upper = self.buckets[index]
+                return lower + (upper - lower) * (rank - cumulative) / count
+            cumulative += count
+        return self.buckets[-1]
+
+    def merge(self, other: "Histogram") -> None:
+        """Add another histogram's observations (same buckets) to this one.
+
+        Raises:
+            ValueError: If the buckets differ
+        """
+        if other.buckets != self.buckets:
+            raise ValueError("cannot merge histograms with different buckets")
+        self.counts = [a + b for a, b in zip(self.counts, other.counts)]
+        self.count += other.count
+        self.sum += other.sum
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Summarize the histogram as a dictionary."""
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "mean": self.sum / self.count if self.count else None,
+            "p50": self.quantile(0.5),
+            "p95": self.quantile(0.95),
+            "p99": self.quantile(0.99),
+        }
+
+
+class _EndpointMetrics:
+    __slots__ = ("requests", "attempts", "bytes_sent", "bytes_received", "phases")
+
+    def __init__(self, buckets: Sequence[float]):
+        self.requests: Dict[str, int] = {}
+        self.attempts = 0
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.phases = {phase: Histogram(buckets) for phase in PHASES}
+
+
+class RequestMetrics:
+    """Thread-safe per-endpoint counters and latency histograms.
+
+    XHSClient records into this object when passed as ``metrics=``; the
+    snapshot and exporter may be read from any thread.
+
+    Args:
+        buckets: Histogram bucket upper bounds in seconds
+    """
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        """Initialize empty metrics.
+
+        Raises:
+            ValueError: If buckets are empty or not strictly increasing
+        """
+        buckets = tuple(buckets)
+        if not buckets or any(b <= a for a, b in zip(buckets, buckets[1:])):
+            raise ValueError("buckets must be non-empty and strictly increasing")
+        self.buckets = buckets
+        self._endpoints: Dict[str, _EndpointMetrics] = {}
+        self._lock = threading.Lock()
+
+    def _endpoint(self, path: str) -> _EndpointMetrics:
+        endpoint = self._endpoints.get(path)
+        if endpoint is None:
+            endpoint = self._endpoints[path] = _EndpointMetrics(self.buckets)
+        return endpoint
+
+    def record_attempt(
+        self,
+        path: str,
+        *,
+        rate_limit_wait: float,
+        sign: float,
+        network: Optional[float],
+    ) -> None:
+        """Record the phases of one send attempt (hedges are extra attempts).
+
+        Args:
+            path: Normalized endpoint path
+            rate_limit_wait: Seconds waiting for the rate limiter
+            sign: Seconds spent signing
+            network: Seconds on the wire, or None if the attempt was
+                cancelled or failed before sending
+        """
+        with self._lock:
+            endpoint = self._endpoint(path)
+            endpoint.attempts += 1
+            endpoint.phases["rate_limit_wait"].observe(rate_limit_wait)
+            endpoint.phases["sign"].observe(sign)
+            if network is not None:
+                endpoint.phases["network"].observe(network)
+
+    def record_request(
+        self,
+        path: str,
+        *,
+        status: str,
+        total: float,
+        parse: Optional[float] = None,
+        bytes_sent: int = 0,
+        bytes_received: int = 0,
+    ) -> None:
+        """Record the outcome of one XHSClient._request() call.
+
+        Args:
+            path: Normalized endpoint path
+            status: HTTP status code, or an error label such as
+                "transport_error" or "circuit_open"
+            total: End-to-end seconds
+            parse: Seconds spent parsing the response, if one was received
+            bytes_sent: Request body size
+            bytes_received: Response body size
+        """
+        with self._lock:
+            endpoint = self._endpoint(path)
+            endpoint.requests[status] = endpoint.requests.get(status, 0) + 1
+            endpoint.bytes_sent += bytes_sent
+            endpoint.bytes_received += bytes_received
+            endpoint.phases["total"].observe(total)
+            if parse is not None:
+                endpoint.phases["parse"].observe(parse)
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Picklable for sending from worker processes; the lock is recreated.
+        with self._lock:
+            state = self.__dict__.copy()
+            state["_endpoints"] = dict(self._endpoints)
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def merge(self, other: "RequestMetrics") -> None:
+        """Add the metrics recorded by ``other`` (e.g. another process).
+
+        Raises:
+            ValueError: If the histogram buckets differ
+        """
+        if other.buckets != self.buckets:
+            raise ValueError("cannot merge metrics with different buckets")
+        with other._lock:
+            endpoints = list(other._endpoints.items())
+        with self._lock:
+            for path, source in endpoints:
+                endpoint = self._endpoint(path)
+                for status, count in source.requests.items():
+                    endpoint.requests[status] = endpoint.requests.get(status, 0) + count
+                endpoint.attempts += source.attempts
+                endpoint.bytes_sent += source.bytes_sent
+                endpoint.bytes_received += source.bytes_received
+                for phase, histogram in source.phases.items():
+                    endpoint.phases[phase].merge(histogram)
+
+    def reset(self) -> None:
+        """Discard all recorded metrics."""
+        with self._lock:
+            self._endpoints.clear()
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Return a point-in-time copy of all metrics.
+
+        Returns:
+            Mapping of endpoint path to its requests (by status), attempts,
+            byte counters and per-phase histogram summaries (seconds)
+        """
+        with self._lock:
+            return {
+                path: {
+                    "requests": dict(endpoint.requests),
+                    "requests_total": sum(endpoint.requests.values()),
+                    "attempts": endpoint.attempts,
+                    "bytes_sent": endpoint.bytes_sent,
+                    "bytes_received": endpoint.bytes_received,
+                    "phases": {
+                        phase: histogram.snapshot()
+                        for phase, histogram in endpoint.phases.items()
+                    },
+                }
+                for path, endpoint in self._endpoints.items()
+            }
+
+    def render_prometheus(self) -> str:
+        """Render all metrics in the Prometheus text exposition format."""
+        lines: List[str] = []
+        with self._lock:
+            endpoints = sorted(self._endpoints.items())
+
+            lines += _header("xhs_requests_total", "counter", "Requests by status.")
+            for path, endpoint in endpoints:
+                for status, count in sorted(endpoint.requests.items()):
+                    labels = _labels(path=path, status=status)
+                    lines.append(f"xhs_requests_total{labels} {count}")
+
+            for name, attr, help_text in (
+                ("xhs_request_attempts_total", "attempts", "Send attempts."),
+                ("xhs_request_bytes_sent_total", "bytes_sent", "Request bytes."),
+                ("xhs_response_bytes_total", "bytes_received", "Response bytes."),
+            ):
+                lines += _header(name, "counter", help_text)
+                for path, endpoint in endpoints:
+                    lines.append(f"{name}{_labels(path=path)} {getattr(endpoint, attr)}")
+
+            name = "xhs_request_duration_seconds"
+            lines += _header(name, "histogram", "Request latency by phase.")
+            for path, endpoint in endpoints:
+                for phase, histogram in endpoint.phases.items():
+                    if not histogram.count:
+                        continue
+                    cumulative = 0
+                    bounds = [*map(_format_float, histogram.buckets), "+Inf"]
+                    for bound, count in zip(bounds, histogram.counts):
+                        cumulative += count
+                        labels = _labels(path=path, phase=phase, le=bound)
+                        lines.append(f"{name}_bucket{labels} {cumulative}")
+                    labels = _labels(path=path, phase=phase)
+                    lines.append(f"{name}_sum{labels} {_format_float(histogram.sum)}")
+                    lines.append(f"{name}_count{labels} {histogram.count}")
+
+        return "\n".join(lines) + "\n"
+
+    def serve(self, port: int = 9464, host: str = "127.0.0.1") -> "MetricsServer":
+        """Start serving ``/metrics`` in Prometheus format.
+
+        Args:
+            port: Port to bind (0 picks a free port)
+            host: Interface to bind
+
+        Returns:
+            Running MetricsServer (also usable as a context manager)
+        """
+        return MetricsServer(self, host=host, port=port).start()
+
+
+def _header(name: str, kind: str, help_text: str) -> Tuple[str, str]:
+    return (f"# HELP {name} {help_text}", f"# TYPE {name} {kind}")
+
+
+def _labels(**labels: str) -> str:
+    escaped = (f'{key}="{_escape(value)}"' for key, value in labels.items())
+    return "{" + ",".join(escaped) + "}"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_float(value: float) -> str:
+    return repr(float(value))
+
+
+class MetricsServer:
+    """Serve RequestMetrics over HTTP on a background thread.
+
+    Args:
+        metrics: Metrics to expose
+        host: Interface to bind
+        port: Port to bind (0 picks a free port)
+    """
+
+    def __init__(
+        self, metrics: RequestMetrics, host: str = "127.0.0.1", port: int = 9464
+    ):
+        """Initialize server (not yet listening)."""
+        self.metrics = metrics
+        self._address = (host, port)
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        """URL of the metrics endpoint."""
+        if self._server is None:
+            raise RuntimeError("MetricsServer is not running")
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/metrics"
+
+    def start(self) -> "MetricsServer":
+        """Start listening in a daemon thread."""
+        metrics = self.metrics
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                if self.path.split("?", 1)[0] not in ("/", "/metrics"):
+                    self.send_error(404)
+                    return
+                data = metrics.render_prometheus().encode("utf-8")
+                self.send_response(200)
+                self.send_header("content-type", "text/plain; version=0.0.4")
+                self.send_header("content-length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format: str, *args: Any) -> None:
+                pass
+
+        self._server = ThreadingHTTPServer(self._address, Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name="xhs-metrics", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop the server and wait for its thread."""
+        if self._server is None:
+            return
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
+        self._server = None
+        self._thread = None
+
+    def __enter__(self) -> "MetricsServer":
+        return self if self._server is not None else self.start()
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.stop()
+
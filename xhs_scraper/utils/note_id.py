@@ -0,0 +1,96 @@
+"""Creation time of XHS notes, decoded from their ids.
+
+Note ids are 24-hex-digit ObjectId-style values whose first 8 digits are
+the creation time in Unix seconds, so a note's age is known without
+fetching it:
+
+    note_created_at("65a1b2c3000000001e00f1d2")
+    # datetime.datetime(2024, 1, 12, 21, 44, 35, tzinfo=datetime.timezone.utc)
+
+The created_after/created_before filters of the scrapers use these helpers
+to skip detail requests and stop pagination early. Bounds are datetimes
+(naive ones are local time, as with datetime.timestamp()) or Unix seconds;
+``created_after`` is inclusive and ``created_before`` exclusive.
+"""
+
+import re
+from datetime import datetime, timezone
+from typing import Optional, Union
+
+TimeBound = Union[datetime, int, float]
+
+_NOTE_ID = re.compile(r"[0-9a-fA-F]{24}")
+
+
+def is_note_id(value: object) -> bool:
+    """Whether ``value`` looks like an XHS note id (24 hex digits)."""
+    return isinstance(value, str) and _NOTE_ID.fullmatch(value) is not None
+
+
+def note_timestamp(note_id: str) -> Optional[int]:
+    """Return a note's creation time in Unix seconds, or None for malformed ids."""
+    if not is_note_id(note_id):
+        return None
+    return int(note_id[:8], 16)
+
+
+def note_created_at(note_id: str) -> Optional[datetime]:
+    """Return a note's creation time as an aware UTC datetime, or None."""
+    timestamp = note_timestamp(note_id)
+    if timestamp is None:
+        return None
+    return datetime.fromtimestamp(timestamp, tz=timezone.utc)
+
+
+def to_timestamp(bound: Optional[TimeBound]) -> Optional[float]:
+    """Convert a datetime or Unix-seconds bound to Unix seconds."""
+    if bound is None:
+        return None
+    if isinstance(bound, datetime):
+        return bound.timestamp()
+    return float(bound)
+
+
+class TimeRange:
+    """A created_after/created_before window over note ids.
+
+    Notes whose id cannot be decoded are treated as inside the window, so
+    filters never drop notes they cannot date.
+
+    Args:
+        created_after: Earliest creation time (inclusive)
+        created_before: Latest creation time (exclusive)
+    """
+
+    def __init__(
+        self,
+        created_after: Optional[TimeBound] = None,
+        created_before: Optional[TimeBound] = None,
+    ):
+        """Initialize range.
+
+        Raises:
+            ValueError: If created_after is not before created_before
+        """
+        self.after = to_timestamp(created_after)
+        self.before = to_timestamp(created_before)
+        if self.after is not None and self.before is not None:
+            if self.after >= self.before:
+                raise ValueError("created_after must be before created_before")
+
+    def __bool__(self) -> bool:
+        return self.after is not None or self.before is not None
+
+    def contains(self, note_id: str) -> bool:
+        """Whether the note was created inside the window."""
+        timestamp = note_timestamp(note_id)
+        if timestamp is None:
+            return True
+        if self.after is not None and timestamp < self.after:
+            return False
+        return self.before is None or timestamp < self.before
+
+    def is_older(self, note_id: str) -> bool:
+        """Whether the note was created before the window starts."""
+        timestamp = note_timestamp(note_id)
+        return self.after is not None and timestamp is not None and timestamp < self.after
@@ -30,11 +30,14 @@ class TokenBucketRateLimiter:
         self.capacity = capacity if capacity is not None else rate
         self.tokens = float(self.capacity)
         self.last_update = time.monotonic()
+        self.waiters = 0
         self._lock = asyncio.Lock()
 
     async def acquire(self, tokens: float = 1.0) -> None:
         """Acquire tokens, blocking until available.
 
+        Callers blocked in this method are counted in ``waiters``.
+
         Args:
             tokens: Number of tokens to acquire (default: 1.0)
 
@@ -44,26 +47,30 @@ class TokenBucketRateLimiter:
         if tokens <= 0:
             raise ValueError("Token request must be positive")
 
-        while True:
-            async with self._lock:
-                now = time.monotonic()
-                elapsed = now - self.last_update
-
-                # Refill tokens based on elapsed time
-                self.tokens = min(self.capacity, self.tokens + elapsed * self.rate)
-                self.last_update = now
-
-                # Check if tokens available
-                if self.tokens >= tokens:
-                    self.tokens -= tokens
-                    return
-
-            # Calculate wait time
-            async with self._lock:
-                tokens_needed = tokens - self.tokens
-                wait_time = tokens_needed / self.rate
-
-            await asyncio.sleep(wait_time)
+        self.waiters += 1
+        try:
+            while True:
+                async with self._lock:
+                    now = time.monotonic()
+                    elapsed = now - self.last_update
+
+                    # Refill tokens based on elapsed time
+                    self.tokens = min(self.capacity, self.tokens + elapsed * self.rate)
+                    self.last_update = now
+
+                    # Check if tokens available
+                    if self.tokens >= tokens:
+                        self.tokens -= tokens
+                        return
+
+                # Calculate wait time
+                async with self._lock:
+                    tokens_needed = tokens - self.tokens
+                    wait_time = tokens_needed / self.rate
+
+                await asyncio.sleep(wait_time)
+        finally:
+            self.waiters -= 1
 
     def get_tokens(self) -> float:
         """Get current token count without acquiring.
@@ -0,0 +1,230 @@
+"""Record/replay of XHS API traffic for offline, reproducible runs.
+
+RequestRecorder captures request/response pairs made through XHSClient and
+saves them as a gzip-compressed JSON Lines archive. ReplayArchive loads such
+an archive and serves it through an httpx.MockTransport, optionally with
+injected latency, so scrapers can be exercised without cookies or network:
+
+    recorder = RequestRecorder()
+    async with XHSClient(cookies=cookies, recorder=recorder) as client:
+        await client.notes.get_user_notes(user_id)
+    recorder.save("traffic.jsonl.gz")
+
+    archive = ReplayArchive.load("traffic.jsonl.gz")
+    async with XHSClient(cookies=cookies, transport=archive.transport()) as client:
+        await client.notes.get_user_notes(user_id)
+"""
+
+import asyncio
+import gzip
+import json
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Union
+
+import httpx
+
+# Payload fields that change on every call and must not affect matching.
+VOLATILE_FIELDS = frozenset({"search_id"})
+
+
+def canonical_params(
+    params: Iterable[tuple],
+    body: bytes = b"",
+) -> Dict[str, Any]:
+    """Reduce a request's query string and body to their matching content.
+
+    Query parameters are sorted; a JSON body is included under "payload"
+    with VOLATILE_FIELDS removed. Headers (which carry per-request signatures
+    and trace IDs) are never part of the canonical form.
+
+    Args:
+        params: Query parameter (name, value) pairs
+        body: Raw request body
+
+    Returns:
+        Dictionary with "query" and, for requests with a body, "payload"
+    """
+    canonical: Dict[str, Any] = {"query": sorted([k, v] for k, v in params)}
+    if body:
+        try:
+            payload = json.loads(body)
+        except ValueError:
+            payload = body.decode("utf-8", errors="replace")
+        if isinstance(payload, dict):
+            payload = {k: v for k, v in payload.items() if k not in VOLATILE_FIELDS}
+        canonical["payload"] = payload
+    return canonical
+
+
+def canonical_request_key(
+    method: str,
+    path: str,
+    params: Iterable[tuple],
+    body: bytes = b"",
+) -> str:
+    """Build a stable key identifying a request, independent of signing.
+
+    Args:
+        method: HTTP method
+        path: URL path
+        params: Query parameter (name, value) pairs
+        body: Raw request body
+
+    Returns:
+        Canonical key string
+    """
+    return _key_from_canonical(method, path, canonical_params(params, body))
+
+
+def _key_from_canonical(method: str, path: str, canonical: Dict[str, Any]) -> str:
+    return f"{method.upper()} {path} " + json.dumps(
+        canonical, sort_keys=True, ensure_ascii=False, separators=(",", ":")
+    )
+
+
+def _request_key(request: httpx.Request) -> str:
+    return canonical_request_key(
+        request.method,
+        request.url.path,
+        request.url.params.multi_items(),
+        request.content,
+    )
+
+
+class RequestRecorder:
+    """Collects request/response pairs for saving as a replay archive."""
+
+    def __init__(self):
+        """Initialize an empty recorder."""
+        self.entries: List[Dict[str, Any]] = []
+
+    def record(self, response: httpx.Response) -> None:
+        """Record a completed response and the request that produced it.
+
+        Args:
+            response: Response whose body has been read
+        """
+        request = response.request
+        self.entries.append(
+            {
+                "method": request.method,
+                "path": request.url.path,
+                "params": canonical_params(
+                    request.url.params.multi_items(), request.content
+                ),
+                "status": response.status_code,
+                "body": response.text,
+            }
+        )
+
+    def save(self, path: Union[str, Path]) -> Path:
+        """Write recorded entries to a gzip-compressed JSON Lines archive.
+
+        Args:
+            path: Output file path
+
+        Returns:
+            Path object of the created file.
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with gzip.open(path, "wt", encoding="utf-8") as f:
+            for entry in self.entries:
+                f.write(json.dumps(entry, ensure_ascii=False))
+                f.write("\n")
+        return path
+
+
+LatencySpec = Union[float, Callable[[], float]]
+
+
+class ReplayArchive:
+    """Recorded responses indexed by canonical request key.
+
+    When a key was recorded several times, successive lookups cycle through
+    the recordings in order.
+    """
+
+    def __init__(self, entries: Iterable[Dict[str, Any]]):
+        """Index archive entries.
+
+        Args:
+            entries: Entries as produced by RequestRecorder
+        """
+        self._entries: Dict[str, List[Dict[str, Any]]] = {}
+        self._positions: Dict[str, int] = {}
+        for entry in entries:
+            key = _key_from_canonical(entry["method"], entry["path"], entry["params"])
+            self._entries.setdefault(key, []).append(entry)
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> "ReplayArchive":
+        """Load an archive written by RequestRecorder.save().
+
+        Args:
+            path: Archive file path
+
+        Returns:
+            ReplayArchive instance
+        """
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            return cls(json.loads(line) for line in f if line.strip())
+
+    def __len__(self) -> int:
+        return sum(len(entries) for entries in self._entries.values())
+
+    def entries(self) -> List[Dict[str, Any]]:
+        """Return all archive entries."""
+        return [entry for entries in self._entries.values() for entry in entries]
+
+    def find(self, request: httpx.Request) -> Optional[Dict[str, Any]]:
+        """Find the recorded entry for a request.
+
+        Args:
+            request: Outgoing request
+
+        Returns:
+            Matching entry or None
+        """
+        key = _request_key(request)
+        entries = self._entries.get(key)
+        if not entries:
+            return None
+        position = self._positions.get(key, 0)
+        self._positions[key] = position + 1
+        return entries[position % len(entries)]
+
+    def transport(self, latency: LatencySpec = 0.0) -> httpx.MockTransport:
+        """Build an httpx transport serving recorded responses.
+
+        Unrecorded requests receive a 404 response.
+
+        Args:
+            latency: Seconds to delay each response, or a zero-argument
+                callable returning the delay (e.g. a seeded random sampler)
+
+        Returns:
+            httpx.MockTransport to pass as XHSClient(transport=...)
+        """
+        delay = latency if callable(latency) else (lambda: latency)
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            seconds = delay()
+            if seconds > 0:
+                await asyncio.sleep(seconds)
+
+            entry = self.find(request)
+            if entry is None:
+                return httpx.Response(
+                    404,
+                    json={"success": False, "msg": "No recorded response"},
+                    request=request,
+                )
+            return httpx.Response(
+                entry["status"],
+                content=entry["body"].encode("utf-8"),
+                headers={"content-type": "application/json;charset=UTF-8"},
+                request=request,
+            )
+
+        return httpx.MockTransport(handler)
@@ -0,0 +1,115 @@
+"""High-water marks for incremental user-notes crawls.
+
+A HighWaterMarkStore remembers, per user, the newest note ids seen by the
+last crawl. With ``get_user_notes(user_id, incremental=True)`` pagination
+stops as soon as it reaches one of those notes, so a daily run fetches only
+the first page or two and returns only the notes posted since:
+
+    marks = HighWaterMarkStore("marks.json")
+    async with XHSClient(cookies=cookies, watermark_store=marks) as client:
+        new_notes = await client.notes.get_user_notes(user_id, incremental=True)
+
+Several ids are kept rather than one, so deleting the newest note does not
+force a full re-crawl. Sticky (pinned) notes are listed first regardless of
+age, so they never stop pagination; they are remembered separately and
+returned once, when first seen.
+"""
+
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Union
+
+
+@dataclass
+class HighWaterMark:
+    """Note ids known for one user.
+
+    Attributes:
+        ids: Newest non-sticky note ids, newest first
+        sticky: Sticky note ids already returned
+        updated_at: Unix time of the last update
+    """
+
+    ids: List[str] = field(default_factory=list)
+    sticky: List[str] = field(default_factory=list)
+    updated_at: float = 0.0
+
+
+class HighWaterMarkStore:
+    """Per-user high-water marks, kept in memory and optionally in a JSON file.
+
+    The file is rewritten atomically (temporary file and os.replace()) on
+    every update.
+
+    Args:
+        path: JSON file to load and save marks (None keeps them in memory)
+        keep: Newest note ids remembered per user
+    """
+
+    def __init__(self, path: Optional[Union[str, Path]] = None, keep: int = 20):
+        """Initialize store, loading existing marks from ``path``.
+
+        Raises:
+            ValueError: If keep is not positive
+        """
+        if keep <= 0:
+            raise ValueError("keep must be positive")
+        self.path = Path(path) if path is not None else None
+        self.keep = keep
+        self._marks: Dict[str, HighWaterMark] = {}
+        self._lock = threading.Lock()
+        if self.path is not None and self.path.exists():
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+            self._marks = {key: HighWaterMark(**mark) for key, mark in data.items()}
+
+    def get(self, key: str) -> Optional[HighWaterMark]:
+        """Return the mark for ``key`` (a user id), or None before the first crawl."""
+        with self._lock:
+            return self._marks.get(key)
+
+    def update(
+        self, key: str, new_ids: Iterable[str], new_sticky: Iterable[str] = ()
+    ) -> HighWaterMark:
+        """Record the notes returned by a completed crawl.
+
+        Args:
+            key: User id
+            new_ids: New non-sticky note ids, newest first
+            new_sticky: New sticky note ids
+
+        Returns:
+            The updated mark
+        """
+        with self._lock:
+            old = self._marks.get(key) or HighWaterMark()
+            ids = list(dict.fromkeys([*new_ids, *old.ids]))[: self.keep]
+            sticky = list(dict.fromkeys([*old.sticky, *new_sticky]))[-self.keep :]
+            mark = HighWaterMark(ids=ids, sticky=sticky, updated_at=time.time())
+            self._marks[key] = mark
+            self._save()
+        return mark
+
+    def delete(self, key: str) -> None:
+        """Forget a user's mark; the next incremental crawl is a full one."""
+        with self._lock:
+            if self._marks.pop(key, None) is not None:
+                self._save()
+
+    def _save(self) -> None:
+        if self.path is None:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(self.path.suffix + ".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(
+                {key: mark.__dict__ for key, mark in self._marks.items()},
+                f,
+                ensure_ascii=False,
+            )
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.path)
@@ -0,0 +1,701 @@
+"""Durable SQLite work queue for crawl tasks.
+
+A WorkQueue stores crawl units (a keyword page, a user id, a note id, a
+comment root) as tasks in a SQLite database. Workers lease tasks for a
+visibility timeout and acknowledge them when done; a task whose worker
+crashes becomes visible again when its lease expires, so no work is lost
+(delivery is at-least-once, and handlers should be idempotent). Failed
+tasks are retried with exponential backoff until ``max_attempts``, then
+moved to a dead-letter table.
+
+Any number of processes can open the same database and lease from it
+concurrently, so workers can be added or removed while a crawl runs:
+
+    queue = WorkQueue("crawl.db")
+    queue.put_many("user_notes", [{"user_id": uid} for uid in user_ids])
+
+    async with XHSClient(cookies=cookies) as client:
+        worker = QueueWorker(queue, client, on_result=save, concurrency=4)
+        await worker.run()
+
+Tasks are unique per (kind, key); the key defaults to the payload, so
+putting the same task twice is a no-op while the first is pending, leased
+or done.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from pathlib import Path
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Union,
+)
+
+from ..exceptions import CaptchaRequiredError, CookieExpiredError
+
+if TYPE_CHECKING:
+    from ..client import XHSClient
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Task:
+    """A leased task.
+
+    Attributes:
+        id: Task id
+        kind: Task kind, selecting the handler (e.g. "note", "comments")
+        key: Deduplication key
+        payload: Handler arguments
+        attempts: Leases so far, including this one
+        lease_token: Identifies this lease in ack()/nack()/extend()
+        last_error: Error of the previous failed attempt, if any
+    """
+
+    id: int
+    kind: str
+    key: str
+    payload: Dict[str, Any]
+    attempts: int
+    lease_token: str
+    last_error: Optional[str] = None
+
+
+@dataclass
+class DeadLetter:
+    """A task that exhausted its attempts.
+
+    Attributes:
+        id: Dead letter id, for requeue_dead()
+        task_id: Id the task had in the queue
+        kind: Task kind
+        key: Deduplication key
+        payload: Handler arguments
+        attempts: Attempts made
+        error: Last error
+        failed_at: Unix time it was dead-lettered
+    """
+
+    id: int
+    task_id: int
+    kind: str
+    key: str
+    payload: Dict[str, Any]
+    attempts: int
+    error: Optional[str]
+    failed_at: float
+
+
+class WorkQueue:
+    """Task queue in a SQLite database with leases and dead letters.
+
+    Args:
+        path: Database file path, shared by all worker processes
+        visibility_timeout: Seconds a lease lasts before the task becomes
+            visible to other workers again
+        max_attempts: Attempts before a task is dead-lettered
+        retry_delay: Delay before the first retry; doubles per attempt
+        max_retry_delay: Upper bound on the retry delay
+    """
+
+    _SCHEMA = """
+        CREATE TABLE IF NOT EXISTS tasks (
+            id INTEGER PRIMARY KEY,
+            kind TEXT NOT NULL,
+            key TEXT NOT NULL,
+            payload TEXT NOT NULL,
+            priority INTEGER NOT NULL DEFAULT 0,
+            state TEXT NOT NULL DEFAULT 'pending',
+            attempts INTEGER NOT NULL DEFAULT 0,
+            available_at REAL NOT NULL,
+            lease_owner TEXT,
+            lease_token TEXT,
+            lease_expires REAL,
+            last_error TEXT,
+            updated_at REAL NOT NULL,
+            UNIQUE (kind, key)
+        );
+        CREATE INDEX IF NOT EXISTS tasks_ready
+            ON tasks (state, priority DESC, id);
+        CREATE TABLE IF NOT EXISTS dead_letters (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            task_id INTEGER NOT NULL,
+            kind TEXT NOT NULL,
+            key TEXT NOT NULL,
+            payload TEXT NOT NULL,
+            attempts INTEGER NOT NULL,
+            error TEXT,
+            failed_at REAL NOT NULL
+        );
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        visibility_timeout: float = 300.0,
+        max_attempts: int = 5,
+        retry_delay: float = 5.0,
+        max_retry_delay: float = 600.0,
+    ):
+        """Initialize queue, creating the schema if needed.
+
+        Raises:
+            ValueError: If any argument is out of range
+        """
+        if visibility_timeout <= 0 or max_attempts <= 0:
+            raise ValueError("visibility_timeout and max_attempts must be positive")
+        if retry_delay < 0 or max_retry_delay < retry_delay:
+            raise ValueError(
+                "retry delays must satisfy 0 <= retry_delay <= max_retry_delay"
+            )
+        self.path = str(path)
+        self.visibility_timeout = visibility_timeout
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        self.max_retry_delay = max_retry_delay
+        self._lock = threading.Lock()
+        # Autocommit mode: transactions are opened explicitly with
+        # BEGIN IMMEDIATE so concurrent processes serialize their claims.
+        self._conn = sqlite3.connect(
+            self.path, check_same_thread=False, isolation_level=None, timeout=30.0
+        )
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(self._SCHEMA)
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self._conn.close()
+
+    def _transaction(self):
+        return _Transaction(self._conn, self._lock)
+
+    def put(
+        self,
+        kind: str,
+        payload: Dict[str, Any],
+        *,
+        key: Optional[str] = None,
+        priority: int = 0,
+        delay: float = 0.0,
+    ) -> bool:
+        """Add a task.
+
+        Args:
+            kind: Task kind
+            payload: JSON-serializable handler arguments
+            key: Deduplication key (defaults to the canonical payload JSON)
+            priority: Higher priorities are leased first
+            delay: Seconds before the task becomes visible
+
+        Returns:
+            True if the task was added, False if (kind, key) already exists
+        """
+        added = self.put_many(
+            kind,
+            [payload],
+            key=(lambda _: key) if key is not None else None,
+            priority=priority,
+            delay=delay,
+        )
+        return added == 1
+
+    def put_many(
+        self,
+        kind: str,
+        payloads: Iterable[Dict[str, Any]],
+        *,
+        key: Optional[Callable[[Dict[str, Any]], str]] = None,
+        priority: int = 0,
+        delay: float = 0.0,
+    ) -> int:
+        """Add many tasks of one kind in a single transaction.
+
+        Args:
+            kind: Task kind
+            payloads: JSON-serializable handler arguments
+            key: Function computing each payload's deduplication key
+                (defaults to the canonical payload JSON)
+            priority: Higher priorities are leased first
+            delay: Seconds before the tasks become visible
+
+        Returns:
+            Number of tasks added (duplicates are skipped)
+        """
+        now = time.time()
+        rows = []
+        for payload in payloads:
+            data = json.dumps(payload, ensure_ascii=False, sort_keys=True)
+            task_key = key(payload) if key is not None else data
+            rows.append((kind, task_key, data, priority, now + delay, now))
+        with self._transaction() as conn:
+            before = conn.total_changes
+            conn.executemany(
+                "INSERT OR IGNORE INTO tasks "
+                "(kind, key, payload, priority, available_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            return conn.total_changes - before
+
+    def lease(
+        self,
+        owner: Optional[str] = None,
+        *,
+        limit: int = 1,
+        kinds: Optional[Iterable[str]] = None,
+        visibility_timeout: Optional[float] = None,
+    ) -> List[Task]:
+        """Lease ready tasks.
+
+        Pending tasks whose delay has passed and leased tasks whose lease
+        expired are both ready. Expired tasks that already used all their
+        attempts are dead-lettered instead.
+
+        Args:
+            owner: Worker name recorded on the lease (defaults to host:pid)
+            limit: Maximum tasks to lease
+            kinds: Only lease these kinds
+            visibility_timeout: Lease duration (defaults to the queue's)
+
+        Returns:
+            Leased tasks, highest priority and oldest first
+        """
+        owner = owner or f"{socket.gethostname()}:{os.getpid()}"
+        now = time.time()
+        expires = now + (visibility_timeout or self.visibility_timeout)
+        kinds = list(kinds) if kinds is not None else None
+        kind_filter = ""
+        if kinds is not None:
+            kind_filter = f" AND kind IN ({', '.join('?' * len(kinds))})"
+
+        with self._transaction() as conn:
+            self._dead_letter_expired(conn, now)
+            rows = conn.execute(
+                "SELECT id, kind, key, payload, attempts, last_error FROM tasks "
+                "WHERE ((state = 'pending' AND available_at <= ?) "
+                "OR (state = 'leased' AND lease_expires <= ?))"
+                f"{kind_filter} ORDER BY priority DESC, id LIMIT ?",
+                (now, now, *(kinds or ()), limit),
+            ).fetchall()
+            tasks = []
+            for task_id, kind, key, payload, attempts, last_error in rows:
+                token = uuid.uuid4().hex
+                conn.execute(
+                    "UPDATE tasks SET state = 'leased', attempts = attempts + 1, "
+                    "lease_owner = ?, lease_token = ?, lease_expires = ?, "
+                    "updated_at = ? WHERE id = ?",
+                    (owner, token, expires, now, task_id),
+                )
+                tasks.append(
+                    Task(
+                        id=task_id,
+                        kind=kind,
+                        key=key,
+                        payload=json.loads(payload),
+                        attempts=attempts + 1,
+                        lease_token=token,
+                        last_error=last_error,
+                    )
+                )
+        return tasks
+
+    def _dead_letter_expired(self, conn: sqlite3.Connection, now: float) -> None:
+        condition = "state = 'leased' AND lease_expires <= ? AND attempts >= ?"
+        conn.execute(
+            "INSERT INTO dead_letters "
+            "(task_id, kind, key, payload, attempts, error, failed_at) "
+            "SELECT id, kind, key, payload, attempts, "
+            "COALESCE(last_error, 'lease expired'), ? FROM tasks WHERE " + condition,
+            (now, now, self.max_attempts),
+        )
+        conn.execute(
+            "DELETE FROM tasks WHERE " + condition, (now, self.max_attempts)
+        )
+
+    def ack(self, task: Task) -> bool:
+        """Mark a leased task done.
+
+        Returns:
+            False if the lease was lost (expired and taken by another
+            worker); the task will then be processed again
+        """
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                "UPDATE tasks SET state = 'done', lease_owner = NULL, "
+                "lease_token = NULL, lease_expires = NULL, updated_at = ? "
+                "WHERE id = ? AND lease_token = ?",
+                (time.time(), task.id, task.lease_token),
+            )
+            return cursor.rowcount == 1
+
+    def nack(self, task: Task, error: Union[str, BaseException, None] = None) -> bool:
+        """Report a failed attempt.
+
+        The task is retried after a backoff, or dead-lettered once it has
+        used ``max_attempts``.
+
+        Returns:
+            False if the lease was lost
+        """
+        message = str(error) if error is not None else None
+        now = time.time()
+        with self._transaction() as conn:
+            if task.attempts >= self.max_attempts:
+                conn.execute(
+                    "INSERT INTO dead_letters "
+                    "(task_id, kind, key, payload, attempts, error, failed_at) "
+                    "SELECT id, kind, key, payload, attempts, ?, ? FROM tasks "
+                    "WHERE id = ? AND lease_token = ?",
+                    (message, now, task.id, task.lease_token),
+                )
+                cursor = conn.execute(
+                    "DELETE FROM tasks WHERE id = ? AND lease_token = ?",
+                    (task.id, task.lease_token),
+                )
+                return cursor.rowcount == 1
+            delay = min(
+                self.max_retry_delay, self.retry_delay * 2 ** (task.attempts - 1)
+            )
+            return self._reschedule(conn, task, now + delay, message, task.attempts)
+
+    def release(self, task: Task, delay: float = 0.0) -> bool:
+        """Return a leased task without counting the attempt.
+
+        Returns:
+            False if the lease was lost
+        """
+        with self._transaction() as conn:
+            return self._reschedule(
+                conn, task, time.time() + delay, task.last_error, task.attempts - 1
+            )
+
+    def _reschedule(
+        self,
+        conn: sqlite3.Connection,
+        task: Task,
+        available_at: float,
+        error: Optional[str],
+        attempts: int,
+    ) -> bool:
+        cursor = conn.execute(
+            "UPDATE tasks SET state = 'pending', available_at = ?, last_error = ?, "
+            "attempts = ?, lease_owner = NULL, lease_token = NULL, "
+            "lease_expires = NULL, updated_at = ? WHERE id = ? AND lease_token = ?",
+            (available_at, error, attempts, time.time(), task.id, task.lease_token),
+        )
+        return cursor.rowcount == 1
+
+    def extend(self, task: Task, visibility_timeout: Optional[float] = None) -> bool:
+        """Extend a lease (heartbeat for long tasks).
+
+        Returns:
+            False if the lease was lost
+        """
+        expires = time.time() + (visibility_timeout or self.visibility_timeout)
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                "UPDATE tasks SET lease_expires = ? WHERE id = ? AND lease_token = ?",
+                (expires, task.id, task.lease_token),
+            )
+            return cursor.rowcount == 1
+
+    def counts(self) -> Dict[str, int]:
+        """Number of tasks per state, plus ``dead`` for dead letters."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT state, COUNT(*) FROM tasks GROUP BY state"
+            ).fetchall()
+            (dead,) = self._conn.execute("SELECT COUNT(*) FROM dead_letters").fetchone()
+        counts = {"pending": 0, "leased": 0, "done": 0}
+        counts.update(rows)
+        counts["dead"] = dead
+        return counts
+
+    def is_drained(self) -> bool:
+        """Whether no task is pending or leased."""
+        counts = self.counts()
+        return counts["pending"] == 0 and counts["leased"] == 0
+
+    def dead_letters(self, kind: Optional[str] = None) -> List[DeadLetter]:
+        """Dead-lettered tasks, oldest first."""
+        query = (
+            "SELECT id, task_id, kind, key, payload, attempts, error, failed_at "
+            "FROM dead_letters"
+        )
+        params: tuple = ()
+        if kind is not None:
+            query += " WHERE kind = ?"
+            params = (kind,)
+        with self._lock:
+            rows = self._conn.execute(
+                query + " ORDER BY failed_at, id", params
+            ).fetchall()
+        return [
+            DeadLetter(
+                dead_id, task_id, kind, key, json.loads(payload), attempts, error, at
+            )
+            for dead_id, task_id, kind, key, payload, attempts, error, at in rows
+        ]
+
+    def requeue_dead(self, ids: Optional[Iterable[int]] = None) -> int:
+        """Move dead letters (all, or the given ids) back to pending.
+
+        Returns:
+            Number of tasks requeued
+        """
+        now = time.time()
+        condition, params = "", ()
+        if ids is not None:
+            ids = list(ids)
+            condition = f" WHERE id IN ({', '.join('?' * len(ids))})"
+            params = tuple(ids)
+        with self._transaction() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO tasks "
+                "(kind, key, payload, available_at, last_error, updated_at) "
+                "SELECT kind, key, payload, ?, error, ? FROM dead_letters"
+                + condition
+                + " ORDER BY id",
+                (now, now, *params),
+            )
+            cursor = conn.execute("DELETE FROM dead_letters" + condition, params)
+            return cursor.rowcount
+
+    def purge_done(self, older_than: float = 0.0) -> int:
+        """Delete done tasks finished more than ``older_than`` seconds ago.
+
+        Purged tasks no longer deduplicate put() calls.
+
+        Returns:
+            Number of tasks deleted
+        """
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                "DELETE FROM tasks WHERE state = 'done' AND updated_at <= ?",
+                (time.time() - older_than,),
+            )
+            return cursor.rowcount
+
+
+class _Transaction:
+    """BEGIN IMMEDIATE ... COMMIT/ROLLBACK under the queue's thread lock."""
+
+    def __init__(self, conn: sqlite3.Connection, lock: threading.Lock):
+        self._conn = conn
+        self._lock = lock
+
+    def __enter__(self) -> sqlite3.Connection:
+        self._lock.acquire()
+        try:
+            self._conn.execute("BEGIN IMMEDIATE")
+        except BaseException:
+            self._lock.release()
+            raise
+        return self._conn
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        try:
+            self._conn.execute("ROLLBACK" if exc_type else "COMMIT")
+        finally:
+            self._lock.release()
+
+
+Handler = Callable[["XHSClient", Dict[str, Any]], Awaitable[Any]]
+
+
+async def _search(client: "XHSClient", payload: Dict[str, Any]) -> Any:
+    return await client.search.search_notes(**payload)
+
+
+async def _user_notes(client: "XHSClient", payload: Dict[str, Any]) -> Any:
+    return await client.notes.get_user_notes(**payload)
+
+
+async def _note(client: "XHSClient", payload: Dict[str, Any]) -> Any:
+    return await client.notes.get_note(
+        payload["note_id"], payload.get("xsec_token", "")
+    )
+
+
+async def _comments(client: "XHSClient", payload: Dict[str, Any]) -> Any:
+    return await client.comments.get_comments(**payload)
+
+
+async def _sub_comments(client: "XHSClient", payload: Dict[str, Any]) -> Any:
+    return await client.comments.get_sub_comments(**payload)
+
+
+async def _user(client: "XHSClient", payload: Dict[str, Any]) -> Any:
+    return await client.users.get_user_info(**payload)
+
+
+DEFAULT_HANDLERS: Dict[str, Handler] = {
+    "search": _search,
+    "user_notes": _user_notes,
+    "note": _note,
+    "comments": _comments,
+    "sub_comments": _sub_comments,
+    "user": _user,
+}
+"""Handlers for the built-in task kinds; payloads are the scraper's kwargs."""
+
+
+class QueueWorker:
+    """Consumes a WorkQueue with the scrapers of an XHSClient.
+
+    Each task is passed to the handler for its kind; the result goes to
+    ``on_result`` and the task is acknowledged only after that returns, so
+    a crash in between means the task runs again. Leases are extended
+    while a handler runs. Handler errors are reported with nack() and
+    retried; expired cookies and captcha challenges release the task
+    without using an attempt and stop the worker, since every other task
+    would fail the same way.
+
+    Args:
+        queue: Queue to consume
+        client: Open XHSClient passed to the handlers
+        handlers: Handlers by task kind, merged over DEFAULT_HANDLERS
+        on_result: Called with (task, result); may be async. It can also
+            put follow-up tasks (e.g. a "note" task per search result).
+        concurrency: Tasks processed at a time
+        poll_interval: Seconds to wait when no task is ready
+        owner: Worker name recorded on leases
+    """
+
+    def __init__(
+        self,
+        queue: WorkQueue,
+        client: "XHSClient",
+        handlers: Optional[Dict[str, Handler]] = None,
+        on_result: Optional[Callable[[Task, Any], Any]] = None,
+        concurrency: int = 1,
+        poll_interval: float = 1.0,
+        owner: Optional[str] = None,
+    ):
+        """Initialize worker.
+
+        Raises:
+            ValueError: If concurrency is not positive
+        """
+        if concurrency <= 0:
+            raise ValueError("concurrency must be positive")
+        self.queue = queue
+        self.client = client
+        self.handlers = {**DEFAULT_HANDLERS, **(handlers or {})}
+        self.on_result = on_result
+        self.concurrency = concurrency
+        self.poll_interval = poll_interval
+        self.owner = owner or f"{socket.gethostname()}:{os.getpid()}:{id(self):x}"
+        self.processed = 0
+        self.failed = 0
+        self._stopping = False
+
+    def stop(self) -> None:
+        """Stop leasing new tasks; run() returns after in-flight tasks finish."""
+        self._stopping = True
+
+    async def run(self, until_drained: bool = True) -> None:
+        """Process tasks.
+
+        Args:
+            until_drained: Return once no task is pending or leased;
+                otherwise keep polling until stop() is called
+
+        If one task hits expired cookies or a captcha, the other in-flight
+        tasks are cancelled and released (without using an attempt) before
+        the error is raised, so none of them runs against a closed client.
+
+        Raises:
+            CookieExpiredError: If the client's cookies expired
+            CaptchaRequiredError: If a captcha must be solved
+        """
+        loops = [
+            asyncio.create_task(self._loop(until_drained))
+            for _ in range(self.concurrency)
+        ]
+        try:
+            done, _ = await asyncio.wait(loops, return_when=asyncio.FIRST_EXCEPTION)
+            for loop in done:
+                if loop.exception() is not None:
+                    raise loop.exception()
+        finally:
+            for loop in loops:
+                loop.cancel()
+            await asyncio.gather(*loops, return_exceptions=True)
+
+    async def _loop(self, until_drained: bool) -> None:
+        while not self._stopping:
+            tasks = await asyncio.to_thread(
+                self.queue.lease, self.owner, kinds=list(self.handlers)
+            )
+            if not tasks:
+                if until_drained and await asyncio.to_thread(self.queue.is_drained):
+                    return
+                await asyncio.sleep(self.poll_interval)
+                continue
+            await self._process(tasks[0])
+
+    async def _process(self, task: Task) -> None:
+        heartbeat = asyncio.ensure_future(self._heartbeat(task))
+        try:
+            result = await self.handlers[task.kind](self.client, task.payload)
+            if self.on_result is not None:
+                outcome = self.on_result(task, result)
+                if asyncio.iscoroutine(outcome):
+                    await outcome
+        except (CookieExpiredError, CaptchaRequiredError):
+            await asyncio.to_thread(self.queue.release, task)
+            self._stopping = True
+            raise
+        except asyncio.CancelledError:
+            await asyncio.to_thread(self.queue.release, task)
+            raise
+        except Exception as exc:
+            self.failed += 1
+            logger.warning(
+                "Task %s %s (attempt %d) failed: %s",
+                task.kind,
+                task.key,
+                task.attempts,
+                exc,
+            )
+            await asyncio.to_thread(self.queue.nack, task, repr(exc))
+        else:
+            self.processed += 1
+            if not await asyncio.to_thread(self.queue.ack, task):
+                logger.warning("Lease on task %s expired before it was acked", task.id)
+        finally:
+            heartbeat.cancel()
+
+    async def _heartbeat(self, task: Task) -> None:
+        interval = self.queue.visibility_timeout / 3
+        while True:
+            await asyncio.sleep(interval)
+            await asyncio.to_thread(self.queue.extend, task)
+
+
+__all__ = [
+    "WorkQueue",
+    "Task",
+    "DeadLetter",
+    "QueueWorker",
+    "DEFAULT_HANDLERS",
+]